@@ -5,17 +5,114 @@ GET /dashboard/new-resumes-count
   Returns the number of resumes uploaded after the given `since` timestamp.
   Stateless: the frontend stores `last_dashboard_check` in localStorage
   and passes it as a query param. No server-side session state required.
+
+GET /dashboard/weekly-stats
+  Uploads per day per job role for the past 7 days.
+
+GET /dashboard/upload-buckets
+  Uploads per day / week / month / year per job role over a date range,
+  streamed as NDJSON (replaces fetching every row from /raw-resumes).
+
+Both read the resume_upload_rollup table (uploads per day per job, kept
+current by triggers; see scripts/database_migrations/create_upload_rollup.py)
+for whole days and the base tables only for the partial first day, so
+their cost does not grow with the tables. Answers are cached for
+DASHBOARD_CACHE_TTL_SECONDS. Without the rollup table they fall back to
+the live queries.
 """
 
-from fastapi import APIRouter, Depends, Query
-from datetime import datetime, timezone
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime, timezone
+from typing import Callable, Iterator, List, Literal, Optional
+import json
+import logging
+import threading
+
+from cachetools import TTLCache
 
 from app.db.dbase import get_db_connection
+from app.core.config import get_settings
 from app.core.security import get_current_user
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+_cache: Optional[TTLCache] = None
+_cache_lock = threading.Lock()
+
+_ROLE_COLORS = [
+    "#3b82f6",  # blue
+    "#06b6d4",  # teal / cyan
+    "#8b5cf6",  # purple
+    "#10b981",  # emerald
+    "#f97316",  # orange
+    "#ec4899",  # pink
+    "#eab308",  # yellow
+    "#ef4444",  # red
+    "#14b8a6",  # teal-alt
+    "#6366f1",  # indigo
+]
+
+
+def _cached(key: tuple, compute: Callable):
+    """``compute()`` memoised for DASHBOARD_CACHE_TTL_SECONDS (0 disables)."""
+    global _cache
+    ttl = get_settings().DASHBOARD_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return compute()
+    with _cache_lock:
+        if _cache is None or _cache.ttl != ttl:
+            _cache = TTLCache(maxsize=1024, ttl=ttl)
+        if key in _cache:
+            return _cache[key]
+    value = compute()
+    with _cache_lock:
+        _cache[key] = value
+    return value
+
+
+def _count_from_rollup(since: Optional[datetime], job_id: Optional[int]) -> int:
+    """
+    Whole days after `since` from the rollup, the rest of since's own day
+    from the base tables (an uploaded_at range scan of at most one day).
+    """
+    params = {"since": since, "job_id": job_id or 0}
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        if since is None:
+            cur.execute(
+                "SELECT COALESCE(SUM(resumes), 0) FROM resume_upload_rollup WHERE job_id = %(job_id)s;",
+                params,
+            )
+            return cur.fetchone()[0]
+
+        if job_id is not None:
+            partial_day = """
+                SELECT COUNT(DISTINCT r.id)
+                FROM resumes r
+                JOIN applications a ON a.resume_id = r.id, b
+                WHERE a.job_id = %(job_id)s
+                  AND r.uploaded_at > b.ts AND r.uploaded_at < b.ts::date + 1
+            """
+        else:
+            partial_day = """
+                SELECT COUNT(*) FROM resumes, b
+                WHERE uploaded_at > b.ts AND uploaded_at < b.ts::date + 1
+            """
+        cur.execute(f"""
+            WITH b AS (SELECT CAST(%(since)s AS timestamptz)::timestamp AS ts)
+            SELECT (SELECT COALESCE(SUM(u.resumes), 0) FROM resume_upload_rollup u, b
+                    WHERE u.job_id = %(job_id)s AND u.day > b.ts::date)
+                 + ({partial_day});
+        """, params)
+        return cur.fetchone()[0]
+    finally:
+        cur.close()
+        conn.close()
+
 
 def _count_new_resumes(since: Optional[datetime], job_id: Optional[int]) -> int:
     """
@@ -23,6 +120,14 @@ def _count_new_resumes(since: Optional[datetime], job_id: Optional[int]) -> int:
     If `since` is None, returns total resume count.
     If `job_id` is provided, scopes the count to that job via applications table.
     """
+    try:
+        return _count_from_rollup(since, job_id)
+    except Exception as e:
+        logger.warning(f"Upload rollup unavailable, counting live: {e}")
+    return _count_new_resumes_live(since, job_id)
+
+
+def _count_new_resumes_live(since: Optional[datetime], job_id: Optional[int]) -> int:
     conn = get_db_connection()
     cur = conn.cursor()
 
@@ -85,12 +190,18 @@ def get_new_resumes_count(
         except ValueError:
             since_dt = None
 
-    count = _count_new_resumes(since_dt, job_id)
+    # server_time is taken just before the count and cached with it, so the
+    # client's next baseline never skips uploads this answer did not count
+    def count_now():
+        server_time = datetime.now(timezone.utc).isoformat()
+        return _count_new_resumes(since_dt, job_id), server_time
+
+    count, server_time = _cached(("new_resumes", since_dt, job_id), count_now)
 
     response = {
         "new_resumes": count,
         "since": since,
-        "server_time": datetime.now(timezone.utc).isoformat(),
+        "server_time": server_time,
     }
     if job_id is not None:
         response["job_id"] = job_id
@@ -118,6 +229,37 @@ def get_weekly_stats(
       ]
     }
     """
+    return _cached(("weekly_stats",), _weekly_stats)
+
+
+def _weekly_rows_from_rollup() -> list:
+    """(day label, date, job title, count) rows: whole days from the rollup, the first from the base tables."""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            WITH b AS (SELECT (NOW() - INTERVAL '7 days')::timestamp AS ts)
+            SELECT u.day, j.title, SUM(u.applications)
+            FROM resume_upload_rollup u
+            JOIN jobs j ON j.id = u.job_id, b
+            WHERE u.day > b.ts::date AND u.applications > 0
+            GROUP BY u.day, j.title
+            UNION ALL
+            SELECT DATE(r.uploaded_at), j.title, COUNT(*)
+            FROM resumes r
+            JOIN applications a ON a.resume_id = r.id
+            JOIN jobs j ON j.id = a.job_id, b
+            WHERE r.uploaded_at >= b.ts AND r.uploaded_at < b.ts::date + 1
+            GROUP BY DATE(r.uploaded_at), j.title
+            ORDER BY 1, 2;
+        """)
+        return [(day.strftime("%a"), day, title, int(count)) for day, title, count in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def _weekly_rows_live() -> list:
     conn = get_db_connection()
     cur = conn.cursor()
 
@@ -138,6 +280,15 @@ def get_weekly_stats(
     rows = cur.fetchall()
     cur.close()
     conn.close()
+    return rows
+
+
+def _weekly_stats() -> dict:
+    try:
+        rows = _weekly_rows_from_rollup()
+    except Exception as e:
+        logger.warning(f"Upload rollup unavailable, aggregating live: {e}")
+        rows = _weekly_rows_live()
 
     # Collect unique job titles (preserve order of first appearance)
     seen_roles = []
@@ -146,26 +297,7 @@ def get_weekly_stats(
         if title not in seen_roles:
             seen_roles.append(title)
 
-    # Assign colors per role
-    role_colors = [
-        "#3b82f6",  # blue
-        "#06b6d4",  # teal / cyan
-        "#8b5cf6",  # purple
-        "#10b981",  # emerald
-        "#f97316",  # orange
-        "#ec4899",  # pink
-        "#eab308",  # yellow
-        "#ef4444",  # red
-        "#14b8a6",  # teal-alt
-        "#6366f1",  # indigo
-    ]
-
-    job_roles = []
-    for i, role in enumerate(seen_roles):
-        job_roles.append({
-            "key": role,
-            "color": role_colors[i % len(role_colors)],
-        })
+    job_roles = _job_roles(seen_roles)
 
     # Build per-day objects: { day: "Mon", "Cyber Dev": 5, "Cloud": 3, ... }
     day_map = {}  # date_str -> dict
@@ -189,13 +321,128 @@ def get_weekly_stats(
     return {"weekly_stats": data, "job_roles": job_roles}
 
 
+def _job_roles(titles: List[str]) -> List[dict]:
+    """Chart legend: a color per role, in the given order."""
+    return [
+        {"key": title, "color": _ROLE_COLORS[i % len(_ROLE_COLORS)]}
+        for i, title in enumerate(titles)
+    ]
+
+
+# Bucket query: applications per bucket per job title, ordered by bucket.
+# The rollup already holds them per day; without it the base tables are
+# aggregated the same way.
+_BUCKETS_FROM_ROLLUP = """
+    SELECT date_trunc(%(granularity)s, u.day::timestamp)::date AS bucket, j.title, SUM(u.applications)
+    FROM resume_upload_rollup u
+    JOIN jobs j ON j.id = u.job_id
+    WHERE u.day BETWEEN %(start)s AND %(end)s AND u.applications > 0
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+_BUCKETS_LIVE = """
+    SELECT date_trunc(%(granularity)s, r.uploaded_at)::date AS bucket, j.title, COUNT(*)
+    FROM resumes r
+    JOIN applications a ON a.resume_id = r.id
+    JOIN jobs j ON j.id = a.job_id
+    WHERE r.uploaded_at >= %(start)s AND r.uploaded_at < %(end)s::date + 1
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+_BUCKET_FETCH_ROWS = 2000
+
+
+def _open_buckets(params: dict):
+    """
+    ``(conn, cursor, titles)``: a server-side cursor over the bucket rows
+    (fetched _BUCKET_FETCH_ROWS at a time while streaming) and the job
+    titles in the range, in order of first appearance.
+    """
+    conn = get_db_connection()
+    try:
+        for query in (_BUCKETS_FROM_ROLLUP, _BUCKETS_LIVE):
+            try:
+                cur = conn.cursor()
+                cur.execute(f"""
+                    SELECT title FROM ({query}) q
+                    GROUP BY title ORDER BY MIN(bucket), title;
+                """, params)
+                titles = [row[0] for row in cur.fetchall()]
+                cur.close()
+                cur = conn.cursor(name="upload_buckets")
+                cur.itersize = _BUCKET_FETCH_ROWS
+                cur.execute(query, params)
+                return conn, cur, titles
+            except Exception as e:
+                if query is _BUCKETS_LIVE:
+                    raise
+                logger.warning(f"Upload rollup unavailable, bucketing live: {e}")
+                conn.rollback()
+    except Exception:
+        conn.close()
+        raise
+
+
+def _bucket_lines(conn, cur, header: dict) -> Iterator[str]:
+    """NDJSON: the header, then one line per bucket with its per-role counts."""
+    try:
+        yield json.dumps(header) + "\n"
+        bucket, counts = None, {}
+        for day, title, count in cur:
+            if day != bucket and counts:
+                yield json.dumps({"bucket": bucket.isoformat(), "counts": counts}) + "\n"
+                counts = {}
+            bucket = day
+            counts[title] = int(count)
+        if counts:
+            yield json.dumps({"bucket": bucket.isoformat(), "counts": counts}) + "\n"
+    finally:
+        cur.close()
+        conn.close()
+
+
+@router.get("/dashboard/upload-buckets", tags=["Dashboard"])
+def get_upload_buckets(
+    granularity: Literal["day", "week", "month", "year"] = Query("day"),
+    start: Optional[date] = Query(None, description="First day of the range (default: 1 January this year)."),
+    end: Optional[date] = Query(None, description="Last day of the range, inclusive (default: today)."),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Resume upload counts per time bucket per job role, computed in SQL
+    with `date_trunc` over the upload rollup. Weeks start on Monday;
+    buckets without uploads are left out. Streamed as NDJSON:
+
+        {"granularity": "month", "start": "2026-01-01", "end": "2026-10-18",
+         "job_roles": [{"key": "Cyber Dev", "color": "#3b82f6"}, ...]}
+        {"bucket": "2026-01-01", "counts": {"Cyber Dev": 5, "Cloud Support Engineer": 3}}
+        ...
+    """
+    end = end or date.today()
+    start = start or date(end.year, 1, 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    params = {"granularity": granularity, "start": start, "end": end}
+    conn, cur, titles = _open_buckets(params)
+    header = {
+        "granularity": granularity,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "job_roles": _job_roles(titles),
+    }
+    return StreamingResponse(_bucket_lines(conn, cur, header), media_type="application/x-ndjson")
+
+
 @router.get("/dashboard/raw-resumes", tags=["Dashboard"])
 def get_raw_resumes(
     current_user: dict = Depends(get_current_user),
 ):
     """
     Return all resumes with their associated job role since Jan 1, 2026.
-    Used by the frontend to dynamically transform and group into Week/Month/Year views.
+    Kept for existing clients; the dashboard chart now reads
+    /dashboard/upload-buckets, which counts in SQL instead of shipping
+    every row.
     """
     conn = get_db_connection()
     cur = conn.cursor()
@@ -5,3 +5,10 @@ router = APIRouter()
 @router.get("/health", tags=["Health"])
 def health_check():
     return {"status": "OK", "message": "ATS backend is running"}
+
+
+@router.get("/health/llm-cache", tags=["Health"])
+def llm_cache_health():
+    """LLM response cache metrics for this process: hit rate, saved latency."""
+    from app.services.llm_cache import llm_cache_stats
+    return llm_cache_stats()
@@ -13,9 +13,11 @@ from app.db.crud import (
 from app.core.security import get_current_user
 from typing import List
 import json
+import logging
 import uuid
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 def _parse_skill_priorities(raw) -> list:
@@ -90,11 +92,10 @@ def create_job(
 
     task_id = None
     try:
-        from app.workers.tasks import process_job_task
-        task = process_job_task.delay(job_id, job_data)
-        task_id = task.id
-    except Exception:
-        pass
+        from app.workers.tasks import process_job_task, submit_task
+        task_id = submit_task(process_job_task, job_id, job_data)
+    except Exception as e:
+        logger.warning(f"Could not queue profiling for job {job_id}: {e}")
 
     return {
         "message":  "Job created successfully",
@@ -147,9 +148,9 @@ def update_job_status(
 @router.post("/jobs/cleanup", tags=["Jobs"])
 def trigger_cleanup(current_user: dict = Depends(get_current_user)):
     """Manually trigger the background cleanup of stale resumes."""
-    from app.workers.tasks import cleanup_resumes_task
-    cleanup_resumes_task.delay()
-    return {"message": "Cleanup task triggered successfully"}
+    from app.workers.tasks import cleanup_resumes_task, submit_task
+    task_id = submit_task(cleanup_resumes_task)
+    return {"message": "Cleanup task triggered successfully", "task_id": task_id}
 
 
 @router.delete("/jobs/{job_id}", tags=["Jobs"])
@@ -203,7 +204,8 @@ async def upload_resumes_to_job(
     Server-side limits: max 150 files, max 10MB each.
     """
     from app.db.crud import insert_resume, link_manual_resume_to_job
-    from app.workers.tasks import process_resume_task
+    from app.workers.tasks import enqueue_resume_processing
+    from app.workers.celery_worker import QUEUE_BULK_INGEST
     import os
 
     # ── Guard: file count limit ──────────────────────────────
@@ -267,8 +269,8 @@ async def upload_resumes_to_job(
             # Link to Job
             link_manual_resume_to_job(job_id, resume_id)
 
-            # Trigger Background Processing
-            process_resume_task.delay(resume_id, file_path)
+            # Trigger Background Processing (bulk queue: keeps live traffic responsive)
+            enqueue_resume_processing(resume_id, file_path, queue=QUEUE_BULK_INGEST)
 
             results.append({"filename": filename, "status": "uploaded", "resume_id": resume_id})
         except Exception as e:
@@ -162,6 +162,13 @@ async def submit_application(
         logger.error(f"Failed to record application: {e}")
         raise HTTPException(status_code=500, detail="Failed to submit your application. Please try again.")
 
+    # ── Profile in the background (interactive queue, ahead of HR batches) ──
+    try:
+        from app.workers.tasks import enqueue_resume_processing
+        enqueue_resume_processing(resume_id, file_path)
+    except Exception as e:
+        logger.warning(f"Could not queue profiling for resume {resume_id}: {e}")
+
     return {
         "status": "submitted",
         "message": "Your application has been received. Thank you!",
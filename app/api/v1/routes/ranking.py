@@ -2,23 +2,38 @@
 Ranking routes — score all resumes against a job, store full analysis,
 and return structured shortlist with candidate insights.
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from pydantic import BaseModel
 import os
 import json
 import logging
 
 from app.services.resume_parser import parse_resume
-from app.services.scorer import score_resume
+from app.services.scorer import score_resume, normalize_text
+from app.services.section_segmenter import sections_from_profile
 from app.db.crud import (
     get_job_by_id,
     get_all_resume_files,        # kept for rank-resume single endpoint
     get_resume_files_for_job,    # scoped: only resumes for a specific job
     upsert_ranking,
     get_rankings_for_job,
-    bulk_delete_resumes,         # used by post-ranking cleanup
+    get_ranking,
+    update_ranking_insights,
+    set_ranking_llm_insights,
+    get_resume_by_id,
+    get_resume_texts,
 )
-from app.services.job_ranker import rank_resumes_for_job
+from app.services.cleanup import assign_tier, cleanup_low_value_resumes
+from app.services.job_ranker import (
+    build_job_payload,
+    rank_resumes_for_job,
+    rank_top_k_for_job,
+    complete_pending_insights,
+)
+from app.core.config import get_settings
 from app.core.security import get_current_user
 
 router = APIRouter()
@@ -65,11 +80,17 @@ def rank_resume(
 @router.post("/rank/job/{job_id}", tags=["Ranking"])
 def rank_job(
     job_id: int,
+    top_k: Optional[int] = Query(None, ge=1, le=500),
     current_user: dict = Depends(get_current_user),
 ):
     """
     Score ALL uploaded resumes against `job_id`, store results with full
     breakdown and insights, and return ranked list.
+
+    With `top_k`, insight text is only generated for the top K and for
+    Tier C and above; scores and tiers are the same as without it. Other
+    candidates are stored with `insights_pending` and get theirs on demand
+    from GET /rank/job/{job_id}/candidates/{resume_id}/insights.
     """
     job = get_job_by_id(job_id)
     if not job:
@@ -84,7 +105,10 @@ def rank_job(
             "ranked_count": 0,
         }
 
-    results = rank_resumes_for_job(job, resumes)
+    if top_k:
+        results = rank_top_k_for_job(job, resumes, top_k)
+    else:
+        results = rank_resumes_for_job(job, resumes)
 
     # Persist each result with full JSON
     for r in results:
@@ -114,7 +138,7 @@ def rank_job(
                 "resume_id":       r["resume_id"],
                 "filename":        r["filename"],
                 "score":           r["score"],
-                "tier":            _assign_tier(r["score"]),
+                "tier":            assign_tier(r["score"]),
                 "breakdown":       r.get("breakdown"),
                 "matched_skills":  r.get("matched_skills", []),
                 "missing_skills":  r.get("missing_skills", []),
@@ -125,6 +149,64 @@ def rank_job(
     }
 
 
+# ─────────────────────────────────────────────
+# POST /rank/job/{job_id}/async — Ranking on background workers
+# ─────────────────────────────────────────────
+
+@router.post("/rank/job/{job_id}/async", tags=["Ranking"])
+def rank_job_async(
+    job_id: int,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Queue a full ranking of `job_id` on the background workers: applicants are
+    scored in chunks of `chunk_size` (default RANKING_CHUNK_SIZE) in
+    parallel, then calibrated, stored and cleaned up as one pool.
+
+    Poll GET /rank/job/{job_id}/async/{task_id}; stored results are then
+    served by the shortlist endpoints.
+    """
+    job = get_job_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    resumes = get_resume_files_for_job(job_id)
+    if not resumes:
+        return {
+            "message": "No candidate applications found for this job yet. Share the /apply link with candidates.",
+            "task_id": None,
+            "status":  "completed",
+        }
+
+    from app.workers.tasks import enqueue_job_ranking
+    try:
+        task_id, chunks = enqueue_job_ranking(job, resumes, chunk_size)
+    except Exception as exc:
+        logger.error("Could not queue ranking for job %d: %s", job_id, exc)
+        raise HTTPException(status_code=503, detail="Ranking workers are unavailable")
+
+    return {
+        "job_id":          job_id,
+        "task_id":         task_id,
+        "status":          "processing",
+        "applicant_count": len(resumes),
+        "chunk_count":     chunks,
+    }
+
+
+@router.get("/rank/job/{job_id}/async/{task_id}", tags=["Ranking"])
+def get_rank_job_async_status(
+    job_id: int,
+    task_id: str,
+    current_user: dict = Depends(get_current_user),
+):
+    """State of a queued ranking; includes the summary once it has finished."""
+    from app.workers.tasks import get_task_status
+
+    return {"job_id": job_id, "task_id": task_id, **get_task_status(task_id)}
+
+
 # ─────────────────────────────────────────────
 # GET /rank/job/{job_id} — Raw rankings
 # ─────────────────────────────────────────────
@@ -157,85 +239,6 @@ def get_job_rankings(
 # GET /rank/job/{job_id}/shortlist — Rich shortlist
 # ─────────────────────────────────────────────
 
-def _assign_tier(score: int) -> str:
-    """
-    Tier classification aligned with new scoring engine v2.
-    90+ → A (Strong Hire)
-    75+ → B (Good Fit)
-    60+ → C (Moderate)
-    <60 → D (Weak Fit)
-    """
-    if score >= 90: return "A"
-    if score >= 75: return "B"
-    if score >= 60: return "C"
-    return "D"
-
-
-# ─────────────────────────────────────────────────────────
-# Post-ranking cleanup
-# ─────────────────────────────────────────────────────────
-
-def cleanup_low_value_resumes(job_id: int, results: list) -> dict:
-    """
-    Run immediately after ranking completes for a specific job.
-
-    Rules
-    -----
-    • Tier A (score ≥ 90) — keep forever, never touched.
-    • Tier B (score ≥ 75) — keep forever, never touched.
-    • Tier C (score ≥ 60) — keep top 20 by score.
-                            If Tier A+B count < 10, keep top 50 instead.
-    • Tier D (score < 60)  — delete all immediately.
-
-    Only operates on resumes present in `results` (the ranked pool for
-    this specific job). Never touches resumes from other jobs.
-
-    Returns a summary dict describing what was deleted.
-    """
-    if not results:
-        return {"deleted_tier_d": 0, "deleted_tier_c_excess": 0, "ids_deleted": []}
-
-    # Partition by tier
-    tier_a_b = [r for r in results if _assign_tier(r["score"]) in ("A", "B")]
-    tier_c   = [r for r in results if _assign_tier(r["score"]) == "C"]
-    tier_d   = [r for r in results if _assign_tier(r["score"]) == "D"]
-
-    ids_to_delete: list[int] = []
-
-    # Rule 1: delete all Tier D
-    ids_to_delete.extend(r["resume_id"] for r in tier_d)
-
-    # Rule 2: cap Tier C
-    strong_count = len(tier_a_b)
-    tier_c_limit = 50 if strong_count < 10 else 20
-
-    # Sort Tier C descending by score so we keep the best ones
-    tier_c_sorted = sorted(tier_c, key=lambda r: r["score"], reverse=True)
-    tier_c_excess = tier_c_sorted[tier_c_limit:]   # everything beyond the limit
-    ids_to_delete.extend(r["resume_id"] for r in tier_c_excess)
-
-    deleted_ids: list[int] = []
-    if ids_to_delete:
-        try:
-            result = bulk_delete_resumes(ids_to_delete)
-            deleted_ids = result.get("deleted", [])
-            logger.info(
-                "Cleanup for job %d: deleted %d resume(s) (Tier D=%d, Tier C excess=%d)",
-                job_id, len(deleted_ids), len(tier_d), len(tier_c_excess),
-            )
-        except Exception as exc:
-            # Cleanup failure must never crash the ranking response
-            logger.error("Cleanup failed for job %d: %s", job_id, exc)
-
-    return {
-        "tier_c_limit_used": tier_c_limit,
-        "strong_candidates": strong_count,
-        "deleted_tier_d": len(tier_d),
-        "deleted_tier_c_excess": len(tier_c_excess),
-        "ids_deleted": deleted_ids,
-    }
-
-
 def _parse_json_field(field):
     """Safely parse a JSONB field that may be a dict or a JSON string."""
     if field is None:
@@ -281,7 +284,7 @@ def get_job_shortlist(
         breakdown   = _parse_json_field(r[4]) if len(r) > 4 else None
         insights    = _parse_json_field(r[5]) if len(r) > 5 else None
 
-        tier = _assign_tier(score)
+        tier = assign_tier(score)
 
         # Extract skill arrays from insights (stored as embedded JSON)
         matched_skills    = insights.get("matched_skills", [])   if insights else []
@@ -326,6 +329,9 @@ def get_job_shortlist(
             "gaps":              insights.get("gaps", [])              if insights else [],
             "reasoning":         insights.get("reasoning", "")        if insights else "",
             "recommendation":    insights.get("recommendation", "")   if insights else "",
+            "insights_pending":  bool(insights.get("insights_pending")) if insights else False,
+            # Optional LLM assessment (GET .../shortlist/llm-insights)
+            "llm_insights":      insights.get("llm_insights")          if insights else None,
         }
         shortlist.append(candidate)
 
@@ -356,6 +362,134 @@ def get_job_shortlist(
     }
 
 
+# ─────────────────────────────────────────────
+# GET /rank/job/{job_id}/shortlist/llm-insights — LLM assessment of the top-K
+# ─────────────────────────────────────────────
+
+def _load_resume_text(filename: str, parsed_text: Optional[str]) -> str:
+    if parsed_text:
+        return parsed_text
+    return parse_resume(os.path.join("uploads", filename))
+
+
+@router.get("/rank/job/{job_id}/shortlist/llm-insights", tags=["Ranking"])
+async def stream_shortlist_llm_insights(
+    job_id: int,
+    top_k: Optional[int] = Query(None, ge=1, le=50),
+    refresh: bool = False,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    LLM assessment of the `top_k` best-ranked candidates (default
+    LLM_INSIGHTS_TOP_K), streamed as Server-Sent Events as each completes.
+    Assessments already stored are sent first and not regenerated unless
+    `refresh`; new ones are stored under `insights.llm_insights`.
+    """
+    from app.services.llm_insights import generate_llm_insights, get_rate_limiter
+    from app.services.llm_service import LLMService
+
+    settings = get_settings()
+    job = await run_in_threadpool(get_job_by_id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    _, job_title, job_payload = build_job_payload(job)
+
+    rows = await run_in_threadpool(get_rankings_for_job, job_id)   # score DESC
+    stored, pending = [], []
+    for r in rows[:top_k or settings.LLM_INSIGHTS_TOP_K]:
+        insights = (_parse_json_field(r[5]) if len(r) > 5 else None) or {}
+        if insights.get("llm_insights") and not refresh:
+            stored.append({"resume_id": r[0], "status": "stored", "llm_insights": insights["llm_insights"]})
+        else:
+            pending.append({"resume_id": r[0], "filename": r[1], "score": r[2], "insights": insights})
+
+    texts = await run_in_threadpool(get_resume_texts, [c["resume_id"] for c in pending])
+    unreadable = []
+    for c in list(pending):
+        filename, parsed_text = texts.get(c["resume_id"], (c["filename"], None))
+        try:
+            c["resume_text"] = await run_in_threadpool(_load_resume_text, filename, parsed_text)
+        except Exception as e:
+            logger.warning(f"LLM insights: resume {c['resume_id']} unreadable: {e}")
+            pending.remove(c)
+            unreadable.append({"resume_id": c["resume_id"], "status": "failed",
+                               "error": "Resume text unavailable", "attempts": 0})
+
+    llm = LLMService(settings)
+    limiter = get_rate_limiter(llm.provider, settings.LLM_REQUESTS_PER_MINUTE,
+                               burst=settings.LLM_INSIGHTS_CONCURRENCY)
+
+    async def event_generator():
+        for event in stored + unreadable:
+            yield f"data: {json.dumps(event)}\n\n"
+        async for result in generate_llm_insights(
+            llm, job_title, job_payload, pending,
+            concurrency=settings.LLM_INSIGHTS_CONCURRENCY,
+            max_attempts=settings.LLM_INSIGHTS_MAX_ATTEMPTS,
+            limiter=limiter,
+            resume_token_budget=settings.CHAT_RESUME_TOKEN_BUDGET,
+        ):
+            if result["status"] == "completed":
+                try:
+                    await run_in_threadpool(set_ranking_llm_insights, job_id,
+                                            result["resume_id"], result["llm_insights"])
+                except Exception as e:
+                    logger.error(f"Could not store LLM insights for resume {result['resume_id']}: {e}")
+            yield f"data: {json.dumps(result)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+# ─────────────────────────────────────────────
+# GET /rank/job/{job_id}/candidates/{resume_id}/insights — Lazy insights
+# ─────────────────────────────────────────────
+
+@router.get("/rank/job/{job_id}/candidates/{resume_id}/insights", tags=["Ranking"])
+def get_candidate_insights(
+    job_id: int,
+    resume_id: int,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Return full insights for one candidate. Candidates ranked in top-K mode
+    outside the shortlist are stored with `insights_pending`; their insights
+    are generated here on first view and persisted.
+    """
+    job = get_job_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    ranking  = get_ranking(job_id, resume_id)
+    insights = _parse_json_field(ranking[3]) if ranking else None
+    if insights and not insights.get("insights_pending"):
+        return {"job_id": job_id, "resume_id": resume_id, "insights": insights}
+
+    resume = get_resume_by_id(resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    resume_text = resume[6]
+    sections    = None
+    if resume_text:
+        # Reuse the section spans stored with the resume profile when they still fit
+        profile_data = _parse_json_field(resume[5]) or {}
+        sections = sections_from_profile(
+            profile_data.get("sections"), normalize_text(resume_text)
+        )
+    else:
+        try:
+            resume_text = parse_resume(os.path.join("uploads", resume[1]))
+        except (ValueError, FileNotFoundError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    insights = complete_pending_insights(job, resume_text, insights, sections)
+    if ranking:
+        update_ranking_insights(job_id, resume_id, insights)
+
+    return {"job_id": job_id, "resume_id": resume_id, "insights": insights}
+
+
 # ─────────────────────────────────────────────
 # GET /rank/job/{job_id}/full-report
 # ─────────────────────────────────────────────
@@ -1,28 +1,46 @@
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Body
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
+import asyncio
 import json
 from typing import List, Optional
 import uuid
 import os
 import shutil
-from cachetools import TTLCache
 from pydantic import BaseModel
 import logging
 
 logger = logging.getLogger(__name__)
 
+from app.core.config import get_settings
 from app.core.security import get_current_user
-from app.db.crud import get_resume_by_id, get_all_resumes
-from app.services.resume_analyzer import ResumeAnalyzer
+from app.db.crud import get_resumes_for_analysis, get_all_resumes
+from app.orchestration.pipeline import get_pipeline
+from app.services.chat_sessions import get_session_store
+from app.services.resume_analyzer import (
+    ResumeAnalyzer, analyze_stored_resume, analyze_stored_resumes, cache_analysis, get_cached_analysis,
+)
+from app.services.resume_digest import build_resume_digest, format_history
 from app.services.llm_service import LLMService
-from app.services.resume_parser import parse_resume
+from app.services.resume_parser import ResumeParseError, parse_resume
 
 router = APIRouter(prefix="/resume-analysis", tags=["Resume Analysis"])
 analyzer = ResumeAnalyzer()
 llm_service = LLMService()
 
-# Session cache for "Upload & Chat" (TTL: 1 hour, Max: 100 sessions)
-session_cache = TTLCache(maxsize=100, ttl=3600)
+def _chat_system_prompt(session) -> str:
+    """Resume digest + recent history, each within its token budget."""
+    settings = get_settings()
+    digest = session.digest or build_resume_digest(session.resume_text, settings.CHAT_RESUME_TOKEN_BUDGET)
+    return (
+        "You are an expert career consultant and ATS analyzer. "
+        "Your ONLY goal is to help candidates improve their resume and career prospects. "
+        "Strictly only answer questions related to the provided resume, career advice, job applications, or resume formatting. "
+        "If the user asks about unrelated topics (e.g., general knowledge, jokes, unrelated services), "
+        "politely decline and state that you are a specialized Resume Analysis Assistant.\n\n"
+        f"RESUME CONTENT:\n{digest}\n\n"
+        f"PREVIOUS CONTEXT:\n{format_history(session.history, settings.CHAT_HISTORY_TOKEN_BUDGET)}"
+    )
 
 class ChatRequest(BaseModel):
     message: str
@@ -30,49 +48,147 @@ class ChatRequest(BaseModel):
 class BatchAnalysisRequest(BaseModel):
     resume_ids: List[int]
 
+def _stored_profile(value) -> Optional[dict]:
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    return value if isinstance(value, dict) else None
+
+def _resume_file_path(filename: str) -> str:
+    file_path = f"uploads/{filename}"
+    if not os.path.exists(file_path):
+        # Try absolute path from settings if relative fails
+        file_path = os.path.join(get_settings().UPLOAD_DIR, filename)
+    return file_path
+
+def _analysis_text(parsed_text: Optional[str], filename: str) -> str:
+    """The stored parsed text; the file is only parsed again when there is none."""
+    if parsed_text and parsed_text.strip():
+        return parsed_text
+    return parse_resume(_resume_file_path(filename))
+
 @router.post("/single/{resume_id}")
 def analyze_single_resume(
     resume_id: int,
     current_user: dict = Depends(get_current_user)
 ):
     """Analyze a single existing resume."""
-    resume = get_resume_by_id(resume_id)
-    if not resume:
+    rows = get_resumes_for_analysis([resume_id])
+    if not rows:
         raise HTTPException(status_code=404, detail="Resume not found")
-    
-    # DB columns: id, filename, uploaded_at, experience_years, extracted_skills, profile_data, (parsed_text if updated)
-    # Let's assume parsed_text is in row[2] or we need to re-parse from file
-    filename = resume[1]
-    file_path = f"uploads/{filename}"
-    
+    _, filename, file_hash, parsed_text, profile_data = rows[0]
+
     try:
-        if not os.path.exists(file_path):
-             # Try absolute path from settings if relative fails
-             from app.core.config import get_settings
-             file_path = os.path.join(get_settings().UPLOAD_DIR, filename)
-             
-        text = parse_resume(file_path)
-        analysis = analyzer.analyze_standalone(text)
+        analysis = get_cached_analysis(file_hash)
+        if analysis is None:
+            text = _analysis_text(parsed_text, filename)
+            analysis = analyze_stored_resume(text, _stored_profile(profile_data))
+            cache_analysis(file_hash, analysis)
         analysis["filename"] = filename
         return analysis
+    except ResumeParseError as e:
+        logger.warning(f"Resume parsing failed for ID {resume_id}: {e}")
+        raise HTTPException(status_code=422, detail=f"Resume could not be parsed ({e.reason}).")
     except Exception as e:
         logger.error(f"Resume analysis failed for ID {resume_id}: {e}")
         raise HTTPException(status_code=500, detail="Resume analysis failed. Please try again.")
 
+def _batch_line(resume_id: int, filename: str, analysis: dict) -> dict:
+    analysis["resume_id"] = resume_id
+    analysis["filename"] = filename
+    return analysis
+
+def _batch_error(resume_id: int, filename: str, exc: Exception) -> dict:
+    if isinstance(exc, FileNotFoundError):
+        error = "Resume file not found."
+    elif isinstance(exc, ResumeParseError):
+        logger.warning(f"Resume parsing failed for ID {resume_id}: {exc}")
+        error = f"Resume could not be parsed ({exc.reason})."
+    else:
+        logger.error(f"Resume analysis failed for ID {resume_id}: {exc}")
+        error = "Resume analysis failed."
+    return {"resume_id": resume_id, "filename": filename, "error": error}
+
 @router.post("/batch")
-def analyze_batch(
+async def analyze_batch(
     request: BatchAnalysisRequest,
     current_user: dict = Depends(get_current_user)
 ):
-    """Analyze multiple resumes in batch."""
-    results = []
-    for rid in request.resume_ids:
+    """
+    Analyze multiple resumes, streamed as NDJSON (one JSON object per line)
+    in the order they finish. Each line is an analysis with its
+    `resume_id` and `filename`, or `{"resume_id", "error"}`.
+
+    All rows are read in one query, stored parsed text and profile
+    features are reused and cached analyses are returned as they are. The
+    rest are analysed in the local analysis process pool (see
+    ATSPipeline.submit_analysis), BATCH_ANALYSIS_CHUNK_SIZE resumes per
+    task (analyze_stored_resumes).
+    """
+    settings = get_settings()
+    resume_ids = list(dict.fromkeys(request.resume_ids))
+    rows = await run_in_threadpool(get_resumes_for_analysis, resume_ids)
+    by_id = {row[0]: row for row in rows}
+    pipeline = get_pipeline()
+    chunk_size = max(settings.BATCH_ANALYSIS_CHUNK_SIZE, 1)
+    semaphore = asyncio.Semaphore(max(settings.BATCH_ANALYSIS_CONCURRENCY, 1))
+
+    async def prepare(resume_id: int):
+        """``(line, None)`` when the answer is known now, else ``(None, work item)``."""
+        row = by_id.get(resume_id)
+        if row is None:
+            return {"resume_id": resume_id, "error": "Resume not found"}, None
+        _, filename, file_hash, parsed_text, profile_data = row
+        analysis = get_cached_analysis(file_hash)
+        if analysis is not None:
+            return _batch_line(resume_id, filename, analysis), None
+        try:
+            text = parsed_text if parsed_text and parsed_text.strip() else None
+            if text is None:
+                async with semaphore:
+                    text = await run_in_threadpool(_analysis_text, None, filename)
+        except Exception as e:
+            return _batch_error(resume_id, filename, e), None
+        return None, (resume_id, filename, file_hash, text, _stored_profile(profile_data))
+
+    async def analyze_chunk(items: list) -> list:
         try:
-            res = analyze_single_resume(rid, current_user)
-            results.append(res)
-        except Exception:
-            continue
-    return results
+            analyses = await asyncio.wrap_future(pipeline.submit_analysis(
+                analyze_stored_resumes, [item[3] for item in items], [item[4] for item in items]
+            ))
+        except Exception as e:
+            return [_batch_error(item[0], item[1], e) for item in items]
+        lines = []
+        for (resume_id, filename, file_hash, _, _), analysis in zip(items, analyses):
+            cache_analysis(file_hash, analysis)
+            lines.append(_batch_line(resume_id, filename, analysis))
+        return lines
+
+    async def ndjson_generator():
+        prepared = [asyncio.ensure_future(prepare(rid)) for rid in resume_ids]
+        chunks, items = [], []
+        try:
+            for next_done in asyncio.as_completed(prepared):
+                line, item = await next_done
+                if line is not None:
+                    yield json.dumps(line) + "\n"
+                    continue
+                items.append(item)
+                if len(items) == chunk_size:
+                    chunks.append(asyncio.ensure_future(analyze_chunk(items)))
+                    items = []
+            if items:
+                chunks.append(asyncio.ensure_future(analyze_chunk(items)))
+            for next_done in asyncio.as_completed(chunks):
+                for line in await next_done:
+                    yield json.dumps(line) + "\n"
+        finally:
+            for task in prepared + chunks:
+                task.cancel()
+
+    return StreamingResponse(ndjson_generator(), media_type="application/x-ndjson")
 
 @router.post("/upload")
 async def upload_and_analyze(
@@ -90,21 +206,22 @@ async def upload_and_analyze(
         shutil.copyfileobj(file.file, buffer)
     
     try:
-        text = parse_resume(file_path)
-        analysis = analyzer.analyze_standalone(text)
-        
-        # Create session
-        session_id = str(uuid.uuid4())
-        session_cache[session_id] = {
-            "resume_text": text,
-            "filename": file.filename,
-            "analysis": analysis,
-            "history": []
-        }
+        # Parsing waits on the parser pool (up to PARSER_TIMEOUT_SECONDS) and
+        # analysis is CPU work: keep both off the event loop
+        text = await run_in_threadpool(parse_resume, file_path)
+        analysis = await run_in_threadpool(analyzer.analyze_standalone, text)
         
+        # Create session (shared store: any worker can serve the chat); the
+        # prompt digest is built once here and reused for every chat turn
+        digest = await run_in_threadpool(build_resume_digest, text, get_settings().CHAT_RESUME_TOKEN_BUDGET)
+        session_id = await run_in_threadpool(get_session_store().create, text, file.filename, digest)
+
         analysis["session_id"] = session_id
         analysis["filename"] = file.filename
         return analysis
+    except ResumeParseError as e:
+        logger.warning(f"Upload parsing failed for {file.filename}: {e}")
+        raise HTTPException(status_code=422, detail=f"Resume could not be parsed ({e.reason}).")
     except Exception as e:
         logger.error(f"Upload and analysis failed: {e}")
         raise HTTPException(status_code=500, detail="Upload and analysis failed. Please try again.")
@@ -120,28 +237,17 @@ async def chat_with_resume(
     current_user: dict = Depends(get_current_user)
 ):
     """Chat about an uploaded resume in the current session."""
-    session = session_cache.get(session_id)
+    session_store = get_session_store()
+    session = await run_in_threadpool(session_store.get, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session expired or not found")
     
-    resume_text = session["resume_text"]
-    history = session["history"]
-    
-    system_prompt = (
-        "You are an expert career consultant and ATS analyzer. "
-        "Your ONLY goal is to help candidates improve their resume and career prospects. "
-        "Strictly only answer questions related to the provided resume, career advice, job applications, or resume formatting. "
-        "If the user asks about unrelated topics (e.g., general knowledge, jokes, unrelated services), "
-        "politely decline and state that you are a specialized Resume Analysis Assistant.\n\n"
-        f"RESUME CONTENT:\n{resume_text[:4000]}\n\n"
-        f"PREVIOUS CONTEXT:\n{str(history[-5:]) if history else 'First message.'}"
-    )
-
+    system_prompt = _chat_system_prompt(session)
     
-    response = llm_service.get_chat_response(system_prompt, request.message)
+    response = await llm_service.aget_chat_response(system_prompt, request.message)
     
     # Update history
-    history.append({"user": request.message, "ai": response})
+    await run_in_threadpool(session_store.append_turn, session_id, request.message, response)
     
     return {"response": response}
 
@@ -152,35 +258,23 @@ async def chat_with_resume_stream(
     current_user: dict = Depends(get_current_user)
 ):
     """Streaming chat about an uploaded resume in the current session."""
-    session = session_cache.get(session_id)
+    session_store = get_session_store()
+    session = await run_in_threadpool(session_store.get, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session expired or not found")
     
-    resume_text = session["resume_text"]
-    history = session["history"]
-    
-    system_prompt = (
-        "You are an expert career consultant and ATS analyzer. "
-        "Your ONLY goal is to help candidates improve their resume and career prospects. "
-        "Strictly only answer questions related to the provided resume, career advice, job applications, or resume formatting. "
-        "If the user asks about unrelated topics (e.g., general knowledge, jokes, unrelated services), "
-        "politely decline and state that you are a specialized Resume Analysis Assistant.\n\n"
-        f"RESUME CONTENT:\n{resume_text[:4000]}\n\n"
-        f"PREVIOUS CONTEXT:\n{str(history[-5:]) if history else 'First message.'}"
-    )
-
+    system_prompt = _chat_system_prompt(session)
     
-    def event_generator():
+    async def event_generator():
         full_response = ""
         try:
-            for token in llm_service.get_streaming_chat_response(system_prompt, request.message):
+            async for token in llm_service.aget_streaming_chat_response(system_prompt, request.message):
                 full_response += token
                 # Format as SSE
                 yield f"data: {json.dumps({'token': token})}\n\n"
             
             # Update history after full completion
-            history.append({"user": request.message, "ai": full_response})
-            session["history"] = history
+            await run_in_threadpool(session_store.append_turn, session_id, request.message, full_response)
             
         except Exception as e:
             logger.error(f"SSE streaming error: {e}")
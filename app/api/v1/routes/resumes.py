@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Query
 from fastapi.responses import FileResponse
-from app.db.crud import get_all_resumes, delete_resume, get_resume_by_id, get_unique_skills, get_resumes_by_job, get_all_jobs_for_filter, bulk_delete_resumes
+from app.db.crud import get_all_resumes, delete_resume, get_resume_by_id, get_unique_skills, get_resumes_by_job, get_all_jobs_for_filter, bulk_delete_resumes, get_resume_processing_status
 from app.models.resume import ResumeOut
 from typing import List, Optional
 from app.core.security import get_current_user
@@ -127,6 +127,41 @@ def delete_resume_endpoint(
     }
 
 
+@router.get("/resumes/{resume_id}/status", tags=["Resume"])
+def resume_processing_status(
+    resume_id: int,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Background processing state of a resume, read from its DB row:
+    queued, processing, completed or failed. ``current`` is False when the
+    stored profile predates the current parser/taxonomy version.
+    """
+    from app.orchestration.pipeline import processing_version
+
+    row = get_resume_processing_status(resume_id)
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found",
+        )
+
+    state, key, attempts, error, updated_at, processed_at = row
+    if state is None:
+        # Rows that predate processing state
+        state = "completed" if processed_at else "not_queued"
+
+    return {
+        "resume_id":    resume_id,
+        "status":       state,
+        "current":      bool(key) and key.endswith(":" + processing_version()),
+        "attempts":     attempts or 0,
+        "error":        error,
+        "updated_at":   updated_at,
+        "processed_at": processed_at,
+    }
+
+
 @router.get("/resumes/{resume_id}/download", tags=["Resume"])
 def download_resume(
     resume_id: int,
@@ -24,6 +24,20 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: str = ""
     ANTHROPIC_MODEL: str = "claude-3-5-sonnet-20241022"
     LLM_PROVIDER: str = "groq"
+    # *_BASE_URL overrides the provider endpoint (proxy, local fake server)
+    GROQ_BASE_URL: str = ""
+    OPENAI_BASE_URL: str = ""
+    ANTHROPIC_BASE_URL: str = ""
+    # Pooled keep-alive client per provider and process; the timeout is the
+    # default per call (callers can pass their own)
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_MAX_CONNECTIONS: int = 20
+    # Response cache: sqlite (LLM_CACHE_PATH) | redis (REDIS_URL) | "" (off)
+    LLM_CACHE_BACKEND: str = "sqlite"
+    LLM_CACHE_PATH: str = "cache/llm_responses.sqlite3"
+    LLM_CACHE_TTL_SECONDS: int = 86_400
+    LLM_CACHE_MAX_ENTRIES: int = 10_000
 
     # App
     APP_NAME: str = "Enterprise ATS"
@@ -45,17 +59,86 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE_MB: int = 10
     ALLOWED_EXTENSIONS: str = "pdf,docx"
 
+    # Resume parser pool (isolated PDF/DOCX extraction; 0 = parse in-process)
+    PARSER_POOL_SIZE: int = 2
+    PARSER_TIMEOUT_SECONDS: int = 30
+    PARSER_MAX_RSS_MB: int = 512
+    PARSER_MAX_PAGES: int = 30
+    PARSER_MAX_CHARS: int = 200_000
+    PARSER_MAX_FILES_PER_WORKER: int = 50
+
+    # PDF text extraction backend: pdfplumber | pdfium | pdfminer (fast
+    # backends fall back to pdfplumber when they return too little text)
+    PDF_BACKEND: str = "pdfplumber"
+    PDF_FALLBACK_MIN_CHARS_PER_PAGE: int = 200
+
     # Celery / Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
 
+    # Background tasks: "celery" (Redis workers) or "local" (in-process
+    # executor for single-node deployments without Redis)
+    TASK_BACKEND: str = "celery"
+    LOCAL_EXECUTOR_MAX_QUEUED: int = 500
+    LOCAL_EXECUTOR_IO_THREADS: int = 4
+    LOCAL_EXECUTOR_CPU_PROCESSES: int = 0   # 0 = CPU count - 1
+
+    # Resume chat sessions: redis (shared by all workers, survives restarts)
+    # | memory (one process) | "" = redis, or memory with TASK_BACKEND=local
+    CHAT_SESSION_BACKEND: str = ""
+    CHAT_SESSION_MAX: int = 10_000
+    CHAT_SESSION_TTL_SECONDS: int = 3600
+    CHAT_HISTORY_MAX_TURNS: int = 10
+    # Prompt budgets (estimated tokens) for the resume digest and history
+    CHAT_RESUME_TOKEN_BUDGET: int = 800
+    CHAT_HISTORY_TOKEN_BUDGET: int = 400
+
+    # Optional LLM insights for the top-K of a shortlist; requests per
+    # minute 0 = the provider's default (see llm_insights)
+    LLM_INSIGHTS_TOP_K: int = 10
+    LLM_INSIGHTS_CONCURRENCY: int = 4
+    LLM_INSIGHTS_MAX_ATTEMPTS: int = 3
+    LLM_REQUESTS_PER_MINUTE: int = 0
+
+    # Resume processing: a queued/processing claim older than this is
+    # considered abandoned (crashed worker) and can be taken over
+    RESUME_PROCESSING_LEASE_SECONDS: int = 600
+
+    # Distributed ranking: applicants per score_chunk task
+    RANKING_CHUNK_SIZE: int = 200
+
+    # Celery worker processes: DB pool per process, recycling limits
+    WORKER_DB_POOL_MAX: int = 4
+    WORKER_MAX_TASKS_PER_CHILD: int = 200
+    WORKER_MAX_MEMORY_PER_CHILD_MB: int = 400
+
+    # Per-process cache of parsed resume text, in characters (0 disables)
+    PARSED_TEXT_CACHE_CHARS: int = 20_000_000
+
+    # Per-process cache of standalone analyses, keyed by file hash and
+    # analyzer version (entries); /batch: files parsed at once, resumes
+    # per process-pool task, and the size of that pool (per API worker,
+    # capped at LOCAL_EXECUTOR_CPU_PROCESSES)
+    ANALYSIS_CACHE_SIZE: int = 2048
+    BATCH_ANALYSIS_CONCURRENCY: int = 8
+    BATCH_ANALYSIS_CHUNK_SIZE: int = 8
+    BATCH_ANALYSIS_PROCESSES: int = 2
+
+    # Dashboard: answer cache, and how many recent days the periodic
+    # refresh_upload_rollup_task recomputes from the base tables
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+    UPLOAD_ROLLUP_REBUILD_DAYS: int = 14
+
     # Security
     BCRYPT_ROUNDS: int = 12
 
     # Data Lifecycle
     RESUME_RETENTION_DAYS: int = 90
 
+    # Scoring -- skill taxonomy data file (empty = bundled app/data/skill_taxonomy.json)
+    SKILL_TAXONOMY_PATH: str = ""
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
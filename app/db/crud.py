@@ -1,9 +1,9 @@
 from app.db.dbase import get_db_connection
 from typing import List, Tuple, Optional
-from datetime import datetime
+from datetime import date, datetime
 from app.models.job import JobCreate
 from app.services.scorer import extract_years_of_experience
-from app.services.resume_parser import parse_resume
+from app.services.resume_parser import ResumeParseError, parse_resume
 import json
 import hashlib
 import os
@@ -51,7 +51,11 @@ def insert_resume(
 
     try:
         text = parse_resume(path)
-    except:
+    except ResumeParseError as exc:
+        # Stored without text; the record is still created and can be re-parsed later
+        print(f"Warning: resume {filename} stored without text ({exc})")
+        text = ""
+    except Exception:
         text = ""
 
     experience = extract_years_of_experience(text)
@@ -460,6 +464,53 @@ def upsert_ranking(job_id: int, resume_id: int, score: int,
     cursor.close()
     conn.close()
 
+
+def bulk_upsert_rankings(job_id: int, results: List[dict], page_size: int = 500) -> int:
+    """
+    Upsert many ranking rows for one job (same columns as upsert_ranking)
+    and ensure their job_resumes associations, in one transaction.
+    ``results`` are ranker result dicts. Returns the number of rows written.
+    """
+    if not results:
+        return 0
+    from psycopg2.extras import execute_values
+
+    rows = [
+        (
+            job_id,
+            r["resume_id"],
+            r["score"],
+            json.dumps(r["breakdown"]) if r.get("breakdown") else None,
+            json.dumps(r["insights"])  if r.get("insights")  else None,
+        )
+        for r in results
+    ]
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    execute_values(cursor, """
+        INSERT INTO rankings (job_id, resume_id, score, breakdown, insights)
+        VALUES %s
+        ON CONFLICT (job_id, resume_id)
+        DO UPDATE SET
+            score      = EXCLUDED.score,
+            breakdown  = EXCLUDED.breakdown,
+            insights   = EXCLUDED.insights,
+            created_at = CURRENT_TIMESTAMP;
+    """, rows, template="(%s, %s, %s, %s::jsonb, %s::jsonb)", page_size=page_size)
+
+    execute_values(cursor, """
+        INSERT INTO job_resumes (job_id, resume_id, status)
+        VALUES %s
+        ON CONFLICT (job_id, resume_id) DO NOTHING;
+    """, [(job_id, r["resume_id"]) for r in results],
+        template="(%s, %s, 'active')", page_size=page_size)
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return len(rows)
+
 def get_rankings_for_job(job_id: int):
     """Retrieve all rankings for a job, ordered by score descending. Includes candidate application data."""
     conn = get_db_connection()
@@ -511,6 +562,82 @@ def get_rankings_for_job(job_id: int):
     return rows
 
 
+def get_ranking(job_id: int, resume_id: int):
+    """Fetch one ranking row: (resume_id, score, breakdown, insights) or None."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT resume_id, score, breakdown, insights FROM rankings WHERE job_id = %s AND resume_id = %s",
+        (job_id, resume_id)
+    )
+    row = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    return row
+
+
+def update_ranking_insights(job_id: int, resume_id: int, insights: dict):
+    """Replace the stored insights of a ranking without touching its score."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "UPDATE rankings SET insights = %s::jsonb WHERE job_id = %s AND resume_id = %s",
+        (json.dumps(insights), job_id, resume_id)
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def set_ranking_llm_insights(job_id: int, resume_id: int, llm_insights: dict):
+    """
+    Store LLM insights under ``insights -> 'llm_insights'``. Merged in SQL so
+    it never overwrites template insights completed concurrently.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE rankings
+        SET insights = COALESCE(insights, '{}'::jsonb) || jsonb_build_object('llm_insights', %s::jsonb)
+        WHERE job_id = %s AND resume_id = %s
+    """, (json.dumps(llm_insights), job_id, resume_id))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def get_resume_texts(resume_ids: List[int]) -> dict:
+    """``{resume_id: (filename, parsed_text)}`` for the given resumes, in one query."""
+    if not resume_ids:
+        return {}
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT id, filename, parsed_text FROM resumes WHERE id = ANY(%s)",
+        (list(resume_ids),)
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+def get_resumes_for_analysis(resume_ids: List[int]) -> List[tuple]:
+    """``(id, filename, file_hash, parsed_text, profile_data)`` rows for the given resumes, in one query."""
+    if not resume_ids:
+        return []
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT id, filename, file_hash, parsed_text, profile_data FROM resumes WHERE id = ANY(%s)",
+        (list(resume_ids),)
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return rows
+
+
 def update_resume_parsed_data(resume_id, experience_years, extracted_skills, parsed_text):
     conn = get_db_connection()
     cur = conn.cursor()
@@ -585,6 +712,246 @@ def update_resume_with_profile(resume_id: int, candidate_profile: dict):
     conn.close()
 
 
+# ---------------------------------------------------------------------------
+# Resume processing state (resumes.processing_*)
+#
+#   NULL ─▶ queued ─▶ processing ─▶ completed
+#              ▲           │
+#              └─ retry ───┴─▶ failed
+#
+# processing_key = file_hash:processing version; completed work is only
+# redone when the file or the version changes. queued / processing claims
+# hold for a lease so a crashed worker never blocks a resume forever.
+# ---------------------------------------------------------------------------
+
+_PROCESSING_KEY = "COALESCE(file_hash, '') || ':' || %s"
+
+
+def mark_resume_queued(resume_id: int, version: str, lease_seconds: int) -> bool:
+    """
+    Move a resume to ``queued`` unless its current work is already done,
+    queued or running. Returns True when the caller should enqueue a task.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            UPDATE resumes
+            SET processing_status     = 'queued',
+                processing_key        = {_PROCESSING_KEY},
+                processing_updated_at = CURRENT_TIMESTAMP,
+                processing_error      = NULL
+            WHERE id = %s
+              AND NOT (processing_key IS NOT DISTINCT FROM {_PROCESSING_KEY}
+                       AND (processing_status = 'completed'
+                            OR (processing_status IN ('queued', 'processing')
+                                AND processing_updated_at > CURRENT_TIMESTAMP - %s * INTERVAL '1 second')))
+            RETURNING id;
+        """, (version, resume_id, version, lease_seconds))
+        queued = cursor.fetchone() is not None
+        conn.commit()
+    except Exception as e:
+        # processing_* columns missing: enqueue as before
+        print(f"Warning: could not record queued state for resume {resume_id}: {e}")
+        conn.rollback()
+        queued = True
+    cursor.close()
+    conn.close()
+    return queued
+
+
+def claim_resume_processing(resume_id: int, version: str, lease_seconds: int) -> str:
+    """
+    Atomically take a resume for processing. Returns ``claimed``, or why not:
+    ``completed`` (same file and version already done), ``in_progress``
+    (another task holds a live claim) or ``not_found``.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            UPDATE resumes
+            SET processing_status     = 'processing',
+                processing_key        = {_PROCESSING_KEY},
+                processing_updated_at = CURRENT_TIMESTAMP,
+                processing_attempts   = COALESCE(processing_attempts, 0) + 1,
+                processing_error      = NULL
+            WHERE id = %s
+              AND NOT (processing_key IS NOT DISTINCT FROM {_PROCESSING_KEY}
+                       AND (processing_status = 'completed'
+                            OR (processing_status = 'processing'
+                                AND processing_updated_at > CURRENT_TIMESTAMP - %s * INTERVAL '1 second')))
+            RETURNING id;
+        """, (version, resume_id, version, lease_seconds))
+        if cursor.fetchone() is not None:
+            outcome = "claimed"
+        else:
+            cursor.execute("SELECT processing_status FROM resumes WHERE id = %s;", (resume_id,))
+            row = cursor.fetchone()
+            outcome = ("not_found" if row is None
+                       else "completed" if row[0] == "completed" else "in_progress")
+        conn.commit()
+    except Exception as e:
+        print(f"Warning: could not claim resume {resume_id} for processing: {e}")
+        conn.rollback()
+        outcome = "claimed"
+    cursor.close()
+    conn.close()
+    return outcome
+
+
+def complete_resume_processing(resume_id: int, candidate_profile: dict):
+    """Store the profile (as update_resume_with_profile) and mark the work completed."""
+    update_resume_with_profile(resume_id, candidate_profile)
+    _set_processing_status(resume_id, "completed")
+
+
+def fail_resume_processing(resume_id: int, error: str, final: bool):
+    """Record a failure: back to ``queued`` while retries remain, else ``failed``."""
+    _set_processing_status(resume_id, "failed" if final else "queued", error[:1000])
+
+
+def _set_processing_status(resume_id: int, status: str, error: Optional[str] = None):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE resumes
+            SET processing_status     = %s,
+                processing_error      = %s,
+                processing_updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s;
+        """, (status, error, resume_id))
+        conn.commit()
+    except Exception as e:
+        print(f"Warning: could not set processing status for resume {resume_id}: {e}")
+        conn.rollback()
+    cursor.close()
+    conn.close()
+
+
+def get_interrupted_resume_processing(lease_seconds: int, after_id: int = 0,
+                                      limit: int = 500) -> List[tuple]:
+    """
+    Keyset page of ``(id, filename)`` for resumes whose processing was left
+    unfinished: ``queued``, or ``processing`` with an expired lease. Used at
+    startup with TASK_BACKEND=local, whose queue does not outlive the process.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT id, filename FROM resumes
+            WHERE id > %s
+              AND (processing_status = 'queued'
+                   OR (processing_status = 'processing'
+                       AND processing_updated_at <= CURRENT_TIMESTAMP - %s * INTERVAL '1 second'))
+            ORDER BY id
+            LIMIT %s;
+        """, (after_id, lease_seconds, limit))
+        rows = cursor.fetchall()
+    except Exception as e:
+        # processing_* columns missing: nothing is tracked
+        print(f"Warning: could not list interrupted resume processing: {e}")
+        conn.rollback()
+        rows = []
+    cursor.close()
+    conn.close()
+    return rows
+
+
+def get_resume_processing_status(resume_id: int) -> Optional[tuple]:
+    """
+    ``(processing_status, processing_key, processing_attempts, processing_error,
+    processing_updated_at, processed_at)`` or None when the resume does not exist.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT processing_status, processing_key, processing_attempts,
+               processing_error, processing_updated_at, processed_at
+        FROM resumes WHERE id = %s;
+    """, (resume_id,))
+    row = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    return row
+
+
+def get_resume_batch_after(last_id: int, limit: int, max_id: Optional[int] = None,
+                           stale_taxonomy_version: Optional[str] = None) -> List[tuple]:
+    """
+    Keyset page of resumes for backfills: ``(id, filename, parsed_text)``
+    rows with ``id > last_id`` in id order. With ``stale_taxonomy_version``
+    only rows whose profile was built with a different taxonomy are returned.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    query = "SELECT id, filename, parsed_text FROM resumes WHERE id > %s"
+    params: list = [last_id]
+    if max_id is not None:
+        query += " AND id <= %s"
+        params.append(max_id)
+    if stale_taxonomy_version is not None:
+        query += " AND (profile_data ->> 'taxonomy_version') IS DISTINCT FROM %s"
+        params.append(stale_taxonomy_version)
+    query += " ORDER BY id LIMIT %s;"
+    params.append(limit)
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return rows
+
+
+def get_resume_id_range() -> Tuple[int, int, int]:
+    """``(min_id, max_id, count)`` over resumes; zeros when the table is empty."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT COALESCE(MIN(id), 0), COALESCE(MAX(id), 0), COUNT(*) FROM resumes;")
+    row = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    return row
+
+
+def bulk_update_resume_profiles(profiles: List[Tuple[int, dict]]) -> int:
+    """
+    Write many candidate profiles in one statement (same columns as
+    update_resume_with_profile). Returns the number of rows updated.
+    """
+    if not profiles:
+        return 0
+    from psycopg2.extras import execute_values
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    execute_values(cursor, """
+        UPDATE resumes AS r
+        SET experience_years = v.experience_years,
+            extracted_skills = v.extracted_skills::text[],
+            parsed_text      = v.parsed_text,
+            profile_data     = v.profile_data::jsonb,
+            processed_at     = CURRENT_TIMESTAMP
+        FROM (VALUES %s) AS v(id, experience_years, extracted_skills, parsed_text, profile_data)
+        WHERE r.id = v.id;
+    """, [
+        (
+            resume_id,
+            profile.get('years_of_experience', 0),
+            profile.get('skills', []),
+            profile.get('parsed_text', ''),
+            json.dumps(profile),
+        )
+        for resume_id, profile in profiles
+    ], page_size=len(profiles))
+    updated = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return updated
+
+
 def get_all_resume_profiles_for_job() -> List[dict]:
     """Get all processed resume profiles."""
     conn = get_db_connection()
@@ -1273,3 +1640,51 @@ def delete_comment_by_id(comment_id: int) -> bool:
     cursor.close()
     conn.close()
     return result is not None
+
+
+# ============================================
+# DASHBOARD UPLOAD ROLLUP
+# ============================================
+# resume_upload_rollup(day, job_id): applications and distinct resumes per
+# upload day and job (job_id 0: every resume). Kept current by triggers
+# (scripts/database_migrations/create_upload_rollup.py); rebuilt from the
+# base tables on migration and by refresh_upload_rollup_task.
+
+def rebuild_upload_rollup(since: Optional[date] = None) -> int:
+    """
+    Recompute the rollup for upload days from ``since`` (all days when
+    None). Concurrent trigger updates wait for the rebuild to commit.
+    Returns the number of days rebuilt.
+    """
+    day_filter = "uploaded_at >= %(since)s" if since else "uploaded_at IS NOT NULL"
+    params = {"since": since}
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("LOCK TABLE resume_upload_rollup IN EXCLUSIVE MODE;")
+    cursor.execute(
+        "DELETE FROM resume_upload_rollup" + (" WHERE day >= %(since)s;" if since else ";"),
+        params,
+    )
+    cursor.execute(f"""
+        INSERT INTO resume_upload_rollup (day, job_id, applications, resumes)
+        SELECT DATE(r.uploaded_at), a.job_id, COUNT(*), COUNT(DISTINCT r.id)
+        FROM resumes r
+        JOIN applications a ON a.resume_id = r.id
+        WHERE r.{day_filter}
+        GROUP BY DATE(r.uploaded_at), a.job_id
+        UNION ALL
+        SELECT DATE(uploaded_at), 0, 0, COUNT(*)
+        FROM resumes
+        WHERE {day_filter}
+        GROUP BY DATE(uploaded_at);
+    """, params)
+    cursor.execute(
+        "SELECT COUNT(DISTINCT day) FROM resume_upload_rollup"
+        + (" WHERE day >= %(since)s;" if since else ";"),
+        params,
+    )
+    days = cursor.fetchone()[0]
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return days
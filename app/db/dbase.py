@@ -1,23 +1,117 @@
 import psycopg2
 from psycopg2 import OperationalError
+from psycopg2.extensions import connection as _pg_connection
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+def _connection_params() -> dict:
+    return dict(
+        host=os.getenv("DATABASE_HOST", "localhost"),
+        port=int(os.getenv("DATABASE_PORT", 5432)),
+        user=os.getenv("DATABASE_USER", "postgres"),
+        password=os.getenv("DATABASE_PASSWORD"),
+        database=os.getenv("DATABASE_NAME", "ats_db")
+    )
+
+
+# A pooled connection idle for longer than this is probed with SELECT 1
+# before it is handed out (server restarts, idle timeouts, failovers)
+POOL_PROBE_IDLE_SECONDS = 30.0
+
+
+class _PooledConnection(_pg_connection):
+    """
+    Connection whose close() hands it back to the pool it came from, so
+    code written as connect / ... / close() reuses connections unchanged.
+    Uncommitted work is rolled back on return.
+    """
+    _pool = None
+    _idle_since = None      # monotonic time of the last return to the pool
+
+    def close(self):
+        pool, self._pool = self._pool, None
+        if pool is None or self.closed:
+            return super().close()
+        try:
+            self.rollback()
+            self._idle_since = time.monotonic()
+            pool.putconn(self)
+        except Exception:
+            pool.putconn(self, close=True)
+
+
+def _is_alive(conn) -> bool:
+    """False when the connection is closed, or idle and failing a SELECT 1."""
+    if conn.closed:
+        return False
+    idle_since = getattr(conn, "_idle_since", None)
+    if idle_since is None or time.monotonic() - idle_since < POOL_PROBE_IDLE_SECONDS:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1;")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+_pool: ThreadedConnectionPool = None
+_pool_lock = threading.Lock()
+
+
+def init_db_pool(minconn: int = 1, maxconn: int = 4):
+    """
+    Open a per-process connection pool; get_db_connection() then draws from
+    it. Call after fork (e.g. Celery's worker_process_init): connections must
+    never be shared between processes.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadedConnectionPool(
+                minconn, maxconn, connection_factory=_PooledConnection, **_connection_params()
+            )
+    return _pool
+
+
+def close_db_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.closeall()
+
+
 def get_db_connection():
     """
     Creates and returns a PostgreSQL database connection using environment variables.
+    Served from the process pool when init_db_pool() has been called.
     """
+    pool = _pool
+    if pool is not None:
+        try:
+            # Discard dead connections; at most the whole pool's worth
+            for _ in range(pool.maxconn + 1):
+                conn = pool.getconn()
+                if _is_alive(conn):
+                    conn._pool = pool
+                    return conn
+                pool.putconn(conn, close=True)
+        except PoolError:
+            pass        # exhausted: fall through to a one-off connection
+        except OperationalError as e:
+            print("⚠️ Pooled PostgreSQL connection failed, connecting directly")
+            print(e)
+
     try:
-        connection = psycopg2.connect(
-            host=os.getenv("DATABASE_HOST", "localhost"),
-            port=int(os.getenv("DATABASE_PORT", 5432)),
-            user=os.getenv("DATABASE_USER", "postgres"),
-            password=os.getenv("DATABASE_PASSWORD"),
-            database=os.getenv("DATABASE_NAME", "ats_db")
-        )
+        connection = psycopg2.connect(**_connection_params())
         return connection
 
     except OperationalError as e:
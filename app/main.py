@@ -90,6 +90,32 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+# ── Local task executor (TASK_BACKEND=local): resubmit work a previous
+#    process left queued, and shut down gracefully ──
+@app.on_event("startup")
+def recover_background_tasks():
+    from app.orchestration.pipeline import start_resume_recovery
+    start_resume_recovery()
+
+
+@app.on_event("shutdown")
+def shutdown_background_tasks():
+    from app.orchestration.pipeline import shutdown_pipeline
+    shutdown_pipeline()
+
+
+@app.on_event("shutdown")
+def shutdown_parser_workers():
+    from app.services.parser_pool import shutdown_parser_pool
+    shutdown_parser_pool()
+
+
+@app.on_event("shutdown")
+async def close_llm_connections():
+    from app.services.llm_service import aclose_llm_clients
+    await aclose_llm_clients()
+
+
 # ── Health Check ─────────────────────────────────────────────────────
 @app.get("/")
 def health_check():
@@ -1,21 +1,335 @@
 """
 Lightweight orchestration pipeline.
-Handles resume and job profiling synchronously when Celery is unavailable.
+Handles resume and job profiling when Celery is unavailable: with
+TASK_BACKEND=local, ATSPipeline runs the background tasks itself (see
+app/workers/tasks.submit_task).
 """
+import itertools
 import logging
-from typing import Optional
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+# Bump when build_candidate_profile's output changes shape or meaning; with
+# the skill taxonomy version it decides whether a profiled resume is current.
+PROFILE_VERSION = 1
+
+
+def processing_version() -> str:
+    """Version stamp stored with each processed resume (resumes.processing_key)."""
+    from app.services.scorer import TAXONOMY_VERSION
+    return f"profile-{PROFILE_VERSION}/taxonomy-{TAXONOMY_VERSION}"
+
+
+def build_candidate_profile(text: str, file_path: str) -> dict:
+    """
+    Feature extraction for one parsed resume: experience, skills and
+    section spans. Shared by the Celery task, the synchronous pipeline and
+    scripts/backfill_resumes.py so they always agree.
+    """
+    from app.services.scorer import (
+        TAXONOMY_VERSION, extract_years_of_experience, extract_skills_from_text, normalize_text,
+    )
+    from app.services.section_segmenter import segment_sections, sections_to_profile
+
+    sections = segment_sections(normalize_text(text))
+
+    return {
+        "parsed_text": text,
+        "years_of_experience": extract_years_of_experience(text, sections),
+        "skills": extract_skills_from_text(text),
+        "sections": sections_to_profile(sections),
+        "taxonomy_version": TAXONOMY_VERSION,
+        "filename": file_path.split("/")[-1],
+    }
+
+
+class ExecutorBusy(RuntimeError):
+    """The local executor's queue is full; the caller should back off."""
+
+
+class _Retrying(Exception):
+    """A local task failed and was scheduled again (Celery's RETRY state)."""
+
+
+# ---------------------------------------------------------------------------
+# Local task bodies. Each runs on an executor thread (DB and parser-pool
+# waits) and hands CPU-bound work to the process pool via ``run_cpu``.
+# Registered under the Celery task names so callers see one API.
+# ---------------------------------------------------------------------------
+
+def _local_process_resume(pipeline: "ATSPipeline", resume_id: int, file_path: str,
+                          retries: int = 0) -> dict:
+    from app.db.crud import claim_resume_processing, complete_resume_processing, fail_resume_processing
+    from app.services.resume_parser import parse_resume
+
+    outcome = claim_resume_processing(
+        resume_id, processing_version(), settings.RESUME_PROCESSING_LEASE_SECONDS
+    )
+    if outcome != "claimed":
+        return {"status": "skipped", "reason": outcome, "resume_id": resume_id}
+    try:
+        text = parse_resume(file_path)
+        candidate_profile = pipeline.run_cpu(build_candidate_profile, text, file_path)
+        complete_resume_processing(resume_id, candidate_profile)
+    except Exception as exc:
+        # As process_resume_task: back to queued and retried later, failed
+        # after the last retry
+        final = retries >= pipeline.max_retries
+        fail_resume_processing(resume_id, f"{type(exc).__name__}: {exc}", final=final)
+        if final:
+            raise
+        pipeline.submit_later(pipeline.retry_delay, "process_resume_task",
+                              resume_id, file_path, retries + 1)
+        raise _Retrying(f"{type(exc).__name__}: {exc}") from exc
+    return {"status": "completed", "resume_id": resume_id}
+
+
+def _local_process_job(pipeline: "ATSPipeline", job_id: int, job_data: dict) -> dict:
+    from app.db.crud import update_job_with_profile
+
+    job_profile = pipeline.process_job_creation(job_data).get("job_profile", {})
+    update_job_with_profile(job_id, job_profile)
+    return {"status": "completed", "job_id": job_id}
+
+
+def _local_cleanup_resumes(pipeline: "ATSPipeline") -> dict:
+    from app.services.cleanup import DataLifecycleManager
+    return DataLifecycleManager.cleanup_stale_resumes()
+
+
+def _local_rank_job(pipeline: "ATSPipeline", job_id: int, job_title: str, job_payload: dict,
+                    chunks: list, uploads_dir: str) -> dict:
+    from app.services.job_ranker import finalize_ranking, score_chunk
+
+    futures = [
+        pipeline.submit_cpu(score_chunk, job_id, job_title, job_payload, chunk, uploads_dir)
+        for chunk in chunks
+    ]
+    return finalize_ranking([f.result() for f in futures], job_id)
+
+
+LOCAL_TASKS: Dict[str, Callable[..., Any]] = {
+    "process_resume_task":  _local_process_resume,
+    "process_job_task":     _local_process_job,
+    "cleanup_resumes_task": _local_cleanup_resumes,
+    "rank_job":             _local_rank_job,
+}
+
+
+def _init_cpu_worker():
+    from app.workers.warmup import warm_up_process
+    warm_up_process(db_pool_max=2)
+
+
+def _init_analysis_worker():
+    # Pure text analysis: no parser subprocesses, no DB connections
+    from app.workers.warmup import warm_up_process
+    warm_up_process(start_parser_pool=False, open_db_pool=False)
+
+
 class ATSPipeline:
     """
     Orchestrates resume parsing and job profiling.
-    Used as a synchronous fallback when Celery is not running.
+
+    Also a local task executor for single-node deployments without Redis
+    (TASK_BACKEND=local), with the submit/status shape of the Celery tasks:
+
+      submit(task_name, *args) -> task_id      raises ExecutorBusy when full
+      status(task_id)          -> {"state": PENDING|STARTED|SUCCESS|FAILURE|RETRY|REVOKED, ...}
+      shutdown()               finish running tasks, revoke queued ones
+
+    Resume processing is retried like the Celery task (``max_retries``
+    times, ``retry_delay`` seconds apart). Work revoked at shutdown keeps
+    its ``queued`` status and is resubmitted by
+    :func:`recover_interrupted_resumes` on the next start.
+
+    Task bodies run on a small thread pool (DB and parser-pool waits); CPU
+    work (profiling, scoring chunks) goes to a process pool of warmed-up,
+    periodically recycled workers. Standalone resume analysis (/batch) has
+    its own smaller pool, ``analysis_processes`` workers that start no
+    parser subprocesses or DB pool. At most ``max_queued`` tasks may be
+    queued or running at once.
     """
 
+    _STATUS_HISTORY = 10_000
+
+    def __init__(self, max_queued: int = 500, io_threads: int = 4, cpu_processes: int = 0,
+                 max_retries: int = 3, retry_delay: float = 30.0, analysis_processes: int = 2):
+        self.max_queued = max_queued
+        self.io_threads = io_threads
+        self.cpu_processes = cpu_processes or max(1, (os.cpu_count() or 2) - 1)
+        self.analysis_processes = max(1, min(analysis_processes, self.cpu_processes))
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._slots = threading.BoundedSemaphore(max_queued)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._io: Optional[ThreadPoolExecutor] = None
+        self._cpu: Optional[ProcessPoolExecutor] = None
+        self._analysis: Optional[ProcessPoolExecutor] = None
+        self._timers: set = set()
+        self._closed = False
+
+    # -- executor API -------------------------------------------------------
+
+    def submit(self, task_name: str, *args, block: bool = False) -> str:
+        """
+        Queue a task; raises ExecutorBusy when ``max_queued`` tasks are
+        pending, or with ``block`` waits for a free slot instead.
+        """
+        if task_name not in LOCAL_TASKS:
+            raise KeyError(f"Unknown task {task_name!r}")
+        if self._closed:
+            raise ExecutorBusy("executor is shutting down")
+        if not self._slots.acquire(blocking=block):
+            raise ExecutorBusy(f"{self.max_queued} tasks already queued")
+        if self._closed:
+            self._slots.release()
+            raise ExecutorBusy("executor is shutting down")
+
+        task_id = f"local-{next(self._ids)}-{os.getpid()}"
+        with self._lock:
+            if self._io is None:
+                self._io = ThreadPoolExecutor(self.io_threads, thread_name_prefix="ats-task")
+            self._tasks[task_id] = {"state": "PENDING", "task": task_name,
+                                    "submitted_at": time.time()}
+            while len(self._tasks) > self._STATUS_HISTORY:
+                self._tasks.popitem(last=False)
+            try:
+                future = self._io.submit(self._run, task_id, task_name, args)
+            except RuntimeError as exc:
+                # shutdown() closed the thread pool after the checks above
+                del self._tasks[task_id]
+                self._slots.release()
+                raise ExecutorBusy("executor is shutting down") from exc
+        future.add_done_callback(lambda f, tid=task_id: self._finished(tid, f))
+        return task_id
+
+    def submit_later(self, delay: float, task_name: str, *args):
+        """
+        :meth:`submit` after ``delay`` seconds (retries). Dropped with a
+        warning when the executor is full or closed by then; a resume
+        stays ``queued`` and is picked up on the next start.
+        """
+        def fire():
+            with self._lock:
+                self._timers.discard(timer)
+            try:
+                self.submit(task_name, *args)
+            except ExecutorBusy as exc:
+                logger.warning(f"Local executor: could not resubmit {task_name}{args}: {exc}")
+
+        timer = threading.Timer(delay, fire)
+        timer.daemon = True
+        with self._lock:
+            if self._closed:
+                return
+            self._timers.add(timer)
+        timer.start()
+
+    def status(self, task_id: str) -> Dict[str, Any]:
+        with self._lock:
+            record = self._tasks.get(task_id)
+            return dict(record) if record else {"state": "PENDING"}
+
+    def run_cpu(self, fn: Callable, *args):
+        """Run ``fn(*args)`` in the process pool and wait for it."""
+        return self.submit_cpu(fn, *args).result()
+
+    def submit_cpu(self, fn: Callable, *args) -> Future:
+        return self._submit_process("_cpu", self._new_cpu_pool, fn, args)
+
+    def submit_analysis(self, fn: Callable, *args) -> Future:
+        """:meth:`submit_cpu` for CPU-only analysis, on the smaller analysis pool."""
+        return self._submit_process("_analysis", self._new_analysis_pool, fn, args)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work, let running tasks finish, revoke queued ones."""
+        self._closed = True
+        with self._lock:
+            executors = (self._io, self._cpu, self._analysis)
+            timers, self._timers = self._timers, set()
+        for timer in timers:
+            timer.cancel()
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=wait, cancel_futures=True)
+
+    # -- internals ----------------------------------------------------------
+
+    def _submit_process(self, attr: str, new_pool: Callable[[], ProcessPoolExecutor],
+                        fn: Callable, args: tuple) -> Future:
+        with self._lock:
+            if getattr(self, attr) is None:
+                setattr(self, attr, new_pool())
+            pool = getattr(self, attr)
+        try:
+            return pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OOM killer): replace the pool
+            logger.warning("Local executor: process pool broken, restarting it")
+            with self._lock:
+                if getattr(self, attr) is pool:
+                    setattr(self, attr, new_pool())
+                pool = getattr(self, attr)
+            return pool.submit(fn, *args)
+
+    def _new_cpu_pool(self) -> ProcessPoolExecutor:
+        return self._new_process_pool(self.cpu_processes, _init_cpu_worker)
+
+    def _new_analysis_pool(self) -> ProcessPoolExecutor:
+        return self._new_process_pool(self.analysis_processes, _init_analysis_worker)
+
+    @staticmethod
+    def _new_process_pool(processes: int, initializer: Callable) -> ProcessPoolExecutor:
+        # spawn, not fork: the API process has threads and open sockets
+        return ProcessPoolExecutor(
+            processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initializer,
+            max_tasks_per_child=settings.WORKER_MAX_TASKS_PER_CHILD,
+        )
+
+    def _run(self, task_id: str, task_name: str, args: tuple):
+        self._update(task_id, state="STARTED", started_at=time.time())
+        return LOCAL_TASKS[task_name](self, *args)
+
+    def _finished(self, task_id: str, future: Future):
+        self._slots.release()
+        if future.cancelled():
+            self._update(task_id, state="REVOKED")
+        elif isinstance(future.exception(), _Retrying):
+            self._update(task_id, state="RETRY", error=str(future.exception()),
+                         finished_at=time.time())
+        elif future.exception() is not None:
+            exc = future.exception()
+            logger.error(f"Local task {task_id} failed: {exc}")
+            self._update(task_id, state="FAILURE", error=f"{type(exc).__name__}: {exc}",
+                         finished_at=time.time())
+        else:
+            self._update(task_id, state="SUCCESS", result=future.result(),
+                         finished_at=time.time())
+
+    def _update(self, task_id: str, **fields):
+        with self._lock:
+            if task_id in self._tasks:
+                self._tasks[task_id].update(fields)
+
+    # -- synchronous helpers ------------------------------------------------
+
     def process_job_creation(self, job_data: dict) -> dict:
         """
         Build a structured job profile from raw job data.
@@ -45,18 +359,9 @@ class ATSPipeline:
         """
         try:
             from app.services.resume_parser import parse_resume
-            from app.services.scorer import extract_years_of_experience, extract_skills
 
             text = parse_resume(file_path)
-            experience = extract_years_of_experience(text)
-            skills = extract_skills(text)
-
-            candidate_profile = {
-                "parsed_text": text,
-                "years_of_experience": experience,
-                "skills": skills,
-                "filename": file_path.split("/")[-1],
-            }
+            candidate_profile = build_candidate_profile(text, file_path)
 
             return {"candidate_profile": candidate_profile}
 
@@ -66,10 +371,69 @@ class ATSPipeline:
 
 
 _pipeline_instance: Optional[ATSPipeline] = None
+_pipeline_lock = threading.Lock()
 
 
 def get_pipeline() -> ATSPipeline:
     global _pipeline_instance
     if _pipeline_instance is None:
-        _pipeline_instance = ATSPipeline()
+        with _pipeline_lock:
+            if _pipeline_instance is None:
+                from app.workers.tasks import RESUME_MAX_RETRIES, RESUME_RETRY_COUNTDOWN_SECONDS
+                _pipeline_instance = ATSPipeline(
+                    max_queued=settings.LOCAL_EXECUTOR_MAX_QUEUED,
+                    io_threads=settings.LOCAL_EXECUTOR_IO_THREADS,
+                    cpu_processes=settings.LOCAL_EXECUTOR_CPU_PROCESSES,
+                    max_retries=RESUME_MAX_RETRIES,
+                    retry_delay=RESUME_RETRY_COUNTDOWN_SECONDS,
+                    analysis_processes=settings.BATCH_ANALYSIS_PROCESSES,
+                )
     return _pipeline_instance
+
+
+def recover_interrupted_resumes(pipeline: Optional[ATSPipeline] = None) -> int:
+    """
+    Resubmit resumes a previous process left ``queued`` (or ``processing``
+    past the lease): with TASK_BACKEND=local their queue died with it.
+    Waits for free executor slots, so run it off the startup path. Several
+    API workers may recover the same rows; the processing claim lets only
+    one of them do the work. Returns the number of tasks submitted.
+    """
+    from app.db.crud import get_interrupted_resume_processing
+
+    pipeline = pipeline or get_pipeline()
+    submitted, last_id = 0, 0
+    while True:
+        rows = get_interrupted_resume_processing(
+            settings.RESUME_PROCESSING_LEASE_SECONDS, after_id=last_id
+        )
+        if not rows:
+            break
+        for resume_id, filename in rows:
+            try:
+                pipeline.submit("process_resume_task", resume_id,
+                                os.path.join(settings.UPLOAD_DIR, filename), block=True)
+            except ExecutorBusy:
+                return submitted        # shutting down
+            submitted += 1
+        last_id = rows[-1][0]
+    if submitted:
+        logger.info(f"Local executor: resubmitted {submitted} interrupted resume(s)")
+    return submitted
+
+
+def start_resume_recovery():
+    """App startup hook: :func:`recover_interrupted_resumes` in the background (TASK_BACKEND=local only)."""
+    if settings.TASK_BACKEND != "local":
+        return
+    threading.Thread(target=recover_interrupted_resumes, name="ats-task-recovery",
+                     daemon=True).start()
+
+
+def shutdown_pipeline(wait: bool = True):
+    """Graceful stop on app shutdown; a no-op when the executor never started."""
+    global _pipeline_instance
+    with _pipeline_lock:
+        pipeline, _pipeline_instance = _pipeline_instance, None
+    if pipeline is not None:
+        pipeline.shutdown(wait=wait)
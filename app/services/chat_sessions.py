@@ -0,0 +1,189 @@
+"""
+Resume Chat Sessions
+====================
+State for "Upload & Chat": the parsed resume text and its prompt digest
+(zlib-compressed, see resume_digest) and the last CHAT_HISTORY_MAX_TURNS
+question/answer pairs. The analysis is returned to the client at upload
+time and not kept.
+
+- RedisSessionStore   shared by every uvicorn worker, survives restarts
+- MemorySessionStore  one process (tests, single-worker dev)
+
+Both keep at most CHAT_SESSION_MAX sessions (the oldest go first) and
+expire a session CHAT_SESSION_TTL_SECONDS after its last use.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChatSession:
+    session_id: str
+    resume_text: str
+    filename: str
+    history: List[Dict[str, str]] = field(default_factory=list)   # [{"user": ..., "ai": ...}]
+    digest: str = ""
+
+
+def _compress(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def _decompress(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8")
+
+
+class MemorySessionStore:
+    def __init__(self, max_sessions: int, ttl_seconds: int, max_turns: int):
+        self.max_turns = max_turns
+        self._lock = threading.Lock()
+        # session_id -> [compressed text, filename, history, compressed digest]
+        self._sessions = TTLCache(maxsize=max_sessions, ttl=ttl_seconds)
+
+    def create(self, resume_text: str, filename: str, digest: str = "") -> str:
+        session_id = str(uuid.uuid4())
+        with self._lock:
+            self._sessions[session_id] = [_compress(resume_text), filename, [], _compress(digest)]
+        return session_id
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            self._sessions[session_id] = entry      # re-insert: restarts the TTL
+            blob, filename, history, digest = entry
+            history = list(history)
+        return ChatSession(session_id, _decompress(blob), filename, history, _decompress(digest))
+
+    def append_turn(self, session_id: str, user_message: str, response: str):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                entry[2] = (entry[2] + [{"user": user_message, "ai": response}])[-self.max_turns:]
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+class RedisSessionStore:
+    """
+    chat:session:<id>            hash {text, digest: zlib bytes; filename}
+    chat:session:<id>:history    list of JSON turns, trimmed to max_turns
+    chat:sessions                sorted set id -> last use, for the capacity cap
+    """
+    PREFIX = "chat:session:"
+    INDEX = "chat:sessions"
+
+    def __init__(self, url: str, max_sessions: int, ttl_seconds: int, max_turns: int):
+        import redis
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+        self._redis = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+
+    def _keys(self, session_id: str):
+        key = self.PREFIX + session_id
+        return key, key + ":history"
+
+    def create(self, resume_text: str, filename: str, digest: str = "") -> str:
+        session_id = str(uuid.uuid4())
+        key, history_key = self._keys(session_id)
+        now = time.time()
+        pipe = self._redis.pipeline()
+        pipe.hset(key, mapping={"text": _compress(resume_text), "digest": _compress(digest),
+                                "filename": filename})
+        pipe.expire(key, self.ttl_seconds)
+        pipe.zadd(self.INDEX, {session_id: now})
+        pipe.zremrangebyscore(self.INDEX, "-inf", now - self.ttl_seconds)
+        pipe.execute()
+        self._evict_over_capacity()
+        return session_id
+
+    def _evict_over_capacity(self):
+        overflow = self._redis.zcard(self.INDEX) - self.max_sessions
+        if overflow <= 0:
+            return
+        oldest = [sid.decode("utf-8") for sid in self._redis.zrange(self.INDEX, 0, overflow - 1)]
+        pipe = self._redis.pipeline()
+        for sid in oldest:
+            pipe.delete(*self._keys(sid))
+        pipe.zrem(self.INDEX, *oldest)
+        pipe.execute()
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        key, history_key = self._keys(session_id)
+        pipe = self._redis.pipeline()
+        pipe.hgetall(key)
+        pipe.lrange(history_key, 0, -1)
+        pipe.expire(key, self.ttl_seconds)
+        pipe.expire(history_key, self.ttl_seconds)
+        pipe.zadd(self.INDEX, {session_id: time.time()}, xx=True)
+        data, history, *_ = pipe.execute()
+        if not data:
+            return None
+        return ChatSession(
+            session_id,
+            _decompress(data[b"text"]),
+            data[b"filename"].decode("utf-8"),
+            [json.loads(turn) for turn in history],
+            _decompress(data[b"digest"]) if b"digest" in data else "",
+        )
+
+    def append_turn(self, session_id: str, user_message: str, response: str):
+        key, history_key = self._keys(session_id)
+        pipe = self._redis.pipeline()
+        pipe.rpush(history_key, json.dumps({"user": user_message, "ai": response}))
+        pipe.ltrim(history_key, -self.max_turns, -1)
+        pipe.expire(history_key, self.ttl_seconds)
+        pipe.execute()
+
+    def delete(self, session_id: str):
+        pipe = self._redis.pipeline()
+        pipe.delete(*self._keys(session_id))
+        pipe.zrem(self.INDEX, session_id)
+        pipe.execute()
+
+
+_stores: Dict[tuple, object] = {}
+_stores_lock = threading.Lock()
+
+
+def get_session_store(settings=None):
+    """
+    The configured store. CHAT_SESSION_BACKEND empty means redis, except
+    with TASK_BACKEND=local (deployments without Redis), where it is memory.
+    """
+    if settings is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+    backend = settings.CHAT_SESSION_BACKEND.strip().lower()
+    if not backend:
+        backend = "memory" if settings.TASK_BACKEND == "local" else "redis"
+    key = (os.getpid(), backend, settings.REDIS_URL, settings.CHAT_SESSION_MAX,
+           settings.CHAT_SESSION_TTL_SECONDS, settings.CHAT_HISTORY_MAX_TURNS)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            if backend == "redis":
+                store = RedisSessionStore(settings.REDIS_URL, settings.CHAT_SESSION_MAX,
+                                          settings.CHAT_SESSION_TTL_SECONDS, settings.CHAT_HISTORY_MAX_TURNS)
+            elif backend == "memory":
+                store = MemorySessionStore(settings.CHAT_SESSION_MAX, settings.CHAT_SESSION_TTL_SECONDS,
+                                           settings.CHAT_HISTORY_MAX_TURNS)
+            else:
+                raise ValueError(f"Unknown CHAT_SESSION_BACKEND: {backend!r}")
+            _stores[key] = store
+        return store
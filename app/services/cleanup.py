@@ -1,6 +1,6 @@
 import os
 import logging
-from app.db.crud import get_stale_resumes_for_cleanup, delete_resume, log_audit_event
+from app.db.crud import get_stale_resumes_for_cleanup, delete_resume, log_audit_event, bulk_delete_resumes
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -73,3 +73,82 @@ class DataLifecycleManager:
         """
         from app.db.crud import close_job
         return close_job(job_id, reason)
+
+
+# ─────────────────────────────────────────────────────────
+# Post-ranking cleanup
+# ─────────────────────────────────────────────────────────
+
+def assign_tier(score: int) -> str:
+    """
+    Tier classification aligned with new scoring engine v2.
+    90+ → A (Strong Hire)
+    75+ → B (Good Fit)
+    60+ → C (Moderate)
+    <60 → D (Weak Fit)
+    """
+    if score >= 90: return "A"
+    if score >= 75: return "B"
+    if score >= 60: return "C"
+    return "D"
+
+
+def cleanup_low_value_resumes(job_id: int, results: list) -> dict:
+    """
+    Run immediately after ranking completes for a specific job.
+
+    Rules
+    -----
+    • Tier A (score ≥ 90) — keep forever, never touched.
+    • Tier B (score ≥ 75) — keep forever, never touched.
+    • Tier C (score ≥ 60) — keep top 20 by score.
+                            If Tier A+B count < 10, keep top 50 instead.
+    • Tier D (score < 60)  — delete all immediately.
+
+    Only operates on resumes present in `results` (the ranked pool for
+    this specific job). Never touches resumes from other jobs.
+
+    Returns a summary dict describing what was deleted.
+    """
+    if not results:
+        return {"deleted_tier_d": 0, "deleted_tier_c_excess": 0, "ids_deleted": []}
+
+    # Partition by tier
+    tier_a_b = [r for r in results if assign_tier(r["score"]) in ("A", "B")]
+    tier_c   = [r for r in results if assign_tier(r["score"]) == "C"]
+    tier_d   = [r for r in results if assign_tier(r["score"]) == "D"]
+
+    ids_to_delete: list[int] = []
+
+    # Rule 1: delete all Tier D
+    ids_to_delete.extend(r["resume_id"] for r in tier_d)
+
+    # Rule 2: cap Tier C
+    strong_count = len(tier_a_b)
+    tier_c_limit = 50 if strong_count < 10 else 20
+
+    # Sort Tier C descending by score so we keep the best ones
+    tier_c_sorted = sorted(tier_c, key=lambda r: r["score"], reverse=True)
+    tier_c_excess = tier_c_sorted[tier_c_limit:]   # everything beyond the limit
+    ids_to_delete.extend(r["resume_id"] for r in tier_c_excess)
+
+    deleted_ids: list[int] = []
+    if ids_to_delete:
+        try:
+            result = bulk_delete_resumes(ids_to_delete)
+            deleted_ids = result.get("deleted", [])
+            logger.info(
+                "Cleanup for job %d: deleted %d resume(s) (Tier D=%d, Tier C excess=%d)",
+                job_id, len(deleted_ids), len(tier_d), len(tier_c_excess),
+            )
+        except Exception as exc:
+            # Cleanup failure must never crash the ranking response
+            logger.error("Cleanup failed for job %d: %s", job_id, exc)
+
+    return {
+        "tier_c_limit_used": tier_c_limit,
+        "strong_candidates": strong_count,
+        "deleted_tier_d": len(tier_d),
+        "deleted_tier_c_excess": len(tier_c_excess),
+        "ids_deleted": deleted_ids,
+    }
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Experience Date-Range Extractor
+===============================
+Timeline layer of Phase 6 (experience evaluation), split out of scorer.py.
+
+All patterns are compiled once at import. A single scan per pattern over the
+work windows picked from the resume's sections (see section_segmenter.py)
+yields ``DateSpan(start, end, section)`` tuples (month indices,
+``year * 12 + month``), which are then merged into non-overlapping periods.
+
+Input is text that has already been through ``scorer.normalize_text``.
+"""
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.services.section_segmenter import Sections, section_windows, segment_sections
+
+
+MONTH_MAP: Dict[str, int] = {
+    'jan': 1,  'january': 1,   'feb': 2,  'february': 2,
+    'mar': 3,  'march': 3,     'apr': 4,  'april': 4,
+    'may': 5,  'jun': 6,       'june': 6, 'jul': 7,
+    'july': 7, 'aug': 8,       'august': 8,
+    'sep': 9,  'sept': 9,      'september': 9,
+    'oct': 10, 'october': 10,  'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12,
+}
+
+_MON = (r'(?:(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|'
+        r'jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|'
+        r'oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?\s*)?')
+# Also handle numeric months MM/YYYY
+_NUM_MON = r'(?:(\d{1,2})[/-])?'
+_YR  = r'(20\d{2}|19\d{2})'
+_SEP = r'\s*(?:-{1,2}|to|till|–)\s*'
+_END = (r'(?:(?:(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|'
+        r'jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|'
+        r'oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?\s*)|'
+        r'(?:(\d{1,2})[/-]))?'
+        r'(20\d{2}|19\d{2}|present|current|now|ongoing|till\s*date|to\s*date)')
+
+# Each pattern opens with a lookahead on the characters a match can start
+# with. It never changes what matches, but lets the engine skip most
+# positions before entering the month alternation.
+# Pattern 1: MMM YYYY - MMM YYYY or YYYY - YYYY
+DATE_RANGE_NAMED   = re.compile(r'(?=[jfmasond12])' + _MON + _YR + _SEP + _END, re.IGNORECASE)
+# Pattern 2: MM/YYYY - MM/YYYY
+DATE_RANGE_NUMERIC = re.compile(r'(?=\d)' + _NUM_MON + _YR + _SEP + _END, re.IGNORECASE)
+
+# Dates here are degrees and course completions, never employment.
+_NON_WORK_SECTIONS = ("education", "certifications")
+
+_ONGOING = re.compile(r'^(present|current|now|ongoing|till|to\s*date)')
+
+
+class DateSpan(NamedTuple):
+    start:   int    # year * 12 + month
+    end:     int    # year * 12 + month
+    section: str    # "experience" when read from that section, else "document"
+
+
+def work_windows(sections: Sections) -> Tuple[List[Tuple[int, int]], bool]:
+    """
+    Text windows that may hold employment dates: the experience section(s)
+    when the resume has one, otherwise everything except education and
+    certifications. Returns ``(windows, has_experience_section)``.
+    """
+    if sections.get("experience"):
+        return section_windows(sections, ["experience"]), True
+    return section_windows(sections, [n for n in sections if n not in _NON_WORK_SECTIONS]), False
+
+
+def _month(token: Optional[str]) -> int:
+    if not token:
+        return 6
+    if token.isdigit():
+        return int(token)
+    return MONTH_MAP.get(token.strip().lower().rstrip('.'), 6)
+
+
+def iter_date_spans(tn: str, current_year: int, current_month: int,
+                    sections: Optional[Sections] = None) -> Iterator[DateSpan]:
+    """
+    Yield every valid employment date range in the work windows of ``tn``.
+
+    Named-month ranges are scanned first, then numeric-month ranges; a bare
+    ``YYYY - YYYY`` range matches both and is yielded twice, which the merge
+    step absorbs.
+    """
+    if sections is None:
+        sections = segment_sections(tn)
+    windows, has_experience = work_windows(sections)
+    section = "experience" if has_experience else "document"
+
+    # Only consulted without an experience section: a 4-year range whose start
+    # year first appears just after "university" is treated as a degree.
+    edu_block: Dict[str, bool] = {}
+
+    for pattern in (DATE_RANGE_NAMED, DATE_RANGE_NUMERIC):
+        for pos, endpos in windows:
+            for m in pattern.finditer(tn, pos, endpos):
+                s_mon, s_yr_s, e_mon_s, e_mon_num, e_part = m.groups()
+
+                s_yr = int(s_yr_s)
+                if e_part[0] in '12':
+                    e_yr = int(e_part)
+                    e_mo = _month(e_mon_s or e_mon_num)
+                elif _ONGOING.match(e_part.lower()):
+                    e_yr, e_mo = current_year, current_month
+                else:
+                    continue
+
+                if not (1970 <= s_yr <= current_year and s_yr <= e_yr):
+                    continue
+                if not has_experience and (e_yr - s_yr) == 4:
+                    if s_yr_s not in edu_block:
+                        first = tn.find(s_yr_s)
+                        edu_block[s_yr_s] = "university" in tn[max(0, first - 50):first]
+                    if edu_block[s_yr_s]:
+                        continue
+
+                yield DateSpan(s_yr * 12 + _month(s_mon), e_yr * 12 + e_mo, section)
+
+
+def merge_spans(spans: List[DateSpan]) -> int:
+    """Total months covered by the union of ``spans``."""
+    if not spans:
+        return 0
+    periods = sorted((s.start, s.end) for s in spans)
+    total = 0
+    curr_s, curr_e = periods[0]
+    for next_s, next_e in periods[1:]:
+        if next_s <= curr_e:
+            curr_e = max(curr_e, next_e)
+        else:
+            total += curr_e - curr_s
+            curr_s, curr_e = next_s, next_e
+    return total + (curr_e - curr_s)
+
+
+def timeline_years(tn: str, current_year: int, current_month: int,
+                   sections: Optional[Sections] = None) -> float:
+    """Non-overlapping employment duration in years, rounded to 0.1."""
+    spans = list(iter_date_spans(tn, current_year, current_month, sections))
+    if not spans:
+        return 0.0
+    return round(merge_spans(spans) / 12, 1)
@@ -9,11 +9,19 @@ Two-pass ranking pipeline:
           recommendations.
 """
 import os
+import json
 import logging
-from typing import List, Tuple
-
-from app.services.resume_parser import parse_resume
-from app.services.scorer import score_resume, extract_years_of_experience
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.services.resume_parser import parse_resume_cached
+from app.services.scorer import (
+    score_resume,
+    extract_years_of_experience,
+    compile_job_profile,
+    score_components,
+    build_score_result,
+)
 from app.db.crud import update_resume_parsed_data
 
 logger = logging.getLogger(__name__)
@@ -66,6 +74,25 @@ def _comparative_recommendation(label: str, raw_rec: str) -> str:
     return "Not Recommended"
 
 
+def apply_comparative_insights(insights: dict, comp_label: str, role_fit: str,
+                               pool_size: int, comp_rec: str = None) -> dict:
+    """
+    Write pool-relative fields into a candidate's insights and replace the
+    absolute recommendation with the comparative one.
+    """
+    if comp_rec is None:
+        comp_rec = _comparative_recommendation(
+            comp_label, insights.get("recommendation", "")
+        )
+    insights["comparative_rank"]           = comp_label
+    insights["comparative_recommendation"] = comp_rec
+    insights["role_fit"]                   = role_fit
+    insights["pool_size"]                  = pool_size
+    # Override recommendation with comparative version
+    insights["recommendation"]             = comp_rec
+    return insights
+
+
 def calibrate_scores(results: List[dict]) -> List[dict]:
     """
     Cross-candidate calibration (Pass 2).
@@ -194,37 +221,199 @@ def calibrate_scores(results: List[dict]) -> List[dict]:
 
         # Update insights so they propagate to DB and API
         if r.get("insights"):
-            r["insights"]["comparative_rank"]       = comp_label
-            r["insights"]["comparative_recommendation"] = comp_rec
-            r["insights"]["role_fit"]               = role_fit
-            r["insights"]["pool_size"]              = n
-            # Override recommendation with comparative version
-            r["insights"]["recommendation"]         = comp_rec
+            apply_comparative_insights(r["insights"], comp_label, role_fit, n, comp_rec)
 
     return results
 
 
 # ---------------------------------------------------------------------------
-# Main ranking function
+# Array-backed calibration  (mass-hiring pools)
 # ---------------------------------------------------------------------------
 
-def rank_resumes_for_job(
-    job,
-    resumes: List[Tuple],
-    uploads_dir: str = "uploads",
-) -> List[dict]:
+# Pools at or above this size are calibrated on NumPy arrays when NumPy is
+# importable; smaller pools stay on the dict implementation above.
+ARRAY_CALIBRATION_MIN_POOL = 1000
+
+_COMPARATIVE_LABELS = (
+    "Top Candidate", "Strong Candidate", "Moderate Candidate",
+    "Below Average", "Weak Candidate",
+)
+_ROLE_FITS = ("core_fit", "adjacent_fit", "weak_fit", "irrelevant")
+
+
+class CalibratedPool:
     """
-    Two-pass ranking pipeline.
+    Output of :func:`calibrate_score_arrays`, indexed by final rank.
 
-    Pass 1: Score each resume independently (scorer v4).
-    Pass 2: Calibrate scores within the pool (cross-candidate normalisation).
+    order       index into the input arrays of the candidate at each rank
+    scores      calibrated score at each rank
+    labels      index into ``_COMPARATIVE_LABELS`` at each rank
+    role_fits   index into ``_ROLE_FITS`` at each rank
+    """
 
-    job row : (id, title, skills, keywords, min_experience, created_at, is_active)
-    resumes : [(resume_id, filename), ...]
+    def __init__(self, order, scores, labels, role_fits):
+        self.order     = order
+        self.scores    = scores
+        self.labels    = labels
+        self.role_fits = role_fits
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def materialize(self, results: List[dict], start: int = 0,
+                    stop: int = None) -> List[dict]:
+        """
+        Write calibration output into the result dicts for ranks
+        ``[start, stop)`` and return them in rank order.
+
+        ``results`` is the list the arrays were built from (raw-score order).
+        Rows outside the page are left untouched.
+        """
+        n    = len(self.order)
+        stop = n if stop is None else min(stop, n)
+        page: List[dict] = []
+        for rank_idx in range(start, stop):
+            r = results[self.order[rank_idx]]
+            comp_label = _COMPARATIVE_LABELS[self.labels[rank_idx]]
+            role_fit   = _ROLE_FITS[self.role_fits[rank_idx]]
+
+            r["raw_score"]        = r["score"]
+            r["score"]            = self.scores[rank_idx]
+            r["comparative_rank"] = comp_label
+            r["role_fit"]         = role_fit
+            r["rank_position"]    = rank_idx + 1
+
+            if r.get("insights"):
+                apply_comparative_insights(r["insights"], comp_label, role_fit, n)
+            page.append(r)
+        return page
+
+
+def calibrate_score_arrays(raw_scores, skill_scores, experience_years) -> CalibratedPool:
+    """
+    NumPy implementation of :func:`calibrate_scores` steps 1-6.
 
-    Returns list of result dicts sorted by calibrated score (descending).
+    Takes parallel sequences (raw score, ``skill_match``, ``experience_years``)
+    for a pool of at least two candidates, sorted descending by raw score,
+    and returns a :class:`CalibratedPool`. Every arithmetic step mirrors the
+    dict implementation operation-for-operation so the output is identical.
+    """
+    import numpy as np
+
+    raw   = np.asarray(raw_scores)
+    skill = np.asarray(skill_scores)
+    exp   = np.asarray(experience_years, dtype=float)
+    n     = int(raw.shape[0])
+
+    pool_max   = raw.max().item()
+    pool_min   = raw.min().item()
+    pool_range = max(pool_max - pool_min, 1)
+
+    TARGET_TOP = max(90, min(95, pool_max + 8))
+    TARGET_BOT = max(25, pool_min - 2)
+
+    # ── Scaling + blending ───────────────────────────────────────────────
+    scaled  = TARGET_BOT + (raw - pool_min) / pool_range * (TARGET_TOP - TARGET_BOT)
+    blended = (scaled * 0.70 + raw * 0.30).astype(np.int64)
+    blended = np.clip(blended, 20, 95)
+
+    # ── Band compression ────────────────────────────────────────────────
+    pct = 1.0 - np.arange(n) / max(n - 1, 1)
+    band_target = np.select(
+        [pct >= 0.85, pct >= 0.65, pct >= 0.40, pct >= 0.20],
+        [82 + (pct * 13).astype(np.int64),
+         70 + (pct * 18).astype(np.int64),
+         58 + (pct * 29).astype(np.int64),
+         45 + (pct * 32).astype(np.int64)],
+        30 + (pct * 50).astype(np.int64),
+    )
+    scores = np.clip((blended * 0.75 + band_target * 0.25).astype(np.int64), 20, 95)
+
+    # ── Consistency check ────────────────────────────────────────────────
+    # The skill/experience condition is static, so only those adjacent pairs
+    # are visited; they are walked in order because each swap can change the
+    # left-hand score of the next pair.
+    inverted = np.flatnonzero((skill[1:] > skill[:-1]) & (exp[1:] > exp[:-1]))
+    swaps = 0
+    for i in inverted.tolist():
+        if scores[i + 1] < scores[i]:
+            scores[i], scores[i + 1] = scores[i + 1], scores[i]
+            swaps += 1
+    if swaps:
+        logger.info("Consistency fix: swapped %d adjacent score pair(s)", swaps)
+
+    # Stable descending sort == list.sort(key=..., reverse=True)
+    order  = np.argsort(-scores, kind="stable")
+    scores = scores[order]
+
+    # ── Comparative labels & role fit ────────────────────────────────────
+    labels = np.select(
+        [pct >= 0.85, pct >= 0.60, pct >= 0.35, pct >= 0.15], [0, 1, 2, 3], 4,
+    )
+    ranked_skill = skill[order]
+    role_fits = np.select(
+        [(scores >= 80) & (ranked_skill >= 70),
+         (scores >= 65) | (ranked_skill >= 50),
+         scores >= 50],
+        [0, 1, 2], 3,
+    )
+
+    return CalibratedPool(
+        order.tolist(), scores.tolist(), labels.tolist(), role_fits.tolist(),
+    )
+
+
+def calibrate_scores_paged(results: List[dict], offset: int = 0,
+                           limit: int = None) -> List[dict]:
+    """
+    Array-backed :func:`calibrate_scores` that only builds dicts for one page.
+
+    Same input contract as :func:`calibrate_scores`. Returns the calibrated
+    rows for ranks ``[offset, offset + limit)``; the full-pool result is
+    identical to ``calibrate_scores(results)``.
+    """
+    n = len(results)
+    if n < 2:
+        return calibrate_scores(results)[offset:None if limit is None else offset + limit]
+
+    raw_scores  = []
+    skill_scores = []
+    exp_years   = []
+    for r in results:
+        bd = r.get("breakdown", {})
+        raw_scores.append(r["score"])
+        skill_scores.append(bd.get("skill_match", 0))
+        exp_years.append(bd.get("experience_years", 0.0) or 0)
+
+    pool = calibrate_score_arrays(raw_scores, skill_scores, exp_years)
+    stop = None if limit is None else offset + limit
+    return pool.materialize(results, offset, stop)
+
+
+def _numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Main ranking function
+# ---------------------------------------------------------------------------
+
+# Top-K mode: candidates at or above this calibrated score get insight text
+# besides the top K, since post-ranking cleanup keeps Tier C (60+).
+TOP_K_TIER_FLOOR = 60
+
+
+def build_job_payload(job) -> Tuple[int, str, dict]:
+    """
+    Turn a jobs row into ``(job_id, job_title, job_payload)`` for the scorer.
+
+    job row : (id, title, skills, keywords, min_experience, created_at, is_active,
+               skill_priorities, ...)
     """
-    # ── Extract job fields ───────────────────────────────────────────────
     job_id         = job[0]
     job_title      = job[1]  if len(job) > 1 else ""
     skills         = job[2]  if len(job) > 2 else []
@@ -264,79 +453,296 @@ def rank_resumes_for_job(
         "min_experience":   float(min_experience or 0),
         "skill_priorities": skill_priorities_map,  # Phase 16 data
     }
+    return job_id, job_title, job_payload
 
-    results: List[dict] = []
 
-    # ── Pass 1: Individual scoring ───────────────────────────────────────
-    for resume_id, filename in resumes:
-        path = os.path.join(uploads_dir, filename)
+def _load_resume_text(resume_id: int, filename: str, skills: List[str],
+                      uploads_dir: str) -> Optional[Tuple[str, float]]:
+    """
+    Parse one resume file and refresh its parsed data in the DB.
+    Returns ``(text, experience_years)`` or None when it cannot be scored.
+    """
+    path = os.path.join(uploads_dir, filename)
+
+    if not os.path.exists(path):
+        logger.warning("Resume file not found, skipping: %s", path)
+        return None
+
+    try:
+        text = parse_resume_cached(path)
+    except Exception as exc:
+        logger.error("Failed to parse %s: %s", filename, exc)
+        return None
+
+    if not text or len(text.strip()) < 20:
+        logger.warning("Empty/too-short text for %s, skipping", filename)
+        return None
+
+    years = extract_years_of_experience(text)
+    try:
+        update_resume_parsed_data(
+            resume_id=resume_id,
+            experience_years=years,
+            extracted_skills=skills,
+            parsed_text=text,
+        )
+    except Exception as exc:
+        logger.warning(
+            "Could not update parsed data for resume id=%s: %s",
+            resume_id, exc,
+        )
+    return text, years
+
+
+def _result_row(resume_id: int, filename: str, score_data: dict) -> dict:
+    return {
+        "resume_id":        resume_id,
+        "filename":         filename,
+        "score":            score_data["final_score"],
+        "raw_score":        score_data["final_score"],    # set properly in pass 2
+        "breakdown":        score_data["breakdown"],
+        "insights":         score_data["insights"],
+        "matched_skills":   score_data.get("matched_skills", []),
+        "missing_skills":   score_data.get("missing_skills", []),
+        "bonus_skills":     score_data.get("bonus_skills", []),
+        "extracted_skills": score_data.get("extracted_skills", []),
+        "explanation":      score_data.get("explanation", ""),
+    }
 
-        if not os.path.exists(path):
-            logger.warning("Resume file not found, skipping: %s", path)
-            continue
 
-        try:
-            text = parse_resume(path)
-        except Exception as exc:
-            logger.error("Failed to parse %s: %s", filename, exc)
-            continue
+def calibrate_pool(results: List[dict], job_id: int) -> List[dict]:
+    """Sort Pass-1 rows by raw score and run Pass 2 over the whole pool."""
+    # Sort by raw score before calibration
+    results.sort(key=lambda x: x["score"], reverse=True)
+
+    # ── Pass 2: Cross-candidate calibration ─────────────────────────────
+    if len(results) >= ARRAY_CALIBRATION_MIN_POOL and _numpy_available():
+        results = calibrate_scores_paged(results)
+    else:
+        results = calibrate_scores(results)
+
+    logger.info(
+        "Calibrated %d candidates for job %d | scores: %s",
+        len(results), job_id,
+        [r["score"] for r in results],
+    )
+    return results
+
+
+@lru_cache(maxsize=32)
+def _compiled_profile(job_title: str, payload_key: str) -> Dict:
+    return compile_job_profile(json.loads(payload_key), job_title)
+
+
+def cached_job_profile(job_payload: dict, job_title: str) -> Dict:
+    """
+    :func:`compile_job_profile` memoised per process, for workers that score
+    many chunks of the same job. Callers must not mutate the result.
+    """
+    return _compiled_profile(job_title, json.dumps(job_payload, sort_keys=True))
+
 
-        if not text or len(text.strip()) < 20:
-            logger.warning("Empty/too-short text for %s, skipping", filename)
+def score_resume_rows(
+    job_id: int,
+    job_payload: dict,
+    profile: Dict,
+    resumes: List[Tuple],
+    uploads_dir: str = "uploads",
+) -> List[dict]:
+    """
+    Pass 1 over ``[(resume_id, filename), ...]``: parse, score and return one
+    uncalibrated result row per resume that could be scored.
+    """
+    results: List[dict] = []
+    for resume_id, filename in resumes:
+        loaded = _load_resume_text(resume_id, filename, job_payload["skills"], uploads_dir)
+        if loaded is None:
             continue
+        text, years = loaded
 
-        years = extract_years_of_experience(text)
         try:
-            update_resume_parsed_data(
-                resume_id=resume_id,
-                experience_years=years,
-                extracted_skills=skills,
-                parsed_text=text,
+            score_data = build_score_result(
+                score_components(text, profile, candidate_years=years)
             )
-        except Exception as exc:
-            logger.warning(
-                "Could not update parsed data for resume id=%s: %s",
-                resume_id, exc,
-            )
-
-        try:
-            score_data = score_resume(text, job_payload, job_title=job_title)
         except Exception as exc:
             logger.error("Failed to score %s: %s", filename, exc)
             continue
 
-        results.append({
-            "resume_id":        resume_id,
-            "filename":         filename,
-            "score":            score_data["final_score"],
-            "raw_score":        score_data["final_score"],    # set properly in pass 2
-            "breakdown":        score_data["breakdown"],
-            "insights":         score_data["insights"],
-            "matched_skills":   score_data.get("matched_skills", []),
-            "missing_skills":   score_data.get("missing_skills", []),
-            "bonus_skills":     score_data.get("bonus_skills", []),
-            "extracted_skills": score_data.get("extracted_skills", []),
-            "explanation":      score_data.get("explanation", ""),
-        })
+        results.append(_result_row(resume_id, filename, score_data))
 
         logger.info(
             "Pass-1 scored %s for job %d: %d/100",
             filename, job_id, score_data["final_score"],
         )
+    return results
+
+
+def score_chunk(job_id: int, job_title: str, job_payload: dict,
+                resumes: List, uploads_dir: str = "uploads") -> dict:
+    """
+    Pass 1 for one chunk of a distributed ranking. ``resumes`` is
+    ``[[resume_id, filename], ...]``; the result is JSON-serialisable.
+    """
+    profile = cached_job_profile(job_payload, job_title)
+    results = score_resume_rows(job_id, job_payload, profile,
+                                [tuple(r) for r in resumes], uploads_dir)
+    return {"job_id": job_id, "results": results,
+            "skipped": len(resumes) - len(results)}
+
+
+def finalize_ranking(chunk_results: List[dict], job_id: int) -> dict:
+    """
+    Merge :func:`score_chunk` outputs, calibrate the whole pool, persist
+    every ranking in bulk and run post-ranking cleanup. Returns a summary.
+    """
+    from app.db.crud import bulk_upsert_rankings
+    from app.services.cleanup import cleanup_low_value_resumes
+
+    results = [r for chunk in chunk_results for r in chunk["results"]]
+    skipped = sum(chunk["skipped"] for chunk in chunk_results)
+    if not results:
+        return {"status": "completed", "job_id": job_id,
+                "ranked_count": 0, "skipped_count": skipped}
+
+    results = calibrate_pool(results, job_id)
+    bulk_upsert_rankings(job_id, results)
+    logger.info("Ranked %d resumes for job %d across %d chunk(s)",
+                len(results), job_id, len(chunk_results))
+
+    cleanup_summary = cleanup_low_value_resumes(job_id, results)
+    logger.info("Cleanup summary for job %d: %s", job_id, cleanup_summary)
+
+    return {
+        "status":        "completed",
+        "job_id":        job_id,
+        "ranked_count":  len(results),
+        "skipped_count": skipped,
+        "cleanup":       cleanup_summary,
+    }
+
+
+def rank_resumes_for_job(
+    job,
+    resumes: List[Tuple],
+    uploads_dir: str = "uploads",
+) -> List[dict]:
+    """
+    Two-pass ranking pipeline.
+
+    Pass 1: Score each resume independently (scorer v4).
+    Pass 2: Calibrate scores within the pool (cross-candidate normalisation).
+
+    job row : (id, title, skills, keywords, min_experience, created_at, is_active)
+    resumes : [(resume_id, filename), ...]
+
+    Returns list of result dicts sorted by calibrated score (descending).
+    The same passes run distributed (:func:`score_chunk` per chunk, then
+    :func:`finalize_ranking`) via ``app.workers.tasks.enqueue_job_ranking``.
+    """
+    job_id, job_title, job_payload = build_job_payload(job)
+    profile = compile_job_profile(job_payload, job_title)
+
+    # ── Pass 1: Individual scoring ───────────────────────────────────────
+    results = score_resume_rows(job_id, job_payload, profile, resumes, uploads_dir)
 
     if not results:
         return []
 
-    # Sort by raw score before calibration
-    results.sort(key=lambda x: x["score"], reverse=True)
+    return calibrate_pool(results, job_id)
 
-    # ── Pass 2: Cross-candidate calibration ─────────────────────────────
-    results = calibrate_scores(results)
+
+def rank_top_k_for_job(
+    job,
+    resumes: List[Tuple],
+    top_k: int,
+    uploads_dir: str = "uploads",
+) -> List[dict]:
+    """
+    Shortlist variant of :func:`rank_resumes_for_job`.
+
+    Pass 1: Every resume gets numeric scores only. Calibration depends on
+            each raw score in the pool (its minimum, rank percentiles and
+            the consistency check), so nobody is skipped here.
+    Pass 2: Calibration over the whole pool, as in full mode; insight text
+            is then built only for the top K and for candidates at Tier C
+            or above. Everyone else keeps ``insights_pending`` and is
+            completed on demand by :func:`complete_pending_insights`.
+
+    Scores, comparative labels, tiers and shortlist insights are identical
+    to :func:`rank_resumes_for_job`.
+    """
+    job_id, job_title, job_payload = build_job_payload(job)
+    profile = compile_job_profile(job_payload, job_title)
+
+    results: List[dict] = []
+    cores:   Dict[int, dict] = {}
+
+    for resume_id, filename in resumes:
+        loaded = _load_resume_text(resume_id, filename, job_payload["skills"], uploads_dir)
+        if loaded is None:
+            continue
+        text, years = loaded
+
+        try:
+            core = score_components(text, profile, candidate_years=years)
+        except Exception as exc:
+            logger.error("Failed to score %s: %s", filename, exc)
+            continue
+
+        cores[resume_id] = core
+        results.append(_result_row(resume_id, filename, build_score_result(core, detail=False)))
+
+    if not results:
+        return []
+
+    results = calibrate_pool(results, job_id)
+
+    # ── Insight text only where a recruiter will look ────────────────────
+    detailed_count = 0
+    for rank_idx, r in enumerate(results):
+        if rank_idx >= top_k and r["score"] < TOP_K_TIER_FLOOR:
+            continue
+        pending = r["insights"]
+        detailed = build_score_result(cores[r["resume_id"]], detail=True)
+        r["insights"]    = detailed["insights"]
+        r["explanation"] = detailed["explanation"]
+        if pending.get("comparative_rank"):
+            apply_comparative_insights(
+                r["insights"],
+                pending["comparative_rank"],
+                pending.get("role_fit", ""),
+                pending.get("pool_size", len(results)),
+            )
+        detailed_count += 1
 
     logger.info(
-        "Calibrated %d candidates for job %d | scores: %s",
-        len(results), job_id,
-        [r["score"] for r in results],
+        "Top-%d pass for job %d: ranked %d, insights built for %d",
+        top_k, job_id, len(results), detailed_count,
     )
-
     return results
+
+
+def complete_pending_insights(job, resume_text: str, stored_insights: Optional[dict],
+                              sections: Optional[dict] = None) -> dict:
+    """
+    Build the full insight payload for a candidate that was ranked in top-K
+    mode without one (``insights_pending``).
+
+    Pool-level fields already stored for the candidate (comparative rank,
+    role fit, pool size) are carried over onto the fresh insights.
+    ``sections`` are the resume's stored section spans, if any.
+    """
+    _, job_title, job_payload = build_job_payload(job)
+    insights = score_resume(
+        resume_text, job_payload, job_title=job_title, sections=sections
+    )["insights"]
+
+    stored_insights = stored_insights or {}
+    if stored_insights.get("comparative_rank"):
+        apply_comparative_insights(
+            insights,
+            stored_insights["comparative_rank"],
+            stored_insights.get("role_fit", ""),
+            stored_insights.get("pool_size", 0),
+        )
+    return insights
@@ -0,0 +1,238 @@
+"""
+LLM Response Cache
+==================
+Recruiters ask the same questions about the same resume again and again,
+and each one is a paid, multi-second LLM round-trip. Answers are cached
+under (provider, model, system-prompt hash, normalised user message)
+with a TTL and a size cap:
+
+- sqlite  local file, shared by the processes of one node (default)
+- redis   REDIS_URL, shared by every API process and worker; size is
+          bounded by the server's maxmemory policy (volatile-lru evicts
+          these keys, which all carry the TTL)
+
+An entry keeps the chunks the answer was streamed in, so a hit on the
+streaming endpoint is replayed as the same SSE token chunks, and the
+latency of the original call, which is what each hit saves. Hit rate
+and saved latency are counted per process (``llm_cache_stats``).
+
+Cache failures are logged and treated as misses; they never fail a chat.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCT = re.compile(r"[\s?!.]+$")
+_WORD_CHUNKS = re.compile(r"\s*\S+|\s+$")
+
+
+def normalize_message(text: str) -> str:
+    """Case, spacing and trailing ?/!/. don't make a different question."""
+    return _TRAILING_PUNCT.sub("", _WHITESPACE.sub(" ", text).strip().lower())
+
+
+def cache_key(provider: str, model: str, system_prompt: str, user_message: str) -> str:
+    system_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    raw = "\x1f".join((provider, model, system_hash, normalize_message(user_message)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    chunks: List[str]
+    latency_ms: float       # duration of the provider call this entry replaces
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    def replay_chunks(self) -> List[str]:
+        """Chunks to stream on a hit; a non-streamed answer is split into words."""
+        if len(self.chunks) > 1:
+            return self.chunks
+        return _WORD_CHUNKS.findall(self.text) or self.chunks
+
+
+class CacheStats:
+    """Per-process hit/miss counters and the provider time hits saved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+        self.saved_latency_ms = 0.0
+
+    def record(self, field: str, saved_ms: float = 0.0):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+            self.saved_latency_ms += saved_ms
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "saved_latency_ms": round(self.saved_latency_ms, 1),
+            }
+
+
+class ResponseCache:
+    backend = ""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = self._get(key)
+            entry = CachedResponse(**json.loads(raw)) if raw is not None else None
+        except Exception as e:
+            logger.warning(f"LLM cache read failed ({self.backend}): {e}")
+            self.stats.record("errors")
+            entry = None
+        if entry is None:
+            self.stats.record("misses")
+            return None
+        self.stats.record("hits", saved_ms=entry.latency_ms)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        try:
+            self._set(key, json.dumps(asdict(entry)))
+            self.stats.record("stores")
+        except Exception as e:
+            logger.warning(f"LLM cache write failed ({self.backend}): {e}")
+            self.stats.record("errors")
+
+    def size(self) -> Optional[int]:
+        return None
+
+    def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: str):
+        raise NotImplementedError
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Expired rows and the least recently used rows over ``max_entries`` are dropped on write."""
+    backend = "sqlite"
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used)")
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row:
+                self._conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now),
+            )
+            self._conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                " SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+
+class RedisResponseCache(ResponseCache):
+    backend = "redis"
+    KEY_PREFIX = "llm:response:"
+
+    def __init__(self, url: str, ttl_seconds: int):
+        super().__init__(ttl_seconds)
+        import redis
+        # Short timeouts: a slow cache must not cost more than the miss
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def _get(self, key: str) -> Optional[str]:
+        raw = self._redis.get(self.KEY_PREFIX + key)
+        return raw.decode("utf-8") if raw is not None else None
+
+    def _set(self, key: str, value: str):
+        self._redis.set(self.KEY_PREFIX + key, value, ex=self.ttl_seconds)
+
+
+_caches_lock = threading.Lock()
+_caches: Dict[tuple, ResponseCache] = {}
+
+
+def get_llm_cache(settings=None) -> Optional[ResponseCache]:
+    """This process's response cache, or None when LLM_CACHE_BACKEND is empty."""
+    if settings is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+    backend = settings.LLM_CACHE_BACKEND.strip().lower()
+    if not backend:
+        return None
+    # Keyed on the pid too: a SQLite connection must not cross a fork
+    key = (os.getpid(), backend, settings.LLM_CACHE_PATH, settings.REDIS_URL,
+           settings.LLM_CACHE_TTL_SECONDS, settings.LLM_CACHE_MAX_ENTRIES)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            if backend == "redis":
+                cache = RedisResponseCache(settings.REDIS_URL, settings.LLM_CACHE_TTL_SECONDS)
+            elif backend == "sqlite":
+                cache = SQLiteResponseCache(settings.LLM_CACHE_PATH, settings.LLM_CACHE_TTL_SECONDS,
+                                            settings.LLM_CACHE_MAX_ENTRIES)
+            else:
+                raise ValueError(f"Unknown LLM_CACHE_BACKEND: {backend!r}")
+            _caches[key] = cache
+        return cache
+
+
+def llm_cache_stats(settings=None) -> Dict:
+    """Backend, entry count and this process's hit/miss counters."""
+    cache = get_llm_cache(settings)
+    if cache is None:
+        return {"backend": None}
+    try:
+        size = cache.size()
+    except Exception:
+        size = None
+    return {"backend": cache.backend, "entries": size, **cache.stats.snapshot()}
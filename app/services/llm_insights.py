@@ -0,0 +1,246 @@
+"""
+LLM Insights for Shortlisted Candidates
+=======================================
+Optional stage after ranking: the top-K candidates of a job get a written
+assessment from the configured LLM (``app/prompts/resume_match.txt``) on
+top of the template insights from ``scorer.generate_insights``.
+
+- Candidates run concurrently, at most ``concurrency`` calls in flight,
+  so wall time grows with K / concurrency rather than K
+- Calls are spaced by a process-wide rate limiter per provider
+  (requests per minute, with a burst), shared by every request
+- Rate limits (429), 5xx, timeouts, connection errors and answers that
+  are not valid JSON are retried with exponential backoff and jitter;
+  other client errors fail the candidate at once
+- Results are yielded as they complete; the route stores each one under
+  ``rankings.insights["llm_insights"]`` and streams it to the shortlist
+
+The LLM is anything with ``provider`` and an async
+``aget_chat_response(system_prompt, user_message, raise_errors=True,
+use_cache=False)``, so tests drive the stage with a local stub. The
+response cache is bypassed: it would replay a rejected answer to every
+retry and to a refresh.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.services.resume_digest import build_resume_digest
+
+logger = logging.getLogger(__name__)
+
+PROMPT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "prompts", "resume_match.txt",
+)
+USER_MESSAGE = "Assess this candidate for the job. Reply with the JSON object only."
+
+# Requests per minute used when LLM_REQUESTS_PER_MINUTE is 0: the free /
+# entry tier of each provider, so a fresh key is not throttled
+PROVIDER_REQUESTS_PER_MINUTE = {"groq": 30, "openai": 500, "anthropic": 50}
+_FITS = ("strong", "possible", "weak")
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+class InvalidInsights(ValueError):
+    """The model answered, but not with the JSON object the prompt asks for."""
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """
+    Requests-per-minute limiter with a burst (GCRA). ``reserve`` books the
+    next slot under a thread lock and returns how long to wait for it, so
+    one limiter serves every event loop and thread in the process.
+    """
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.interval = 60.0 / per_minute
+        self.burst = max(burst, 1)
+        self._tat = 0.0         # theoretical arrival time of the next request
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + self.interval
+            return max(tat - now - (self.burst - 1) * self.interval, 0.0)
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_limiters: Dict[tuple, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, per_minute: int = 0, burst: int = 1) -> RateLimiter:
+    """Process-wide limiter for ``provider`` (``per_minute`` 0: provider default)."""
+    rate = per_minute or PROVIDER_REQUESTS_PER_MINUTE.get(provider, 30)
+    with _limiters_lock:
+        limiter = _limiters.get((provider, rate, burst))
+        if limiter is None:
+            limiter = _limiters[(provider, rate, burst)] = RateLimiter(rate, burst)
+        return limiter
+
+
+# ---------------------------------------------------------------------------
+# Prompt and answer
+# ---------------------------------------------------------------------------
+
+_prompt_template: Optional[str] = None
+
+
+def load_prompt_template() -> str:
+    global _prompt_template
+    if _prompt_template is None:
+        with open(PROMPT_PATH, encoding="utf-8") as f:
+            _prompt_template = f.read()
+    return _prompt_template
+
+
+def build_insight_prompt(job_title: str, job_payload: Dict, candidate: Dict,
+                         resume_token_budget: int = 800) -> str:
+    """
+    System prompt for one candidate. ``candidate`` carries ``resume_text``,
+    ``score`` and the stored template ``insights`` (matched/missing skills).
+    """
+    insights = candidate.get("insights") or {}
+    return load_prompt_template().format(
+        job_title=job_title or "Untitled role",
+        required_skills=", ".join(job_payload.get("skills") or []) or "not specified",
+        keywords=", ".join(job_payload.get("keywords") or []) or "none",
+        min_experience=job_payload.get("min_experience") or 0,
+        score=candidate.get("score", 0),
+        matched_skills=", ".join(insights.get("matched_skills") or []) or "none",
+        missing_skills=", ".join(insights.get("missing_skills") or []) or "none",
+        resume=build_resume_digest(candidate.get("resume_text") or "", resume_token_budget),
+    )
+
+
+def _string_list(value, limit: int) -> List[str]:
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if str(item).strip()][:limit]
+
+
+def parse_insights(answer: str) -> Dict:
+    """The JSON object in the model's answer (code fences and prose around it are ignored)."""
+    match = _JSON_OBJECT.search(answer or "")
+    if not match:
+        raise InvalidInsights("no JSON object in answer")
+    try:
+        data = json.loads(match.group())
+    except json.JSONDecodeError as e:
+        raise InvalidInsights(f"malformed JSON: {e}") from e
+    summary = str(data.get("summary") or "").strip()
+    if not summary:
+        raise InvalidInsights("answer has no summary")
+    fit = str(data.get("fit") or "").strip().lower()
+    return {
+        "summary":             summary,
+        "strengths":           _string_list(data.get("strengths"), 4),
+        "concerns":            _string_list(data.get("concerns"), 4),
+        "interview_questions": _string_list(data.get("interview_questions"), 3),
+        "fit":                 fit if fit in _FITS else "possible",
+    }
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    """429, 5xx, timeouts, connection errors and unusable answers are worth another try."""
+    if isinstance(exc, (InvalidInsights, asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        # SDK connection / timeout errors carry no status code
+        return type(exc).__name__ in ("APIConnectionError", "APITimeoutError")
+    return status == 429 or status >= 500
+
+
+# ---------------------------------------------------------------------------
+# Stage
+# ---------------------------------------------------------------------------
+
+async def _assess(llm, limiter: RateLimiter, job_title: str, job_payload: Dict, candidate: Dict,
+                  max_attempts: int, base_delay: float, resume_token_budget: int) -> Dict:
+    system_prompt = build_insight_prompt(job_title, job_payload, candidate, resume_token_budget)
+    started = time.perf_counter()
+    for attempt in range(1, max_attempts + 1):
+        await limiter.acquire()
+        try:
+            answer = await llm.aget_chat_response(system_prompt, USER_MESSAGE,
+                                                  raise_errors=True, use_cache=False)
+            insights = parse_insights(answer)
+        except Exception as exc:
+            if attempt == max_attempts or not is_retryable(exc):
+                logger.warning(f"LLM insights failed for resume {candidate['resume_id']} "
+                               f"after {attempt} attempt(s): {exc}")
+                return {"resume_id": candidate["resume_id"], "status": "failed",
+                        "error": f"{type(exc).__name__}: {exc}", "attempts": attempt}
+            delay = _retry_after(exc) or base_delay * 2 ** (attempt - 1) * (1 + random.random())
+            await asyncio.sleep(delay)
+            continue
+        insights.update({
+            "provider":     llm.provider,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "latency_ms":   round((time.perf_counter() - started) * 1000),
+        })
+        return {"resume_id": candidate["resume_id"], "status": "completed",
+                "llm_insights": insights, "attempts": attempt}
+
+
+async def generate_llm_insights(
+    llm,
+    job_title: str,
+    job_payload: Dict,
+    candidates: List[Dict],
+    concurrency: int = 4,
+    max_attempts: int = 3,
+    limiter: Optional[RateLimiter] = None,
+    base_delay: float = 1.0,
+    resume_token_budget: int = 800,
+) -> AsyncIterator[Dict]:
+    """
+    Assess ``candidates`` (dicts with resume_id, score, insights,
+    resume_text) and yield one result per candidate in completion order:
+    ``{"resume_id", "status": "completed", "llm_insights", "attempts"}`` or
+    ``{"resume_id", "status": "failed", "error", "attempts"}``.
+
+    Closing the generator early cancels the calls still in flight.
+    """
+    limiter = limiter or get_rate_limiter(llm.provider, burst=concurrency)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def bounded(candidate):
+        async with semaphore:
+            return await _assess(llm, limiter, job_title, job_payload, candidate,
+                                 max_attempts, base_delay, resume_token_budget)
+
+    tasks = [asyncio.ensure_future(bounded(c)) for c in candidates]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
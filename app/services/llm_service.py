@@ -1,137 +1,306 @@
 """
 LLM Service - Wrapper for different LLM providers (Groq, OpenAI, Anthropic)
+
+SDK clients are built once and reused: each holds a keep-alive httpx pool,
+so a chat turn no longer pays SDK import, client construction and a TLS
+handshake. Async clients are cached per event loop (an httpx async pool
+belongs to the loop that opened its connections).
+
+Answers are cached (see llm_cache): a repeated question about the same
+resume is served without a provider call.
 """
-import os
+import asyncio
+import importlib
+import threading
+import time
+import weakref
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
 from app.core.config import get_settings
+from app.services.llm_cache import CachedResponse, cache_key, get_llm_cache
+
+_PROVIDER_LABELS = {"groq": "Groq", "openai": "OpenAI", "anthropic": "Anthropic"}
+ANTHROPIC_MAX_TOKENS = 1024
+KEEPALIVE_EXPIRY_SECONDS = 30
+
+_clients_lock = threading.Lock()
+_sync_clients: Dict[tuple, object] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, object]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+# provider -> (SDK module, sync client class, async client class)
+_SDKS = {
+    "groq":      ("groq", "Groq", "AsyncGroq"),
+    "openai":    ("openai", "OpenAI", "AsyncOpenAI"),
+    "anthropic": ("anthropic", "Anthropic", "AsyncAnthropic"),
+}
+
+
+def _client_key(provider: str, settings) -> tuple:
+    prefix = provider.upper()
+    return (
+        provider,
+        getattr(settings, f"{prefix}_API_KEY"),
+        getattr(settings, f"{prefix}_BASE_URL") or None,
+        settings.LLM_TIMEOUT_SECONDS,
+        settings.LLM_MAX_RETRIES,
+        settings.LLM_MAX_CONNECTIONS,
+    )
+
+
+def _build_client(key: tuple, asynchronous: bool):
+    provider, api_key, base_url, timeout, max_retries, max_connections = key
+    module_name, sync_class, async_class = _SDKS[provider]
+    sdk = importlib.import_module(module_name)
+    # Built through the SDK's own httpx flavour (some SDKs vendor a fork);
+    # idle connections are kept longer than the 5 s default so chat turns
+    # a few seconds apart skip the TLS handshake.
+    limits = type(sdk.DEFAULT_CONNECTION_LIMITS)(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+    )
+    http_client_class = sdk.DefaultAsyncHttpxClient if asynchronous else sdk.DefaultHttpxClient
+    return getattr(sdk, async_class if asynchronous else sync_class)(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=timeout,
+        max_retries=max_retries,
+        http_client=http_client_class(limits=limits, timeout=timeout),
+    )
+
+
+def get_llm_client(provider: str, settings=None):
+    """Process-wide SDK client for ``provider`` (thread-safe, built on first use)."""
+    key = _client_key(provider, settings or get_settings())
+    with _clients_lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            client = _sync_clients[key] = _build_client(key, asynchronous=False)
+        return client
+
+
+def get_async_llm_client(provider: str, settings=None):
+    """Async SDK client for ``provider`` bound to the running event loop."""
+    key = _client_key(provider, settings or get_settings())
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = _build_client(key, asynchronous=True)
+        return client
+
+
+def close_llm_clients():
+    """Close the pooled sync clients."""
+    with _clients_lock:
+        clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_llm_clients():
+    """Close this loop's async clients and the sync ones (app shutdown)."""
+    with _clients_lock:
+        clients = list(_async_clients.pop(asyncio.get_running_loop(), {}).values())
+    for client in clients:
+        await client.close()
+    close_llm_clients()
+
 
 class LLMService:
-    def __init__(self):
-        self.settings = get_settings()
+    def __init__(self, settings=None, cache=None):
+        self.settings = settings or get_settings()
         self.provider = self.settings.LLM_PROVIDER
-        
-    def get_chat_response(self, system_prompt: str, user_message: str) -> str:
-        """
-        Generic method to get a response from the configured LLM provider.
-        """
-        if self.provider == "groq":
-            return self._call_groq(system_prompt, user_message)
-        elif self.provider == "openai":
-            return self._call_openai(system_prompt, user_message)
-        elif self.provider == "anthropic":
-            return self._call_anthropic(system_prompt, user_message)
-        else:
-            return "Error: LLM Provider not configured correctly."
+        self._cache = cache     # None: the process-wide cache from settings
 
-    def get_streaming_chat_response(self, system_prompt: str, user_message: str):
-        """
-        Generic method to get a streaming response from the configured LLM provider.
-        Returns a generator of strings (tokens).
-        """
-        if self.provider == "groq":
-            yield from self._stream_groq(system_prompt, user_message)
-        elif self.provider == "openai":
-            yield from self._stream_openai(system_prompt, user_message)
-        elif self.provider == "anthropic":
-            yield from self._stream_anthropic(system_prompt, user_message)
-        else:
-            yield "Error: LLM Provider not configured correctly."
+    def _timeout(self, timeout: Optional[float]) -> float:
+        return timeout if timeout is not None else self.settings.LLM_TIMEOUT_SECONDS
 
-    def _call_groq(self, system_prompt: str, user_message: str) -> str:
-        try:
-            from langchain_groq import ChatGroq
-            llm = ChatGroq(
-                api_key=self.settings.GROQ_API_KEY,
-                model_name=self.settings.GROQ_MODEL
-            )
-            messages = [
-                ("system", system_prompt),
-                ("human", user_message),
-            ]
-            response = llm.invoke(messages)
-            return response.content
-        except Exception as e:
-            return f"Groq Error: {str(e)}"
+    def _request(self, system_prompt: str, user_message: str) -> dict:
+        """Provider-specific request body for one system + user turn."""
+        if self.provider == "anthropic":
+            return {
+                "model": self.settings.ANTHROPIC_MODEL,
+                "max_tokens": ANTHROPIC_MAX_TOKENS,
+                "system": system_prompt,
+                "messages": [{"role": "user", "content": user_message}],
+            }
+        # Groq and OpenAI share the chat-completions API
+        return {
+            "model": self._model(),
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ],
+        }
 
-    def _stream_groq(self, system_prompt: str, user_message: str):
-        try:
-            from groq import Groq
-            client = Groq(api_key=self.settings.GROQ_API_KEY)
-            stream = client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message},
-                ],
-                model=self.settings.GROQ_MODEL,
-                stream=True,
-            )
+    def _model(self) -> str:
+        return getattr(self.settings, f"{self.provider.upper()}_MODEL")
+
+    def _response_cache(self, system_prompt: str, user_message: str):
+        """(cache, key) for this turn, or (None, None) when caching is off."""
+        cache = self._cache if self._cache is not None else get_llm_cache(self.settings)
+        if cache is None:
+            return None, None
+        return cache, cache_key(self.provider, self._model(), system_prompt, user_message)
+
+    @staticmethod
+    def _store(cache, key: str, chunks: List[str], started: float):
+        # Errors never reach here; empty answers aren't worth replaying
+        if cache is not None and "".join(chunks).strip():
+            cache.set(key, CachedResponse(chunks, (time.perf_counter() - started) * 1000))
+
+    # ── Provider calls (raise on failure) ─────────────────────
+
+    def _complete(self, system_prompt: str, user_message: str, timeout: Optional[float]) -> str:
+        client = get_llm_client(self.provider, self.settings)
+        request = self._request(system_prompt, user_message)
+        if self.provider == "anthropic":
+            message = client.messages.create(**request, timeout=self._timeout(timeout))
+            return message.content[0].text
+        response = client.chat.completions.create(**request, timeout=self._timeout(timeout))
+        return response.choices[0].message.content
+
+    def _stream(self, system_prompt: str, user_message: str, timeout: Optional[float]) -> Iterator[str]:
+        client = get_llm_client(self.provider, self.settings)
+        request = self._request(system_prompt, user_message)
+        if self.provider == "anthropic":
+            with client.messages.stream(**request, timeout=self._timeout(timeout)) as stream:
+                yield from stream.text_stream
+            return
+        # ``with`` hands the connection back to the pool if the consumer stops early
+        with client.chat.completions.create(**request, stream=True,
+                                            timeout=self._timeout(timeout)) as stream:
             for chunk in stream:
                 if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
-        except Exception as e:
-            yield f"Groq Stream Error: {str(e)}"
 
-    def _call_openai(self, system_prompt: str, user_message: str) -> str:
+    async def _acomplete(self, system_prompt: str, user_message: str, timeout: Optional[float]) -> str:
+        client = get_async_llm_client(self.provider, self.settings)
+        request = self._request(system_prompt, user_message)
+        if self.provider == "anthropic":
+            message = await client.messages.create(**request, timeout=self._timeout(timeout))
+            return message.content[0].text
+        response = await client.chat.completions.create(**request, timeout=self._timeout(timeout))
+        return response.choices[0].message.content
+
+    async def _astream(self, system_prompt: str, user_message: str,
+                       timeout: Optional[float]) -> AsyncIterator[str]:
+        client = get_async_llm_client(self.provider, self.settings)
+        request = self._request(system_prompt, user_message)
+        if self.provider == "anthropic":
+            async with client.messages.stream(**request, timeout=self._timeout(timeout)) as stream:
+                async for text in stream.text_stream:
+                    yield text
+            return
+        stream = await client.chat.completions.create(**request, stream=True,
+                                                      timeout=self._timeout(timeout))
+        async with stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    # ── Blocking (Celery tasks, sync routes) ──────────────────
+
+    def get_chat_response(self, system_prompt: str, user_message: str,
+                          timeout: Optional[float] = None) -> str:
+        """
+        Generic method to get a response from the configured LLM provider.
+        """
+        if self.provider not in _PROVIDER_LABELS:
+            return "Error: LLM Provider not configured correctly."
+        cache, key = self._response_cache(system_prompt, user_message)
+        hit = cache.get(key) if cache else None
+        if hit:
+            return hit.text
+        started = time.perf_counter()
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.settings.OPENAI_API_KEY)
-            response = client.chat.completions.create(
-                model=self.settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ]
-            )
-            return response.choices[0].message.content
+            text = self._complete(system_prompt, user_message, timeout)
         except Exception as e:
-            return f"OpenAI Error: {str(e)}"
+            return f"{_PROVIDER_LABELS[self.provider]} Error: {str(e)}"
+        self._store(cache, key, [text], started)
+        return text
 
-    def _stream_openai(self, system_prompt: str, user_message: str):
+    def get_streaming_chat_response(self, system_prompt: str, user_message: str,
+                                    timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Generic method to get a streaming response from the configured LLM provider.
+        Returns a generator of strings (tokens); a cached answer is replayed
+        as the chunks it was streamed in.
+        """
+        if self.provider not in _PROVIDER_LABELS:
+            yield "Error: LLM Provider not configured correctly."
+            return
+        cache, key = self._response_cache(system_prompt, user_message)
+        hit = cache.get(key) if cache else None
+        if hit:
+            yield from hit.replay_chunks()
+            return
+        chunks, started = [], time.perf_counter()
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.settings.OPENAI_API_KEY)
-            response = client.chat.completions.create(
-                model=self.settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                stream=True
-            )
-            for chunk in response:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            for token in self._stream(system_prompt, user_message, timeout):
+                chunks.append(token)
+                yield token
         except Exception as e:
-            yield f"OpenAI Stream Error: {str(e)}"
+            yield f"{_PROVIDER_LABELS[self.provider]} Stream Error: {str(e)}"
+            return
+        self._store(cache, key, chunks, started)
 
-    def _call_anthropic(self, system_prompt: str, user_message: str) -> str:
+    # ── Async (FastAPI async routes; never blocks the event loop) ──
+
+    async def aget_chat_response(self, system_prompt: str, user_message: str,
+                                 timeout: Optional[float] = None, raise_errors: bool = False,
+                                 use_cache: bool = True) -> str:
+        """
+        Async variant of :meth:`get_chat_response`. With ``raise_errors``
+        provider exceptions propagate (for callers that retry) instead of
+        coming back as an error string. ``use_cache=False`` always asks the
+        provider and stores nothing, for callers that validate the answer
+        and retry on a bad one.
+        """
+        if self.provider not in _PROVIDER_LABELS:
+            if raise_errors:
+                raise ValueError(f"LLM provider not configured correctly: {self.provider!r}")
+            return "Error: LLM Provider not configured correctly."
+        cache, key = self._response_cache(system_prompt, user_message) if use_cache else (None, None)
+        hit = await asyncio.to_thread(cache.get, key) if cache else None
+        if hit:
+            return hit.text
+        started = time.perf_counter()
         try:
-            from anthropic import Anthropic
-            client = Anthropic(api_key=self.settings.ANTHROPIC_API_KEY)
-            message = client.messages.create(
-                model=self.settings.ANTHROPIC_MODEL,
-                max_tokens=1024,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_message}
-                ]
-            )
-            return message.content[0].text
+            text = await self._acomplete(system_prompt, user_message, timeout)
         except Exception as e:
-            return f"Anthropic Error: {str(e)}"
+            if raise_errors:
+                raise
+            return f"{_PROVIDER_LABELS[self.provider]} Error: {str(e)}"
+        if cache is not None:
+            await asyncio.to_thread(self._store, cache, key, [text], started)
+        return text
 
-    def _stream_anthropic(self, system_prompt: str, user_message: str):
+    async def aget_streaming_chat_response(self, system_prompt: str, user_message: str,
+                                           timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Async variant of :meth:`get_streaming_chat_response`."""
+        if self.provider not in _PROVIDER_LABELS:
+            yield "Error: LLM Provider not configured correctly."
+            return
+        cache, key = self._response_cache(system_prompt, user_message)
+        hit = await asyncio.to_thread(cache.get, key) if cache else None
+        if hit:
+            for token in hit.replay_chunks():
+                yield token
+            return
+        chunks, started = [], time.perf_counter()
         try:
-            from anthropic import Anthropic
-            client = Anthropic(api_key=self.settings.ANTHROPIC_API_KEY)
-            with client.messages.stream(
-                model=self.settings.ANTHROPIC_MODEL,
-                max_tokens=1024,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_message}
-                ]
-            ) as stream:
-                for text in stream.text_stream:
-                    yield text
+            async for token in self._astream(system_prompt, user_message, timeout):
+                chunks.append(token)
+                yield token
         except Exception as e:
-            yield f"Anthropic Stream Error: {str(e)}"
+            yield f"{_PROVIDER_LABELS[self.provider]} Stream Error: {str(e)}"
+            return
+        if cache is not None:
+            await asyncio.to_thread(self._store, cache, key, chunks, started)
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Resume Parser Pool
+==================
+PDF/DOCX extraction runs in a small pool of long-lived subprocesses instead
+of the calling API thread or Celery worker, so one malformed or enormous
+file cannot stall or bloat the caller.
+
+Each file gets:
+  - a wall-clock limit   (PARSER_TIMEOUT_SECONDS)  -> worker killed, "timeout"
+  - an RSS limit         (PARSER_MAX_RSS_MB)       -> worker killed, "memory_limit"
+  - a page cap           (PARSER_MAX_PAGES)        -> later pages skipped, truncated
+  - a character cap      (PARSER_MAX_CHARS)        -> text cut, truncated
+
+Workers are recycled after PARSER_MAX_FILES_PER_WORKER files, and replaced
+whenever one is killed. Parent and worker exchange one JSON line per file
+over the worker's stdin/stdout.
+
+Failures surface as ``ResumeParseError`` with a ``reason`` (see
+resume_parser.py). With ``PARSER_POOL_SIZE=0``, or where pipes cannot be
+polled (Windows), files are parsed in-process with the page/character caps
+only.
+"""
+import json
+import logging
+import os
+import queue
+import selectors
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from app.services.resume_parser import ParsedText, ResumeParseError, extract_resume_text
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL = 0.05           # seconds between RSS checks while waiting
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+DEFAULT_LIMITS: Dict[str, int] = {
+    "pool_size":            2,
+    "timeout_seconds":      30,
+    "max_rss_mb":           512,
+    "max_pages":            30,
+    "max_chars":            200_000,
+    "max_files_per_worker": 50,
+}
+
+
+def _configured_limits() -> Dict[str, int]:
+    try:
+        from app.core.config import get_settings
+        s = get_settings()
+        return {
+            "pool_size":            s.PARSER_POOL_SIZE,
+            "timeout_seconds":      s.PARSER_TIMEOUT_SECONDS,
+            "max_rss_mb":           s.PARSER_MAX_RSS_MB,
+            "max_pages":            s.PARSER_MAX_PAGES,
+            "max_chars":            s.PARSER_MAX_CHARS,
+            "max_files_per_worker": s.PARSER_MAX_FILES_PER_WORKER,
+        }
+    except Exception:
+        return dict(DEFAULT_LIMITS)
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size from /proc, or None where that is unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _Worker:
+    """One parser subprocess speaking the JSON-line protocol."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "app.services.parser_pool"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        )
+        self.files_parsed = 0
+        self._buffer = b""
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def kill(self):
+        if self.alive():
+            self.proc.kill()
+        self.proc.wait()
+        for pipe in (self.proc.stdin, self.proc.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def request(self, payload: Dict, timeout: float, max_rss: int) -> Dict:
+        """
+        Send one file and wait for its answer. Raises ResumeParseError after
+        killing the worker when a limit is hit or the worker dies.
+        """
+        try:
+            self.proc.stdin.write(json.dumps(payload).encode("utf-8") + b"\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self.kill()
+            raise ResumeParseError("worker_crashed", "parser process unavailable")
+
+        deadline = time.monotonic() + timeout
+        fd = self.proc.stdout.fileno()
+        with selectors.DefaultSelector() as sel:
+            sel.register(fd, selectors.EVENT_READ)
+            while b"\n" not in self._buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.kill()
+                    raise ResumeParseError("timeout", f"exceeded {timeout:g}s")
+                rss = _rss_bytes(self.proc.pid)
+                if rss is not None and rss > max_rss:
+                    self.kill()
+                    raise ResumeParseError("memory_limit", f"RSS {rss // (1 << 20)} MB")
+                if sel.select(min(_POLL_INTERVAL, remaining)):
+                    chunk = os.read(fd, 1 << 16)
+                    if not chunk:
+                        code = self.proc.wait()
+                        self.kill()
+                        raise ResumeParseError("worker_crashed", f"exit code {code}")
+                    self._buffer += chunk
+
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        self.files_parsed += 1
+        return json.loads(line)
+
+
+class ParserPool:
+    """
+    Fixed-size pool of parser subprocesses, safe to share between threads.
+    Workers start lazily on first use.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_LIMITS["pool_size"],
+                 timeout_seconds: float = DEFAULT_LIMITS["timeout_seconds"],
+                 max_rss_mb: int = DEFAULT_LIMITS["max_rss_mb"],
+                 max_pages: int = DEFAULT_LIMITS["max_pages"],
+                 max_chars: int = DEFAULT_LIMITS["max_chars"],
+                 max_files_per_worker: int = DEFAULT_LIMITS["max_files_per_worker"]):
+        self.pool_size = pool_size if os.name == "posix" else 0
+        self.timeout_seconds = timeout_seconds
+        self.max_rss = max_rss_mb * (1 << 20)
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_files_per_worker = max_files_per_worker
+
+        self._idle: "queue.LifoQueue[Optional[_Worker]]" = queue.LifoQueue()
+        for _ in range(self.pool_size):
+            self._idle.put(None)            # a slot; the worker starts on first use
+        self._lock = threading.Lock()
+        self._workers = set()
+
+    def parse(self, file_path: str) -> ParsedText:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError("Resume file not found")
+
+        if self.pool_size <= 0:
+            return extract_resume_text(file_path, self.max_pages, self.max_chars)
+
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.alive():
+                worker = self._spawn()
+            response = worker.request(
+                {"path": os.path.abspath(file_path),
+                 "max_pages": self.max_pages, "max_chars": self.max_chars},
+                self.timeout_seconds, self.max_rss,
+            )
+        except Exception as exc:
+            self._retire(worker)
+            worker = None
+            logger.warning("Parser pool: %s failed (%s)", os.path.basename(file_path), exc)
+            if isinstance(exc, ResumeParseError):
+                raise
+            raise ResumeParseError("worker_crashed", f"{type(exc).__name__}: {exc}")
+        finally:
+            if worker is not None and worker.files_parsed >= self.max_files_per_worker:
+                self._retire(worker)
+                worker = None
+            self._idle.put(worker)
+
+        if not response.get("ok"):
+            if response.get("reason") == "not_found":
+                raise FileNotFoundError("Resume file not found")
+            raise ResumeParseError(response.get("reason", "corrupt"), response.get("detail", ""))
+
+        result = ParsedText(response["text"], response["pages"], response["truncated"],
+                            response["backend"])
+        if result.truncated:
+            logger.info("Parser pool: %s truncated at %d pages / %d chars",
+                        os.path.basename(file_path), result.pages, len(result.text))
+        return result
+
+    def start(self):
+        """Spawn every worker now instead of on first use (worker warm-up)."""
+        slots = []
+        while True:
+            try:
+                slots.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for worker in slots:
+            if worker is None or not worker.alive():
+                worker = self._spawn()
+            self._idle.put(worker)
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker()
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _retire(self, worker: Optional[_Worker]):
+        if worker is None:
+            return
+        try:
+            worker.proc.stdin.close()       # clean EOF; the worker loop exits
+            worker.proc.wait(timeout=1)
+        except Exception:
+            pass
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+
+    def shutdown(self):
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            self._retire(worker)
+
+
+_parser_pool: Optional[ParserPool] = None
+_parser_pool_lock = threading.Lock()
+
+
+def new_parser_pool(**overrides) -> ParserPool:
+    """A separate pool with the configured limits, e.g. ``pool_size=1`` for a batch worker."""
+    return ParserPool(**{**_configured_limits(), **overrides})
+
+
+def get_parser_pool() -> ParserPool:
+    global _parser_pool
+    if _parser_pool is None:
+        with _parser_pool_lock:
+            if _parser_pool is None:
+                _parser_pool = new_parser_pool()
+    return _parser_pool
+
+
+def shutdown_parser_pool():
+    """Stop this process's parser workers, if any were started."""
+    global _parser_pool
+    with _parser_pool_lock:
+        pool, _parser_pool = _parser_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _serve():
+    """Worker loop: one JSON request per stdin line, one JSON answer per stdout line."""
+    # Answers go over the original stdout; anything a library prints goes to stderr.
+    out = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+
+    # Load the configured PDF backend before the first file arrives
+    # (pdfplumber and pdfminer come in with resume_parser itself)
+    from app.services.resume_parser import _configured_pdf_backend
+    if _configured_pdf_backend()[0] == "pdfium":
+        try:
+            import pypdfium2  # noqa: F401
+        except ImportError:
+            pass            # extract_pdf_text falls back to pdfplumber
+
+    for line in sys.stdin.buffer:
+        request = json.loads(line)
+        try:
+            parsed = extract_resume_text(request["path"], request["max_pages"], request["max_chars"])
+            response = {"ok": True, "text": parsed.text, "pages": parsed.pages,
+                        "truncated": parsed.truncated, "backend": parsed.backend}
+        except FileNotFoundError:
+            response = {"ok": False, "reason": "not_found"}
+        except ResumeParseError as exc:
+            response = {"ok": False, "reason": exc.reason, "detail": exc.detail}
+        except Exception as exc:
+            response = {"ok": False, "reason": "corrupt", "detail": f"{type(exc).__name__}: {exc}"}
+        out.write(json.dumps(response).encode("utf-8") + b"\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    _serve()
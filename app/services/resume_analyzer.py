@@ -3,10 +3,25 @@ Resume Analyzer Service - Standalone Evaluation Logic
 =====================================================
 Analyzes resumes independently of job descriptions to provide 
 quality scores, seniority levels, and professional feedback.
+
+Skill checks work on the scorer's detected-skill bitset (``skill_mask``):
+category and role tables are precomputed as masks at import, so depth,
+strengths, improvements and role suitability are mask tests and set
+intersections rather than rescans of the skill list.
+
+Results depend only on the text, so they are cached per process by
+``(file_hash, analysis_version())`` for the batch endpoint.
 """
+import copy
 import re
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from cachetools import LRUCache
+
 from app.services.scorer import (
+    SKILL_UNIVERSE,
+    TAXONOMY_VERSION,
     extract_skills_from_text,
     extract_years_of_experience,
     compute_seniority_score,
@@ -16,8 +31,53 @@ from app.services.scorer import (
     FRAMEWORKS,
     DATABASES,
     TOOLS,
-    PRACTICES
+    PRACTICES,
+    skill_mask,
 )
+from app.services.section_segmenter import Sections, sections_from_profile
+
+# Bump when analyze_standalone's output changes shape or meaning; with the
+# skill taxonomy version it keys cached analyses.
+ANALYZER_VERSION = 1
+
+
+def analysis_version() -> str:
+    return f"analyzer-{ANALYZER_VERSION}/taxonomy-{TAXONOMY_VERSION}"
+
+
+# Role suitability: a role fits when at least 2 of its keywords appear in
+# the text or inside the name of a detected skill ("sql" in "postgresql").
+SUITABILITY_ROLES: Dict[str, Tuple[str, ...]] = {
+    "Backend": ("python", "java", "node", "sql", "api", "server", "django", "flask", "fastapi"),
+    "Frontend": ("react", "angular", "vue", "javascript", "typescript", "css", "html"),
+    "Full-Stack": ("react", "node", "fullstack", "frontend", "backend"),
+    "DevOps / SRE": ("docker", "kubernetes", "aws", "ci/cd", "terraform", "jenkins"),
+    "Data Science / AI": ("python", "pandas", "machine learning", "tensorflow", "pytorch", "nlp"),
+}
+_MIN_ROLE_KEYWORDS = 2
+
+# keyword -> bitset of the skills whose name contains it; role -> keyword set
+_KEYWORD_MASKS: Dict[str, int] = {
+    kw: skill_mask(c for c in SKILL_UNIVERSE if kw in c)
+    for kw in sorted({kw for keywords in SUITABILITY_ROLES.values() for kw in keywords})
+}
+_ROLE_KEYWORD_SETS: Dict[str, FrozenSet[str]] = {
+    role: frozenset(keywords) for role, keywords in SUITABILITY_ROLES.items()
+}
+
+_LANGUAGE_MASK  = skill_mask(PROG_LANGUAGES)
+_FRAMEWORK_MASK = skill_mask(FRAMEWORKS)
+_DATABASE_MASK  = skill_mask(DATABASES)
+_TOOL_MASK      = skill_mask(TOOLS)
+_CLOUD_MASK     = skill_mask(("aws", "azure", "gcp"))
+_CONTAINER_MASK = skill_mask(("docker", "kubernetes"))
+_DEVOPS_MASK    = skill_mask(("git", "ci/cd", "docker"))
+
+
+def detected_skill_mask(skills: List[str]) -> int:
+    """Bitset of extract_skills_from_text labels ("Node.Js" -> node.js)."""
+    return skill_mask(s.lower() for s in skills)
+
 
 class ResumeAnalyzer:
     """
@@ -25,29 +85,37 @@ class ResumeAnalyzer:
     experience relevance, and professional presentation.
     """
 
-    def analyze_standalone(self, resume_text: str) -> Dict:
+    def analyze_standalone(self, resume_text: str, skills: Optional[List[str]] = None,
+                           exp_years: Optional[float] = None,
+                           sections: Optional[Sections] = None) -> Dict:
         """
         Perform a full standalone analysis of a resume.
+        ``skills``, ``exp_years`` and ``sections`` may come from the resume's
+        stored profile (see :func:`analyze_stored_resume`); they are
+        extracted here otherwise.
         """
         # 1. Basic Extractions
         text_norm = normalize_text(resume_text)
-        skills = extract_skills_from_text(resume_text)
-        exp_years = extract_years_of_experience(resume_text)
-        seniority_score = compute_seniority_score(resume_text, exp_years)
+        if skills is None:
+            skills = extract_skills_from_text(resume_text)
+        if exp_years is None:
+            exp_years = extract_years_of_experience(resume_text, sections)
+        seniority_score = compute_seniority_score(resume_text, exp_years, sections)
         
         # 2. Seniority Classification
         seniority_level = self._classify_seniority(exp_years, seniority_score)
         
         # 3. Categorize Skills
         categorized = categorize_skills(skills)
+        skill_bits = detected_skill_mask(skills)
         
         # 4. Calculate Quality Scores
-        skill_depth_score = self._calculate_skill_depth(skills)
+        skill_depth_score = self._calculate_skill_depth(len(skills), skill_bits)
         presentation_score = self._evaluate_presentation(resume_text)
         complexity_score = self._evaluate_project_complexity(text_norm)
         
         # 5. Determine Role Suitability
-        suitability = self._determine_role_suitability(text_norm, skills)
+        suitability = self._determine_role_suitability(text_norm, skill_bits)
         
         # 6. Overall Score (Weighted)
         # 40% Experience/Seniority, 30% Skill Depth, 20% Complexity, 10% Presentation
@@ -60,8 +128,8 @@ class ResumeAnalyzer:
         )
         
         # 7. Generate Insights
-        strengths = self._generate_strengths(exp_years, skills, seniority_level, presentation_score)
-        improvements = self._generate_improvements(exp_years, skills, presentation_score, complexity_score)
+        strengths = self._generate_strengths(exp_years, len(skills), skill_bits, seniority_level, presentation_score)
+        improvements = self._generate_improvements(exp_years, len(skills), skill_bits, presentation_score, complexity_score)
         suggestions = self._generate_suggestions(seniority_level, suitability)
 
         return {
@@ -90,16 +158,16 @@ class ResumeAnalyzer:
         if years >= 1 or score > 20: return "Junior"
         return "Entry-Level"
 
-    def _calculate_skill_depth(self, skills: List[str]) -> int:
+    def _calculate_skill_depth(self, skill_count: int, skill_bits: int) -> int:
         # Depth based on variety and ecosystem completeness
-        if not skills: return 0
-        base = min(len(skills) * 4, 60)
+        if not skill_count: return 0
+        base = min(skill_count * 4, 60)
         
         # Bonus for having complementary skills (e.g., Lang + Framework + DB)
-        has_lang = any(s.lower() in PROG_LANGUAGES for s in skills)
-        has_fw   = any(s.lower() in FRAMEWORKS for s in skills)
-        has_db   = any(s.lower() in DATABASES for s in skills)
-        has_tool = any(s.lower() in TOOLS for s in skills)
+        has_lang = bool(skill_bits & _LANGUAGE_MASK)
+        has_fw   = bool(skill_bits & _FRAMEWORK_MASK)
+        has_db   = bool(skill_bits & _DATABASE_MASK)
+        has_tool = bool(skill_bits & _TOOL_MASK)
         
         bonus = 0
         if has_lang and has_fw: bonus += 15
@@ -130,42 +198,38 @@ class ResumeAnalyzer:
         hits = sum(1 for kw in complexity_keywords if kw in text_norm)
         return min(25 + (hits * 8), 100)
 
-    def _determine_role_suitability(self, text_norm: str, skills: List[str]) -> List[str]:
-        roles = {
-            "Backend": ["python", "java", "node", "sql", "api", "server", "django", "flask", "fastapi"],
-            "Frontend": ["react", "angular", "vue", "javascript", "typescript", "css", "html"],
-            "Full-Stack": ["react", "node", "fullstack", "frontend", "backend"],
-            "DevOps / SRE": ["docker", "kubernetes", "aws", "ci/cd", "terraform", "jenkins"],
-            "Data Science / AI": ["python", "pandas", "machine learning", "tensorflow", "pytorch", "nlp"]
-        }
-        
-        suitability = []
-        for role, keywords in roles.items():
-            score = sum(1 for kw in keywords if kw in text_norm or any(kw in s.lower() for s in skills))
-            if score >= 2:
-                suitability.append(role)
+    def _determine_role_suitability(self, text_norm: str, skill_bits: int) -> List[str]:
+        # Each keyword is checked once (skill mask first, then the text),
+        # then every role is an intersection with the keywords found
+        found = {kw for kw, mask in _KEYWORD_MASKS.items() if skill_bits & mask or kw in text_norm}
+        suitability = [
+            role for role, keywords in _ROLE_KEYWORD_SETS.items()
+            if len(keywords & found) >= _MIN_ROLE_KEYWORDS
+        ]
         
         return suitability[:3] if suitability else ["General Software Engineering"]
 
-    def _generate_strengths(self, years: float, skills: List[str], seniority: str, presentation: int) -> List[str]:
+    def _generate_strengths(self, years: float, skill_count: int, skill_bits: int,
+                            seniority: str, presentation: int) -> List[str]:
         strengths = []
         if years > 5: strengths.append(f"Significant industry experience ({years} years)")
-        if len(skills) > 12: strengths.append("Diverse technical skill set")
+        if skill_count > 12: strengths.append("Diverse technical skill set")
         if "Senior" in seniority or "Lead" in seniority: strengths.append("Demonstrated seniority and potential leadership signals")
         if presentation > 85: strengths.append("Professional and well-structured resume layout")
         
         # Skill specific strengths
-        if any(s.lower() in ["aws", "azure", "gcp"] for s in skills): strengths.append("Cloud platform expertise")
-        if any(s.lower() in ["docker", "kubernetes"] for s in skills): strengths.append("Containerization and orchestration knowledge")
+        if skill_bits & _CLOUD_MASK: strengths.append("Cloud platform expertise")
+        if skill_bits & _CONTAINER_MASK: strengths.append("Containerization and orchestration knowledge")
         
         return strengths[:5]
 
-    def _generate_improvements(self, years: float, skills: List[str], presentation: int, complexity: int) -> List[str]:
+    def _generate_improvements(self, years: float, skill_count: int, skill_bits: int,
+                               presentation: int, complexity: int) -> List[str]:
         improvements = []
         if presentation < 75: improvements.append("Enhance contact information and professional links (LinkedIn/GitHub)")
-        if len(skills) < 8: improvements.append("Broaden technical stack to include more modern frameworks or tools")
+        if skill_count < 8: improvements.append("Broaden technical stack to include more modern frameworks or tools")
         if complexity < 50: improvements.append("Quantify project impact and use more action-oriented architectural terms")
-        if not any(s.lower() in ["git", "ci/cd", "docker"] for s in skills): 
+        if not skill_bits & _DEVOPS_MASK: 
             improvements.append("Include more information about DevOps and version control practices")
         
         # Add dummy improvements if list is short
@@ -188,3 +252,70 @@ class ResumeAnalyzer:
             suggestions.append("Apply for leadership or principal-level positions")
             
         return suggestions
+
+
+def _stored_features(resume_text: str, profile: Optional[Dict]):
+    """``(skills, exp_years, sections)`` from ``profile`` if it is current for this text."""
+    if profile and profile.get("taxonomy_version") == TAXONOMY_VERSION \
+            and profile.get("parsed_text", resume_text) == resume_text:
+        sections = sections_from_profile(profile.get("sections"), normalize_text(resume_text))
+        if sections is not None:
+            return profile.get("skills"), profile.get("years_of_experience"), sections
+    return None, None, None
+
+
+def analyze_stored_resume(resume_text: str, profile: Optional[Dict] = None) -> Dict:
+    """
+    Standalone analysis reusing the features of ``profile`` (a resume's
+    ``profile_data``) when it was built from this text with the current
+    taxonomy. Module-level so it can run in a process pool.
+    """
+    return ResumeAnalyzer().analyze_standalone(resume_text, *_stored_features(resume_text, profile))
+
+
+def analyze_stored_resumes(resume_texts: List[str],
+                           profiles: Optional[List[Optional[Dict]]] = None) -> List[Dict]:
+    """
+    Batch form of :func:`analyze_stored_resume`: many resumes in one call
+    (one process-pool task), results in input order.
+    """
+    analyzer = ResumeAnalyzer()
+    profiles = profiles or [None] * len(resume_texts)
+    return [
+        analyzer.analyze_standalone(text, *_stored_features(text, profile))
+        for text, profile in zip(resume_texts, profiles)
+    ]
+
+
+DEFAULT_ANALYSIS_CACHE_SIZE = 2048
+
+_analysis_cache: Optional[LRUCache] = None
+_analysis_lock = threading.Lock()
+
+
+def _get_analysis_cache() -> LRUCache:
+    global _analysis_cache
+    if _analysis_cache is None:
+        try:
+            from app.core.config import get_settings
+            size = get_settings().ANALYSIS_CACHE_SIZE
+        except Exception:
+            size = DEFAULT_ANALYSIS_CACHE_SIZE
+        _analysis_cache = LRUCache(maxsize=max(size, 1))
+    return _analysis_cache
+
+
+def get_cached_analysis(file_hash: Optional[str]) -> Optional[Dict]:
+    """A copy of the cached analysis of this file, or None."""
+    if not file_hash:
+        return None
+    with _analysis_lock:
+        analysis = _get_analysis_cache().get((file_hash, analysis_version()))
+    return copy.deepcopy(analysis) if analysis is not None else None
+
+
+def cache_analysis(file_hash: Optional[str], analysis: Dict):
+    if not file_hash:
+        return
+    with _analysis_lock:
+        _get_analysis_cache()[(file_hash, analysis_version())] = copy.deepcopy(analysis)
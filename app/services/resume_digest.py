@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Resume Digest for LLM Prompts
+=============================
+The chat prompts used to embed ``resume_text[:4000]``. On a long CV that
+spends the budget on the header and the skills dump, and the experience
+section, which most questions are about, gets cut off.
+
+A digest is assembled instead, within a token budget:
+
+  1. extracted features: years of experience and categorised skills
+     (a few tokens that replace the raw skills section)
+  2. section text from the segmenter's spans. Each section is capped at
+     its share of the remaining budget and experience also gets whatever
+     the others leave unused:
+
+       experience 55%+  projects 15%  summary 8%  education 8%
+       header 7%        certifications 7%
+
+     Over budget, experience keeps every sentence with a date range (the
+     role lines: title, company, dates) and fills the rest with the other
+     sentences in document order, so older roles lose their bullets
+     rather than disappear.
+
+     ``skills`` (covered by 1.) and ``other`` (hobbies, declaration) are
+     left out. A resume without recognisable headings is cut as one block.
+
+Tokens are estimated at 4 characters each (the usual rule of thumb for
+English with BPE tokenisers); the estimate only has to be consistent.
+
+The digest is computed once per chat session (see chat_sessions) and
+reused for every turn.
+"""
+import re
+from typing import Dict, List
+
+from app.services.experience_extractor import DATE_RANGE_NAMED, DATE_RANGE_NUMERIC
+from app.services.scorer import (
+    categorize_skills,
+    extract_skills_from_text,
+    extract_years_of_experience,
+    normalize_text,
+)
+from app.services.section_segmenter import has_headings, section_text, segment_sections
+from app.utilities.txt_clean import clean_text
+
+CHARS_PER_TOKEN = 4
+
+# Shares sum to 1; experience comes first and takes the remainder
+_SECTION_SHARES = (
+    ("experience", 0.55),
+    ("projects", 0.15),
+    ("summary", 0.08),
+    ("education", 0.08),
+    ("header", 0.07),
+    ("certifications", 0.07),
+)
+_SECTION_LABELS = {
+    "header": "CANDIDATE",
+    "summary": "SUMMARY",
+    "experience": "EXPERIENCE",
+    "projects": "PROJECTS",
+    "education": "EDUCATION",
+    "certifications": "CERTIFICATIONS",
+}
+_SENTENCE_END = re.compile(r"[.;!?](?=\s)")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def fit_to_tokens(text: str, tokens: int) -> str:
+    """``text`` cut to ``tokens``, at the last sentence end (or word) that fits."""
+    text = text.strip()
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    if limit <= 0:
+        return ""
+    cut = text[:limit - 1]
+    sentence_ends = [m.end() for m in _SENTENCE_END.finditer(cut)]
+    if sentence_ends and sentence_ends[-1] > limit // 2:
+        return cut[:sentence_ends[-1]] + " …"
+    space = cut.rfind(" ")
+    return (cut[:space] if space > limit // 2 else cut).rstrip() + " …"
+
+
+def _split_sentences(text: str) -> List[str]:
+    sentences, start = [], 0
+    for m in _SENTENCE_END.finditer(text):
+        sentences.append(text[start:m.end()].strip())
+        start = m.end()
+    sentences.append(text[start:].strip())
+    return [s for s in sentences if s]
+
+
+def fit_experience(text: str, tokens: int) -> str:
+    """Experience cut to ``tokens``: role lines first, then bullets in order."""
+    text = text.strip()
+    if estimate_tokens(text) <= tokens:
+        return text
+    sentences = _split_sentences(text)
+    anchors = [bool(DATE_RANGE_NAMED.search(s) or DATE_RANGE_NUMERIC.search(s)) for s in sentences]
+    keep = [False] * len(sentences)
+    used = 0
+    for pass_anchors in (True, False):
+        for i, sentence in enumerate(sentences):
+            if keep[i] or anchors[i] != pass_anchors:
+                continue
+            cost = estimate_tokens(sentence) + 1
+            if used + cost > tokens:
+                if pass_anchors:
+                    continue
+                break
+            keep[i] = True
+            used += cost
+    if not any(keep):
+        return fit_to_tokens(text, tokens)
+    out, gap = [], False
+    for sentence, kept in zip(sentences, keep):
+        if kept:
+            out.extend(["…", sentence] if gap else [sentence])
+        gap = not kept
+    return " ".join(out + ["…"] if gap else out)
+
+
+def _features(text: str, sections) -> str:
+    years = extract_years_of_experience(text, sections)
+    lines = [f"YEARS OF EXPERIENCE: {years}"]
+    categorized = categorize_skills(extract_skills_from_text(text))
+    skills = "; ".join(
+        f"{category}: {', '.join(names)}" for category, names in categorized.items() if names
+    )
+    if skills:
+        lines.append(f"SKILLS: {skills}")
+    return "\n".join(lines)
+
+
+def build_resume_digest(text: str, token_budget: int = 800) -> str:
+    """Structured resume context of at most about ``token_budget`` tokens."""
+    # Parsed text is already clean (a no-op then). On clean text
+    # normalisation only lowercases, so the spans index it as well and the
+    # digest keeps the original case.
+    text = clean_text(text)
+    tn = normalize_text(text)
+    sections = segment_sections(tn)
+    source = text if len(text) == len(tn) else tn
+
+    features = fit_to_tokens(_features(text, sections), token_budget // 3)
+    remaining = token_budget - estimate_tokens(features)
+    if not has_headings(sections):
+        return features + "\n\nRESUME:\n" + fit_to_tokens(source, remaining - 3)
+
+    blocks: Dict[str, str] = {}
+    for name, share in _SECTION_SHARES[1:]:
+        body = section_text(source, sections, [name])
+        # Label and blank line cost a few tokens too
+        blocks[name] = fit_to_tokens(body, int(remaining * share) - 4)
+    unused = remaining - sum(estimate_tokens(b) + 4 for b in blocks.values() if b)
+    blocks["experience"] = fit_experience(section_text(source, sections, ["experience"]), unused - 4)
+
+    return "\n\n".join([features] + [
+        f"{_SECTION_LABELS[name]}:\n{blocks[name]}" for name, _ in _SECTION_SHARES if blocks[name]
+    ])
+
+
+def format_history(history: List[Dict[str, str]], token_budget: int = 400, turns: int = 5) -> str:
+    """
+    The last ``turns`` exchanges as "Q:/A:" lines, newest kept first when
+    over budget; older answers are cut before newer ones.
+    """
+    if not history:
+        return "First message."
+    lines: List[str] = []
+    remaining = token_budget
+    for turn in reversed(history[-turns:]):
+        question = fit_to_tokens(turn.get("user", ""), max(remaining // 3, 0))
+        answer = fit_to_tokens(turn.get("ai", ""), max(remaining - estimate_tokens(question) - 4, 0) // 2)
+        entry = f"Q: {question}\nA: {answer}"
+        if estimate_tokens(entry) > remaining or not question:
+            break
+        lines.append(entry)
+        remaining -= estimate_tokens(entry) + 1
+    return "\n".join(reversed(lines)) or "First message."
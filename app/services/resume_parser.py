@@ -1,54 +1,348 @@
+import logging
 import os
+import re
+import threading
+import zipfile
+from contextlib import closing
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+from xml.etree.ElementTree import iterparse
+
 import pdfplumber
-from docx import Document
+from cachetools import LRUCache
 
 from app.utilities.txt_clean import clean_text
 
+logger = logging.getLogger(__name__)
 
-def parse_pdf(file_path: str) -> str:
+
+class ParsedText(NamedTuple):
+    text:      str      # cleaned text
+    pages:     int      # pages read (PDF) / 0 for DOCX
+    truncated: bool     # page or character cap was hit
+    backend:   str = "docx"     # PDF backend that produced the text
+
+
+class ResumeParseError(ValueError):
     """
-    Extract text from PDF resume
+    Structured parse failure. ``reason`` is one of:
+
+      unsupported_format  not a .pdf / .docx
+      corrupt             the library could not open or read the file
+      timeout             wall-clock limit exceeded (worker killed)
+      memory_limit        RSS limit exceeded (worker killed)
+      worker_crashed      the parser process died without answering
     """
-    text = ""
 
+    def __init__(self, reason: str, detail: str = ""):
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+        self.detail = detail
+
+
+# ---------------------------------------------------------------------------
+# PDF backends: each yields raw page text, one page at a time, so the page
+# and character caps stop extraction early whichever backend runs.
+# ---------------------------------------------------------------------------
+def _pdfplumber_pages(file_path: str) -> Iterator[str]:
+    """Full layout analysis (reading order, column handling). Slowest."""
     with pdfplumber.open(file_path) as pdf:
         for page in pdf.pages:
             page_text = page.extract_text()
+            page.close()            # drop the page's cached layout objects
+            yield page_text or ""
+
+
+def _pdfium_pages(file_path: str) -> Iterator[str]:
+    """PDFium's native text extraction, no Python-side layout work."""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def _pdfminer_pages(file_path: str) -> Iterator[str]:
+    """pdfminer with layout analysis off: characters in content-stream order."""
+    from io import StringIO
+
+    from pdfminer.converter import TextConverter
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    out = StringIO()
+    rsrcmgr = PDFResourceManager()
+    with open(file_path, "rb") as fp, TextConverter(rsrcmgr, out, laparams=None) as device:
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for page in PDFPage.get_pages(fp):
+            interpreter.process_page(page)
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+
+
+PDF_BACKENDS: Dict[str, Callable[[str], Iterator[str]]] = {
+    "pdfplumber": _pdfplumber_pages,
+    "pdfium":     _pdfium_pages,
+    "pdfminer":   _pdfminer_pages,
+}
+DEFAULT_PDF_BACKEND = "pdfplumber"
+FALLBACK_MIN_CHARS_PER_PAGE = 200
+
+
+def _configured_pdf_backend():
+    try:
+        from app.core.config import get_settings
+        s = get_settings()
+        return s.PDF_BACKEND, s.PDF_FALLBACK_MIN_CHARS_PER_PAGE
+    except Exception:
+        return DEFAULT_PDF_BACKEND, FALLBACK_MIN_CHARS_PER_PAGE
+
+
+def _read_pdf(file_path: str, backend: str, max_pages: Optional[int],
+              max_chars: Optional[int]) -> ParsedText:
+    text = ""
+    pages = 0
+    truncated = False
+
+    with closing(PDF_BACKENDS[backend](file_path)) as page_texts:
+        for page_text in page_texts:
+            if max_pages is not None and pages >= max_pages:
+                truncated = True
+                break
+            pages += 1
             if page_text:
                 text += page_text + " "
+            if max_chars is not None and len(text) > max_chars:
+                text = text[:max_chars]
+                truncated = True
+                break
 
-    return clean_text(text)
+    return ParsedText(clean_text(text), pages, truncated, backend)
+
+
+def extract_pdf_text(file_path: str, max_pages: Optional[int] = None,
+                     max_chars: Optional[int] = None,
+                     backend: Optional[str] = None) -> ParsedText:
+    """
+    Extract text from PDF resume, reading at most ``max_pages`` pages and
+    stopping once ``max_chars`` characters have been collected.
+
+    ``backend`` defaults to the PDF_BACKEND setting. A fast backend that
+    fails, or returns fewer than PDF_FALLBACK_MIN_CHARS_PER_PAGE characters
+    per page read, falls back to pdfplumber.
+    """
+    configured, min_chars_per_page = _configured_pdf_backend()
+    backend = backend or configured
+    if backend not in PDF_BACKENDS:
+        logger.warning("Unknown PDF backend %r, using %s", backend, DEFAULT_PDF_BACKEND)
+        backend = DEFAULT_PDF_BACKEND
+
+    if backend != DEFAULT_PDF_BACKEND:
+        try:
+            parsed = _read_pdf(file_path, backend, max_pages, max_chars)
+            if len(parsed.text) >= min_chars_per_page * max(parsed.pages, 1):
+                return parsed
+            logger.info("PDF backend %s returned %d chars for %d pages of %s; falling back",
+                        backend, len(parsed.text), parsed.pages, os.path.basename(file_path))
+        except Exception as exc:
+            logger.info("PDF backend %s failed on %s (%s); falling back",
+                        backend, os.path.basename(file_path), exc)
+
+    return _read_pdf(file_path, DEFAULT_PDF_BACKEND, max_pages, max_chars)
+
+
+# ---------------------------------------------------------------------------
+# DOCX: stream the WordprocessingML parts straight out of the zip
+# ---------------------------------------------------------------------------
+_W   = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC  = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+_DOCX_TEXT   = _W + "t"
+_DOCX_SPACES = {_W + "tab", _W + "br", _W + "cr", _W + "tc"}     # -> " "
+_DOCX_BLOCKS = {_W + "p", _W + "tbl", _W + "sdt"}                 # cleared when done
+_DOCX_BODY   = {_W + "body", _W + "hdr", _W + "ftr"}
+# Text boxes are stored twice (DrawingML + a VML fallback); read one copy.
+_DOCX_SKIP   = _MC + "Fallback"
+
+_HEADER_PART = re.compile(r"word/header\d*\.xml$")
+_FOOTER_PART = re.compile(r"word/footer\d*\.xml$")
+
+
+def _docx_parts(names: List[str]) -> List[str]:
+    """Reading order: headers (name and contact details live there), body, footers."""
+    def numbered(pattern):
+        return sorted((n for n in names if pattern.match(n)),
+                      key=lambda n: int(re.sub(r"\D", "", n) or 0))
+    return numbered(_HEADER_PART) + ["word/document.xml"] + numbered(_FOOTER_PART)
+
+
+def _docx_part_text(stream) -> Iterator[str]:
+    """
+    Yield text fragments of one part in document order: runs, a space per
+    tab/break/table cell, a newline per paragraph. Finished paragraphs and
+    tables are cleared as the parser moves on, so memory stays bounded by
+    the largest single block rather than the document.
+    """
+    skip = 0
+    body = None
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == _DOCX_SKIP:
+                skip += 1
+            elif tag in _DOCX_BODY:
+                body = elem
+            continue
+
+        if tag == _DOCX_SKIP:
+            skip -= 1
+        elif skip:
+            pass
+        elif tag == _DOCX_TEXT:
+            if elem.text:
+                yield elem.text
+        elif tag in _DOCX_SPACES:
+            yield " "
+        elif tag == _W + "p":
+            yield "\n"
+
+        if tag in _DOCX_BLOCKS:
+            elem.clear()
+            if body is not None and len(body) and body[-1] is elem:
+                body.remove(elem)
+
+
+def extract_docx_text(file_path: str, max_chars: Optional[int] = None) -> ParsedText:
+    """
+    Extract text from DOCX resume: body paragraphs, tables, text boxes,
+    headers and footers, streamed from the zip in reading order.
+    """
+    fragments: List[str] = []
+    size = 0
+    truncated = False
+
+    with zipfile.ZipFile(file_path) as zf:
+        names = zf.namelist()
+        for part in _docx_parts(names):
+            with zf.open(part) as stream:
+                for fragment in _docx_part_text(stream):
+                    fragments.append(fragment)
+                    size += len(fragment)
+                    if max_chars is not None and size > max_chars:
+                        truncated = True
+                        break
+            if truncated:
+                break
+
+    text = "".join(fragments)
+    if truncated:
+        text = text[:max_chars]
+    return ParsedText(clean_text(text), 0, truncated)
+
+
+def extract_resume_text(file_path: str, max_pages: Optional[int] = None,
+                        max_chars: Optional[int] = None) -> ParsedText:
+    """
+    In-process extraction with caps. This is what the parser pool workers
+    run; application code should call :func:`parse_resume`.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError("Resume file not found")
+
+    ext = file_path.split(".")[-1].lower()
+
+    if ext not in ("pdf", "docx"):
+        raise ResumeParseError("unsupported_format", f".{ext}")
+
+    try:
+        if ext == "pdf":
+            return extract_pdf_text(file_path, max_pages, max_chars)
+        return extract_docx_text(file_path, max_chars)
+    except MemoryError:
+        raise ResumeParseError("memory_limit", os.path.basename(file_path))
+    except Exception as exc:
+        raise ResumeParseError("corrupt", f"{type(exc).__name__}: {exc}")
+
+
+def parse_pdf(file_path: str) -> str:
+    """
+    Extract text from PDF resume
+    """
+    return extract_pdf_text(file_path).text
 
 
 def parse_docx(file_path: str) -> str:
     """
     Extract text from DOCX resume
     """
-    doc = Document(file_path)
-    text = " ".join([para.text for para in doc.paragraphs])
-    return clean_text(text)
+    return extract_docx_text(file_path).text
 
 
 def parse_resume(file_path: str) -> str:
     """
     Main resume parsing function
-    Detects file type and parses accordingly
+    Detects file type and parses it in the isolated parser pool
+    (time, memory, page and character limits; see parser_pool.py).
+
+    Raises FileNotFoundError, or ResumeParseError (a ValueError) with a
+    structured ``reason``.
     """
+    from app.services.parser_pool import get_parser_pool
 
-    if not os.path.exists(file_path):
-        raise FileNotFoundError("Resume file not found")
+    return get_parser_pool().parse(file_path).text
+
+
+DEFAULT_PARSED_TEXT_CACHE_CHARS = 20_000_000
+
+_parsed_text_cache: Optional[LRUCache] = None
+_parsed_text_lock = threading.Lock()
 
-    ext = file_path.split(".")[-1].lower()
 
-    if ext == "pdf":
-        return parse_pdf(file_path)
+def _get_parsed_text_cache() -> LRUCache:
+    global _parsed_text_cache
+    if _parsed_text_cache is None:
+        try:
+            from app.core.config import get_settings
+            max_chars = get_settings().PARSED_TEXT_CACHE_CHARS
+        except Exception:
+            max_chars = DEFAULT_PARSED_TEXT_CACHE_CHARS
+        _parsed_text_cache = LRUCache(maxsize=max(max_chars, 1), getsizeof=len)
+    return _parsed_text_cache
+
+
+def parse_resume_cached(file_path: str) -> str:
+    """
+    :func:`parse_resume` memoised per process, keyed on the file's path,
+    mtime and size. Ranking re-reads the same applicants every time a job is
+    re-ranked; a warm worker then skips the parser pool round trip. The
+    cache is bounded by total characters (PARSED_TEXT_CACHE_CHARS).
+    """
+    st = os.stat(file_path)         # FileNotFoundError, like parse_resume
+    key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
 
-    elif ext == "docx":
-        return parse_docx(file_path)
+    with _parsed_text_lock:
+        cache = _get_parsed_text_cache()
+        text = cache.get(key)
+    if text is not None:
+        return text
 
-    else:
-        raise ValueError("Unsupported resume format")
+    text = parse_resume(file_path)
+    with _parsed_text_lock:
+        try:
+            cache[key] = text
+        except ValueError:
+            pass                    # larger than the whole cache
+    return text
 
 if __name__ == "__main__":
     text = parse_resume("uploads/sample.pdf")
-    print(text[:1000])
\ No newline at end of file
+    print(text[:1000])
@@ -23,7 +23,13 @@ Phases implemented:
 """
 import re
 from datetime import datetime
-from typing import Dict, List, Set, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.services.experience_extractor import MONTH_MAP, timeline_years
+from app.services.section_segmenter import Sections, section_text, segment_sections
+from app.services.skill_taxonomy import alias_pattern, load_taxonomy
+from app.utilities.txt_clean import normalize_for_matching
 
 # ---------------------------------------------------------------------------
 # Runtime constants
@@ -34,276 +40,58 @@ CURRENT_MONTH = _NOW.month
 MAX_EXP_YEARS = 45
 
 
-MONTH_MAP: Dict[str, int] = {
-    'jan': 1,  'january': 1,   'feb': 2,  'february': 2,
-    'mar': 3,  'march': 3,     'apr': 4,  'april': 4,
-    'may': 5,  'jun': 6,       'june': 6, 'jul': 7,
-    'july': 7, 'aug': 8,       'august': 8,
-    'sep': 9,  'sept': 9,      'september': 9,
-    'oct': 10, 'october': 10,  'nov': 11, 'november': 11,
-    'dec': 12, 'december': 12,
-}
-
-
 # ===========================================================================
-# PHASE 3 & 4 -- Synonym dictionary  (canonical -> [aliases])
+# PHASE 3, 4 & 5 -- Skill taxonomy
+# Synonyms, tech families, category sets, ecosystem chains, role keywords and
+# seniority signals live in app/data/skill_taxonomy.json; the derived lookup
+# tables are loaded from its compiled artifact (see skill_taxonomy.py).
 # ===========================================================================
-SKILL_SYNONYMS: Dict[str, List[str]] = {
-    # Languages
-    "python":        ["python", "py", "python3", "python 3", "python2", "cpython"],
-    "javascript":    ["javascript", "js", "java script", "ecmascript",
-                      "es6", "es6+", "es2015", "es2016", "es2017", "es2018",
-                      "es2019", "es2020", "es2021", "vanillajs", "vanilla js"],
-    "typescript":    ["typescript", "ts"],
-    "java":          ["java", "java 8", "java 11", "java 17", "java se",
-                      "java ee", "core java"],
-    "c++":           ["c++", "cpp", "c plus plus"],
-    "c#":            ["c#", "csharp", "c sharp", ".net", "dotnet"],
-    "go":            ["go", "golang"],
-    "rust":          ["rust"],
-    "ruby":          ["ruby"],
-    "php":           ["php"],
-    "swift":         ["swift"],
-    "kotlin":        ["kotlin"],
-    "scala":         ["scala"],
-    "bash":          ["bash", "shell", "shell script", "bash script", "sh",
-                      "unix shell", "scripting"],
-    "sql":           ["sql", "structured query language", "plsql", "pl/sql",
-                      "tsql", "t-sql", "hql", "ansi sql"],
-    "r":             ["r language", "r programming", "rstudio", "r studio"],
-    "dart":          ["dart"],
-    # Frontend
-    "react":         ["react", "reactjs", "react.js", "react js",
-                      "react native", "react hooks"],
-    "angular":       ["angular", "angularjs", "angular.js", "angular 2",
-                      "angular2", "angular 14", "angular 15", "angular 16"],
-    "vue":           ["vue", "vuejs", "vue.js", "vue js",
-                      "vue 3", "vue2", "vue3"],
-    "nextjs":        ["nextjs", "next.js", "next js", "next"],
-    "html":          ["html", "html5", "xhtml", "html/css"],
-    "css":           ["css", "css3", "scss", "sass", "less",
-                      "styled components", "css-in-js"],
-    "tailwind":      ["tailwind", "tailwindcss", "tailwind css"],
-    "svelte":        ["svelte"],
-    "redux":         ["redux", "redux toolkit", "zustand", "mobx", "recoil"],
-    # Backend frameworks
-    "django":        ["django", "django rest framework", "drf", "django rf",
-                      "django orm", "django views", "django framework"],
-    "flask":         ["flask", "flask api", "flask rest"],
-    "fastapi":       ["fastapi", "fast api", "fast-api", "fastapi framework"],
-    "spring":        ["spring", "spring boot", "springboot",
-                      "spring framework", "spring mvc", "spring cloud",
-                      "spring data"],
-    "express":       ["express", "express.js", "expressjs",
-                      "express framework"],
-    "rails":         ["rails", "ruby on rails", "ror"],
-    "asp.net":       ["asp.net", "asp.net core", "aspnet", ".net core",
-                      "dotnet", "asp .net"],
-    "laravel":       ["laravel"],
-    "node.js":       ["node.js", "node", "nodejs", "node js"],
-    "gin":           ["gin", "gin framework", "gin-gonic"],
-    "nestjs":        ["nestjs", "nest.js", "nest js"],
-    # Databases
-    "postgresql":    ["postgresql", "postgres", "postgre", "pg", "psql",
-                      "postgressql", "postgresdb", "postgresql database"],
-    "mysql":         ["mysql", "my sql", "mariadb", "maria db"],
-    "mongodb":       ["mongodb", "mongo", "mongo db", "mongoose"],
-    "sqlite":        ["sqlite", "sqlite3"],
-    "redis":         ["redis", "redis cache", "redis db"],
-    "elasticsearch": ["elasticsearch", "elastic search", "elastic",
-                      "opensearch", "elk", "elk stack"],
-    "cassandra":     ["cassandra", "apache cassandra"],
-    "dynamodb":      ["dynamodb", "dynamo db", "amazon dynamodb"],
-    "firebase":      ["firebase", "firestore", "firebase realtime"],
-    "oracle":        ["oracle", "oracle db", "oracle database"],
-    "mssql":         ["mssql", "sql server", "microsoft sql server", "ms sql"],
-    "neo4j":         ["neo4j", "graph database"],
-    # Cloud / DevOps
-    "aws":           ["aws", "amazon web services", "ec2", "s3", "lambda",
-                      "amazon aws", "aws cloud", "elastic beanstalk",
-                      "ecs", "eks", "cloudfront", "cloudwatch",
-                      "rds", "sqs", "sns"],
-    "azure":         ["azure", "microsoft azure", "ms azure",
-                      "azure devops", "azure functions", "azure blob"],
-    "gcp":           ["gcp", "google cloud", "google cloud platform",
-                      "google compute engine", "bigquery", "cloud run"],
-    "docker":        ["docker", "dockerfile", "docker-compose",
-                      "docker compose", "containerization",
-                      "containers", "docker swarm"],
-    "kubernetes":    ["kubernetes", "k8s", "kube", "kubectl",
-                      "helm", "openshift"],
-    "jenkins":       ["jenkins", "jenkins ci", "jenkins pipeline"],
-    "terraform":     ["terraform", "infrastructure as code", "iac"],
-    "ansible":       ["ansible", "ansible playbook"],
-    "git":           ["git", "version control", "git flow", "gitflow"],
-    "github":        ["github", "github actions", "github workflow"],
-    "gitlab":        ["gitlab", "gitlab ci", "gitlab cd", "gitlab pipeline"],
-    "bitbucket":     ["bitbucket", "bitbucket pipelines"],
-    "linux":         ["linux", "unix", "ubuntu", "centos", "debian",
-                      "rhel", "fedora", "linux administration",
-                      "linux server"],
-    "nginx":         ["nginx", "nginx server"],
-    "kafka":         ["kafka", "apache kafka", "event streaming",
-                      "event-driven"],
-    "rabbitmq":      ["rabbitmq", "rabbit mq", "amqp",
-                      "message broker", "mq"],
-    "celery":        ["celery", "celery task", "celery worker"],
-    # AI / ML
-    "tensorflow":    ["tensorflow", "tf", "keras", "tensorflow keras"],
-    "pytorch":       ["pytorch", "torch", "pytorch lightning"],
-    "scikit-learn":  ["scikit-learn", "sklearn", "scikit learn"],
-    "langchain":     ["langchain", "lang chain", "langchain framework"],
-    "openai":        ["openai", "gpt", "chatgpt", "gpt-4", "gpt-3",
-                      "llm", "large language model"],
-    "machine learning": ["machine learning", "ml", "supervised learning",
-                         "unsupervised learning", "deep learning", "dl",
-                         "neural network", "neural networks", "nlp",
-                         "computer vision", "cv", "artificial intelligence",
-                         "ai"],
-    "pandas":        ["pandas", "pd"],
-    "numpy":         ["numpy", "np"],
-    # Practices / Architecture
-    "rest api":      ["rest", "rest api", "restful", "restful api",
-                      "rest api development", "rest services", "http api",
-                      "backend api", "web api", "api development",
-                      "api design", "api integration", "api gateway"],
-    "graphql":       ["graphql", "graph ql", "apollo", "apollo graphql"],
-    "microservices": ["microservices", "micro services",
-                      "microservice architecture", "distributed services",
-                      "soa", "service mesh", "service-oriented"],
-    "ci/cd":         ["ci/cd", "cicd", "ci cd", "continuous integration",
-                      "continuous delivery", "continuous deployment",
-                      "devops pipeline", "deployment pipeline",
-                      "github actions", "circleci", "travis ci"],
-    "agile":         ["agile", "scrum", "sprint", "kanban",
-                      "agile methodology"],
-    "unit testing":  ["unit testing", "unit test", "unit tests", "tdd",
-                      "test driven development", "test driven", "pytest",
-                      "junit", "jest", "mocha", "jasmine", "cypress",
-                      "integration testing", "test automation", "qa",
-                      "automated testing"],
-    "system design": ["system design", "software architecture",
-                      "distributed systems", "hld", "lld",
-                      "low level design", "high level design",
-                      "scalable systems", "system architecture",
-                      "distributed system design"],
-    # Tools
-    "tableau":       ["tableau", "tableau desktop"],
-    "powerbi":       ["power bi", "powerbi", "power bi desktop"],
-    "jira":          ["jira", "atlassian jira", "atlassian"],
-    "figma":         ["figma", "ui design", "ux design"],
-    "websocket":     ["websocket", "websockets", "socket.io", "real-time"],
-}
+_TAXONOMY = load_taxonomy()
 
-_ALIAS_TO_CANONICAL: Dict[str, str] = {}
-for _c, _aliases in SKILL_SYNONYMS.items():
-    for _a in _aliases:
-        _ALIAS_TO_CANONICAL[_a.lower()] = _c
+TAXONOMY_VERSION: str = _TAXONOMY["version"]
 
+SKILL_SYNONYMS: Dict[str, List[str]]   = _TAXONOMY["synonyms"]
+TECH_FAMILIES: Dict[str, List[str]]    = _TAXONOMY["tech_families"]
+ECOSYSTEM_CHAINS: Dict[str, List[str]] = _TAXONOMY["ecosystem_chains"]
 
-# ===========================================================================
-# PHASE 3 -- Technology Family Groups
-# (semantic equivalences between similar tools in same domain)
-# ===========================================================================
-TECH_FAMILIES: Dict[str, List[str]] = {
-    # Having any member gives 50% partial credit for any other member
-    "message_queue":    ["kafka", "rabbitmq", "celery", "redis",
-                         "aws sqs", "azure service bus", "pubsub"],
-    "version_control":  ["git", "github", "gitlab", "bitbucket",
-                         "svn", "mercurial"],
-    "rdbms":            ["postgresql", "mysql", "mssql", "oracle",
-                         "mariadb", "sqlite", "aurora"],
-    "nosql_doc":        ["mongodb", "dynamodb", "couchdb", "firebase",
-                         "cosmosdb"],
-    "cache_store":      ["redis", "memcached", "elasticsearch"],
-    "cloud_platform":   ["aws", "azure", "gcp", "heroku",
-                         "digitalocean", "linode"],
-    "container":        ["docker", "podman", "lxc", "containerd"],
-    "orchestration":    ["kubernetes", "openshift", "docker swarm",
-                         "nomad"],
-    "ci_cd_tool":       ["jenkins", "github", "gitlab", "travis",
-                         "circleci", "teamcity", "bamboo"],
-    "observability":    ["prometheus", "grafana", "elk",
-                         "splunk", "datadog", "newrelic"],
-    "frontend_fw":      ["react", "angular", "vue", "svelte",
-                         "nextjs"],
-    "backend_lang":     ["python", "java", "go", "node.js",
-                         "ruby", "php", "c#"],
-    "api_style":        ["rest api", "graphql", "grpc",
-                         "websocket"],
-    "infra_as_code":    ["terraform", "ansible", "pulumi",
-                         "cloudformation"],
-    "ml_framework":     ["tensorflow", "pytorch", "scikit-learn",
-                         "keras", "xgboost"],
-}
+PROG_LANGUAGES = _TAXONOMY["categories"]["languages"]
+FRAMEWORKS     = _TAXONOMY["categories"]["frameworks"]
+DATABASES      = _TAXONOMY["categories"]["databases"]
+TOOLS          = _TAXONOMY["categories"]["tools"]
+PRACTICES      = _TAXONOMY["categories"]["practices"]
+ALL_CANONICAL  = _TAXONOMY["all_canonical"]
 
-# Build reverse: canonical -> family name
-_SKILL_TO_FAMILY: Dict[str, str] = {}
-for _fam, _members in TECH_FAMILIES.items():
-    for _m in _members:
-        _mc = _ALIAS_TO_CANONICAL.get(_m.lower(), _m.lower())
-        _SKILL_TO_FAMILY[_mc] = _fam
+_ALIAS_TO_CANONICAL: Dict[str, str] = _TAXONOMY["alias_to_canonical"]
+_SKILL_TO_FAMILY: Dict[str, str]    = _TAXONOMY["skill_to_family"]
 
+# canonical -> the other (canonicalised) members of its technology family
+FAMILY_PEERS: Dict[str, FrozenSet[str]] = _TAXONOMY["family_peers"]
 
-# ===========================================================================
-# Skill category sets
-# ===========================================================================
-PROG_LANGUAGES = {
-    "python", "javascript", "typescript", "java", "c++", "c#", "go", "rust",
-    "ruby", "php", "swift", "kotlin", "scala", "bash", "sql", "r", "dart",
-}
-FRAMEWORKS = {
-    "react", "angular", "vue", "nextjs", "django", "flask", "fastapi",
-    "spring", "express", "rails", "asp.net", "laravel", "node.js", "svelte",
-    "redux", "tensorflow", "pytorch", "scikit-learn", "langchain", "openai",
-    "pandas", "numpy", "celery", "websocket", "gin", "nestjs",
-}
-DATABASES = {
-    "postgresql", "mysql", "mongodb", "sqlite", "redis", "elasticsearch",
-    "cassandra", "dynamodb", "firebase", "oracle", "mssql", "neo4j",
-}
-TOOLS = {
-    "aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "terraform",
-    "ansible", "git", "github", "gitlab", "bitbucket", "linux", "nginx",
-    "kafka", "rabbitmq", "tableau", "powerbi", "jira", "figma", "graphql",
-}
-PRACTICES = {
-    "rest api", "microservices", "ci/cd", "agile", "unit testing",
-    "system design", "machine learning",
-}
-ALL_CANONICAL = PROG_LANGUAGES | FRAMEWORKS | DATABASES | TOOLS | PRACTICES
+# Every canonical skill any table can refer to, with a stable bit position
+SKILL_UNIVERSE: Tuple[str, ...] = _TAXONOMY["skill_universe"]
+SKILL_INDEX: Dict[str, int]     = _TAXONOMY["skill_index"]
 
+_FAMILY_MASK: Dict[str, int]    = _TAXONOMY["family_mask"]
+# Transitive closure of ECOSYSTEM_CHAINS (Kafka -> Microservices -> REST API)
+_INFERENCE_MASK: Dict[str, int] = _TAXONOMY["inference_mask"]
+
+ROLE_KEYWORDS: Dict[str, List[str]] = _TAXONOMY["role_keywords"]
+SENIORITY_SIGNALS: List[str]        = _TAXONOMY["seniority_signals"]
+
+
+def skill_mask(canonicals) -> int:
+    """Bitset over SKILL_INDEX; names outside the universe are ignored."""
+    mask = 0
+    for c in canonicals:
+        i = SKILL_INDEX.get(c)
+        if i is not None:
+            mask |= 1 << i
+    return mask
+
+
+def skills_in_mask(mask: int) -> Set[str]:
+    return {c for c, i in SKILL_INDEX.items() if mask >> i & 1}
 
-# ===========================================================================
-# PHASE 5 -- Ecosystem Inference Chains
-# ===========================================================================
-ECOSYSTEM_CHAINS: Dict[str, List[str]] = {
-    "django":        ["python", "rest api"],
-    "flask":         ["python", "rest api"],
-    "fastapi":       ["python", "rest api"],
-    "celery":        ["python"],
-    "pandas":        ["python"],
-    "numpy":         ["python"],
-    "scikit-learn":  ["python", "machine learning"],
-    "tensorflow":    ["python", "machine learning"],
-    "pytorch":       ["python", "machine learning"],
-    "langchain":     ["python"],
-    "spring":        ["java", "rest api"],
-    "express":       ["node.js", "javascript", "rest api"],
-    "nestjs":        ["node.js", "typescript", "rest api"],
-    "nextjs":        ["react", "javascript"],
-    "react":         ["javascript"],
-    "angular":       ["typescript", "javascript"],
-    "vue":           ["javascript"],
-    "rails":         ["ruby", "rest api"],
-    "asp.net":       ["c#"],
-    "laravel":       ["php"],
-    "kubernetes":    ["docker"],
-    "graphql":       ["rest api"],
-    "microservices": ["rest api", "system design"],
-    "kafka":         ["microservices"],
-    "rabbitmq":      ["microservices"],
-}
 
 # Role-type critical skill sets (for Phase 1)
 _CRITICAL_BACKEND  = {"python", "java", "go", "node.js", "c#", "ruby", "php",
@@ -329,54 +117,22 @@ _ROLE_CRITICAL: Dict[str, Set[str]] = {
     "ml":        _CRITICAL_ML,
 }
 
-ROLE_KEYWORDS: Dict[str, List[str]] = {
-    "backend":   ["api", "server", "database", "microservices", "rest",
-                  "backend", "server-side", "endpoint", "middleware"],
-    "frontend":  ["ui", "css", "html", "react", "angular", "vue",
-                  "frontend", "user interface", "ux", "responsive"],
-    "fullstack": ["full stack", "full-stack", "fullstack",
-                  "end to end", "frontend", "backend", "api", "database"],
-    "devops":    ["docker", "kubernetes", "ci/cd", "aws", "linux",
-                  "terraform", "infrastructure", "deployment",
-                  "pipeline", "monitoring"],
-    "data":      ["python", "sql", "pandas", "analytics",
-                  "data pipeline", "etl", "spark", "bigquery"],
-    "ml":        ["machine learning", "deep learning", "nlp",
-                  "tensorflow", "pytorch", "model", "training",
-                  "inference", "transformer"],
-}
-
-SENIORITY_SIGNALS = [
-    "senior", "lead", "principal", "staff engineer", "architect",
-    "tech lead", "team lead", "engineering manager", "vp of engineering",
-    "director", "head of", "cto", "chief",
-    "mentored", "mentoring", "coached", "onboarded junior",
-    "architected", "system design", "designed the system",
-    "led a team", "led team", "managed a team", "managed team",
-    "cross-functional", "cross functional", "stakeholder",
-    "scalable", "high availability", "high-availability",
-    "fault tolerant", "distributed", "large-scale", "enterprise-scale",
-    "millions of", "10 million", "100 million", "billion",
-    "production-grade", "real-time", "low latency",
-    "drove", "owned", "ownership",
-]
-
 
 # ===========================================================================
 # HELPERS -- Normalisation & lookup
 # ===========================================================================
 
+@lru_cache(maxsize=64)
 def normalize_text(text: str) -> str:
     """
     Phase 4: Normalise resume/JD text for consistent matching.
-    Lowercase, collapse whitespace, standardise punctuation.
+    Lowercase, collapse whitespace, standardise punctuation
+    (one translate + one regex, see app/utilities/txt_clean.py).
+
+    Cached: every phase normalises the same resume text, and returning the
+    same string object lets the section cache hit on it too.
     """
-    t = text.lower()
-    t = re.sub(r'[\u2013\u2014]', '-', t)          # unicode dashes -> hyphen
-    t = re.sub(r'[\u2022\u00b7\u25b8\u25aa\u25a0]', ' ', t)  # bullets
-    t = re.sub(r'[ \t]+', ' ', t)
-    t = re.sub(r'\n{2,}', '\n', t)
-    return t
+    return normalize_for_matching(text)
 
 
 def normalize_skill(skill: str) -> str:
@@ -388,19 +144,27 @@ def get_all_aliases(skill: str) -> List[str]:
     return SKILL_SYNONYMS.get(canonical, [skill.lower(), canonical])
 
 
-def _make_pattern(alias: str) -> str:
-    escaped = re.escape(alias)
-    if len(alias) <= 3:
-        return r'(?<![a-z0-9])' + escaped + r'(?![a-z0-9])'
-    return r'(?<![a-z])' + escaped + r'(?![a-z])'
+@lru_cache(maxsize=1024)
+def _alias_regexes(skill: str) -> Tuple["re.Pattern", ...]:
+    """Compiled alias patterns for ``skill``, built once per process."""
+    canonical = normalize_skill(skill)
+    patterns = _TAXONOMY["alias_patterns"].get(canonical)
+    if patterns is None:
+        patterns = tuple(alias_pattern(a) for a in (skill.lower(), canonical))
+    return tuple(re.compile(p) for p in patterns)
+
+
+def precompile_skill_patterns() -> int:
+    """Compile every taxonomy alias pattern now (worker warm-up). Returns the skill count."""
+    skills = set(SKILL_SYNONYMS) | set(ALL_CANONICAL)
+    for skill in skills:
+        _alias_regexes(skill)
+    return len(skills)
 
 
 def skill_present_in_text(skill: str, text_norm: str) -> bool:
     """Phase 4: Case-insensitive synonym-aware skill detection."""
-    for alias in get_all_aliases(skill):
-        if re.search(_make_pattern(alias), text_norm):
-            return True
-    return False
+    return any(p.search(text_norm) for p in _alias_regexes(skill))
 
 
 def get_family(skill: str) -> str:
@@ -413,17 +177,21 @@ def family_member_present(skill: str, text_norm: str) -> bool:
     Phase 3: Return True if a tech-family equivalent of `skill` is in text.
     E.g. job needs Kafka; resume has RabbitMQ -> same family -> partial credit.
     """
-    fam = get_family(skill)
-    if not fam:
-        return False
-    members = TECH_FAMILIES.get(fam, [])
-    for member in members:
-        canonical_member = _ALIAS_TO_CANONICAL.get(member.lower(), member.lower())
-        if canonical_member == normalize_skill(skill):
-            continue
-        if skill_present_in_text(canonical_member, text_norm):
-            return True
-    return False
+    return any(
+        skill_present_in_text(peer, text_norm)
+        for peer in FAMILY_PEERS.get(normalize_skill(skill), ())
+    )
+
+
+def family_scan_set(required_skills: List[str]) -> Set[str]:
+    """
+    Canonicals to detect in a resume so that family checks for
+    ``required_skills`` need no further text scanning.
+    """
+    scan = set(ALL_CANONICAL)
+    for skill in required_skills:
+        scan |= FAMILY_PEERS.get(normalize_skill(skill), frozenset())
+    return scan
 
 
 # ===========================================================================
@@ -437,7 +205,15 @@ def _parse_year_month(month_s: str, year_s: str) -> Tuple[int, int]:
     return year, month
 
 
-def extract_years_of_experience(text: str) -> float:
+# Leading lookaheads only let the engine skip positions a match cannot start at.
+_EXPLICIT_EXPERIENCE_PATTERNS = [
+    re.compile(r'(?=\d)(\d+(?:\.\d+)?)\s*\+?\s*years?\s+(?:of\s+)?(?:relevant\s+|professional\s+|industry\s+|work\s+|total\s+)?experience', re.IGNORECASE),
+    re.compile(r'(?=[oma])(?:over|more\s+than|approx(?:imately)?|about)\s+(\d+(?:\.\d+)?)\s*years?', re.IGNORECASE),
+    re.compile(r'(?=\d)(\d+(?:\.\d+)?)\s*years?\s+in\s+(?:the\s+)?(?:it\s+|software\s+|tech\s+)?industry', re.IGNORECASE),
+]
+
+
+def extract_years_of_experience(text: str, sections: Optional[Sections] = None) -> float:
     """
     Phase 6: Multi-layer experience extraction.
     1. Prioritize explicit statements ("X+ years of experience").
@@ -447,144 +223,32 @@ def extract_years_of_experience(text: str) -> float:
     tn = normalize_text(text)
     
     # --- Layer 1: Explicit Statement Detection (Priority) ---
-    explicit_patterns = [
-        r'(\d+(?:\.\d+)?)\s*\+?\s*years?\s+(?:of\s+)?(?:relevant\s+|professional\s+|industry\s+|work\s+|total\s+)?experience',
-        r'(?:over|more\s+than|approx(?:imately)?|about)\s+(\d+(?:\.\d+)?)\s*years?',
-        r'(\d+(?:\.\d+)?)\s*years?\s+in\s+(?:the\s+)?(?:it\s+|software\s+|tech\s+)?industry',
-    ]
-    
     explicit_vals = []
-    for pat in explicit_patterns:
-        matches = re.findall(pat, tn, re.IGNORECASE)
-        for m in matches:
+    for pat in _EXPLICIT_EXPERIENCE_PATTERNS:
+        for m in pat.findall(tn):
             try:
                 val = float(m)
                 if 0.5 <= val <= MAX_EXP_YEARS:
                     explicit_vals.append(val)
             except ValueError:
                 continue
-    
+
     explicit_years = max(explicit_vals) if explicit_vals else 0.0
 
     # --- Layer 2: Section-Aware Timeline Calculation ---
-    # Identify Work Experience section vs Education
-    work_keywords = ['work experience', 'professional experience', 'employment history', 'experience:', 'work history', 'career summary']
-    edu_keywords = ['education', 'academic background', 'academic history', 'certifications', 'university', 'college']
-    
-    # Find start and end of work section
-    work_start = -1
-    for kw in work_keywords:
-        pos = tn.find(kw)
-        if pos != -1:
-            work_start = pos
-            break
-            
-    edu_start = -1
-    for kw in edu_keywords:
-        pos = tn.find(kw)
-        if pos != -1:
-            edu_start = pos
-            break
-            
-    # Extract work text specifically, or use full text if sectioning fails
-    if work_start != -1:
-        if edu_start > work_start:
-            work_text = tn[work_start:edu_start]
-        else:
-            work_text = tn[work_start:] # Hope work comes after edu or edu not found
-    else:
-        # If no work section found, we'll use the whole text but with higher filtering
-        work_text = tn
-
-    # Date Range Extraction
-    _mon = (r'(?:(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|'
-            r'jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|'
-            r'oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?\s*)?')
-    # Also handle numeric months MM/YYYY
-    _num_mon = r'(?:(\d{1,2})[/-])?'
-    _yr  = r'(20\d{2}|19\d{2})'
-    _sep = r'\s*(?:-{1,2}|to|till|–)\s*'
-    _end = (r'(?:(?:(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|'
-            r'jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|'
-            r'oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?\s*)|'
-            r'(?:(\d{1,2})[/-]))?'
-            r'(20\d{2}|19\d{2}|present|current|now|ongoing|till\s*date|to\s*date)')
-            
-    # Pattern 1: MMM YYYY - MMM YYYY or YYYY - YYYY
-    pattern1 = re.compile(_mon + _yr + _sep + _end, re.IGNORECASE)
-    # Pattern 2: MM/YYYY - MM/YYYY
-    pattern2 = re.compile(_num_mon + _yr + _sep + _end, re.IGNORECASE)
-    
-    periods: List[Tuple[int, int]] = []
-    
-    def process_matches(matches, is_numeric_mon=False):
-        for m in matches:
-            if is_numeric_mon:
-                s_mon_val, s_yr_s, e_mon_s, e_mon_num, e_part = m
-                s_mo = int(s_mon_val) if s_mon_val and s_mon_val.isdigit() else 6
-                e_mo_str = e_mon_s or e_mon_num
-            else:
-                s_mon_s, s_yr_s, e_mon_s, e_mon_num, e_part = m
-                s_mo = MONTH_MAP.get((s_mon_s or '').strip().lower().rstrip('.'), 6)
-                e_mo_str = e_mon_s or e_mon_num
-                
-            try:
-                s_yr = int(s_yr_s)
-            except ValueError: continue
-            
-            e_clean = (e_part or '').strip().lower()
-            if re.match(r'^(present|current|now|ongoing|till|to\s*date)', e_clean):
-                e_yr, e_mo = CURRENT_YEAR, CURRENT_MONTH
-            else:
-                try:
-                    e_yr = int(e_clean)
-                    if not e_mo_str:
-                        e_mo = 6
-                    elif str(e_mo_str).isdigit():
-                        e_mo = int(e_mo_str)
-                    else:
-                        e_mo = MONTH_MAP.get(str(e_mo_str).strip().lower().rstrip('.'), 6)
-                except ValueError: continue
-            
-            # Validation
-            if 1970 <= s_yr <= CURRENT_YEAR and s_yr <= e_yr:
-                # Avoid educational blocks if not in work section
-                if work_start == -1 and (e_yr - s_yr) == 4 and "university" in tn[max(0, tn.find(s_yr_s)-50):tn.find(s_yr_s)]:
-                    continue
-                periods.append((s_yr * 12 + s_mo, e_yr * 12 + e_mo))
-
-    process_matches(pattern1.findall(work_text))
-    process_matches(pattern2.findall(work_text), is_numeric_mon=True)
-
-    # Sum non-overlapping periods
-    timeline_years = 0.0
-    if periods:
-        periods.sort()
-        if not periods:
-            timeline_years = 0.0
-        else:
-            merged = []
-            curr_s, curr_e = periods[0]
-            for next_s, next_e in periods[1:]:
-                if next_s <= curr_e:
-                    curr_e = max(curr_e, next_e)
-                else:
-                    merged.append((curr_s, curr_e))
-                    curr_s, curr_e = next_s, next_e
-            merged.append((curr_s, curr_e))
-            
-            total_months = sum((e - s) for s, e in merged)
-            timeline_years = round(total_months / 12, 1)
+    # Date ranges inside the experience section (everything but education and
+    # certifications if there is none), merged into non-overlapping periods.
+    timeline = timeline_years(tn, CURRENT_YEAR, CURRENT_MONTH, sections)
 
     # --- Layer 3: Cross-Validation ---
     final_years = 0.0
-    if explicit_years > 0 and timeline_years > 0:
-        if abs(explicit_years - timeline_years) <= 1.5:
+    if explicit_years > 0 and timeline > 0:
+        if abs(explicit_years - timeline) <= 1.5:
             final_years = explicit_years # Prefer explicit if close
         else:
-            final_years = timeline_years # Large gap, prefer calculations (often explicit is outdated)
+            final_years = timeline # Large gap, prefer calculations (often explicit is outdated)
     else:
-        final_years = explicit_years or timeline_years
+        final_years = explicit_years or timeline
         
     # Minimum display rounding
     if final_years < 0.5 and final_years > 0:
@@ -649,15 +313,18 @@ def classify_job_skills(
 # PHASE 5 -- Skill Inference Engine
 # ===========================================================================
 
-def _get_inferred_skills(detected_canonicals: Set[str]) -> Set[str]:
-    """Phase 5: Given detected skills, return implied canonical skills."""
-    implied: Set[str] = set()
+def _inferred_mask(detected_canonicals: Set[str]) -> int:
+    implied = 0
     for skill in detected_canonicals:
-        for inferred in ECOSYSTEM_CHAINS.get(skill, []):
-            implied.add(normalize_skill(inferred))
+        implied |= _INFERENCE_MASK.get(skill, 0)
     return implied
 
 
+def _get_inferred_skills(detected_canonicals: Set[str]) -> Set[str]:
+    """Phase 5: Given detected skills, return implied canonical skills (transitively)."""
+    return skills_in_mask(_inferred_mask(detected_canonicals))
+
+
 # ===========================================================================
 # PHASE 3 -- Skill Extraction & Matching
 # ===========================================================================
@@ -678,6 +345,7 @@ def match_skills(
     required_skills: List[str],
     job_keywords: List[str],
     skill_importance: Dict[str, str],
+    detected_canonicals: Set[str] = None,
 ) -> Tuple[List[str], List[str], List[str], Dict[str, str]]:
     """
     Phase 3 + 5: Match required skills using:
@@ -691,14 +359,20 @@ def match_skills(
     missing        : genuinely absent skills
     bonus          : extra techs the candidate brings
     match_types    : skill -> 'direct' | 'inferred' | 'family'
+
+    ``detected_canonicals`` may be passed in when the caller has already
+    scanned the text for every skill in :func:`family_scan_set`.
     """
     tn = normalize_text(resume_text)
 
-    # Detect all canonical skills present in resume
-    detected_canonicals: Set[str] = {
-        c for c in ALL_CANONICAL if skill_present_in_text(c, tn)
-    }
-    implied = _get_inferred_skills(detected_canonicals)
+    # Detect all canonical skills present in resume (plus family peers of
+    # the required skills, so the family check below is a mask test)
+    if detected_canonicals is None:
+        detected_canonicals = {
+            c for c in family_scan_set(required_skills) if skill_present_in_text(c, tn)
+        }
+    detected_mask = skill_mask(detected_canonicals)
+    implied_mask  = _inferred_mask(detected_canonicals)
 
     matched: List[str]        = []
     missing: List[str]        = []
@@ -710,24 +384,23 @@ def match_skills(
             # Direct / synonym match
             matched.append(skill)
             match_types[skill.lower()] = "direct"
-        elif canonical in implied or canonical in detected_canonicals:
+        elif implied_mask & skill_mask((canonical,)) or canonical in detected_canonicals:
             # Ecosystem inference match
             matched.append(f"{skill} (inferred)")
             match_types[skill.lower()] = "inferred"
-        elif family_member_present(skill, tn):
+        elif _FAMILY_MASK.get(canonical, 0) & detected_mask:
             # Technology family equivalent (partial credit)
             matched.append(f"{skill} (equivalent)")
             match_types[skill.lower()] = "family"
         else:
             missing.append(skill)
 
-    # Bonus skills
+    # Bonus skills (sorted so the order never depends on set hashing)
     req_canonical = {normalize_skill(s) for s in required_skills}
-    bonus = []
-    for canonical in ALL_CANONICAL:
-        if canonical not in req_canonical and skill_present_in_text(canonical, tn):
-            label = canonical.upper() if len(canonical) <= 3 else canonical.title()
-            bonus.append(label)
+    bonus = [
+        canonical.upper() if len(canonical) <= 3 else canonical.title()
+        for canonical in sorted((detected_canonicals & ALL_CANONICAL) - req_canonical)
+    ]
 
     return matched, missing, bonus, match_types
 
@@ -827,6 +500,23 @@ def compute_skill_match_score(
     return score, breakdown
 
 
+# Sections each text phase reads (see section_segmenter.py). Seniority and
+# project signals come from the career narrative; education only from the
+# education/certification blocks, falling back to the whole text when the
+# resume has neither.
+_CAREER_SECTIONS   = ("header", "summary", "experience", "projects")
+_EDUCATION_SECTIONS = ("education", "certifications")
+
+
+def _phase_text(text: str, sections: Optional[Sections], names: Tuple[str, ...]) -> str:
+    tn = normalize_text(text)
+    if sections is None:
+        sections = segment_sections(tn)
+    if not any(sections.get(n) for n in names):
+        return tn
+    return section_text(tn, sections, names)
+
+
 def compute_experience_score(
     candidate_years: float,
     required_years: float,
@@ -856,9 +546,10 @@ def compute_experience_score(
     return min(max(blended, 0), 100)
 
 
-def compute_seniority_score(text: str, candidate_years: float) -> int:
+def compute_seniority_score(text: str, candidate_years: float,
+                            sections: Optional[Sections] = None) -> int:
     """Phase 6: Seniority & leadership signal score (0-100)."""
-    tn   = normalize_text(text)
+    tn   = _phase_text(text, sections, _CAREER_SECTIONS)
     hits = sum(1 for s in SENIORITY_SIGNALS if s in tn)
     signal_pct = min(hits / 10, 1.0)
     base       = int(signal_pct * 70)
@@ -898,9 +589,9 @@ def compute_role_alignment_score(
     return min(base + kw_bonus, 100)
 
 
-def compute_projects_score(text: str) -> int:
+def compute_projects_score(text: str, sections: Optional[Sections] = None) -> int:
     """Phase 8: Project impact & achievement recognition."""
-    tn = normalize_text(text)
+    tn = _phase_text(text, sections, _CAREER_SECTIONS)
     signals = [
         'project', 'portfolio', 'github.com', 'gitlab.com',
         'built', 'developed', 'implemented', 'deployed',
@@ -916,9 +607,9 @@ def compute_projects_score(text: str) -> int:
     return min(int((hits / len(signals)) * 100), 100)
 
 
-def compute_education_score(text: str) -> int:
+def compute_education_score(text: str, sections: Optional[Sections] = None) -> int:
     """Phase 10: Education (minor factor, 5% weight)."""
-    tn = normalize_text(text)
+    tn = _phase_text(text, sections, _EDUCATION_SECTIONS)
     if any(w in tn for w in ['phd', 'ph.d', 'doctorate', 'doctor of']):
         return 100
     if any(w in tn for w in ['master', 'msc', 'm.sc', 'm.s.',
@@ -1140,24 +831,10 @@ def _priority_float_to_tier(p: float) -> str:
     return "optional"
 
 
-def score_resume(resume_text: str, job: Dict, job_title: str = "") -> Dict:
+def compile_job_profile(job: Dict, job_title: str = "") -> Dict:
     """
-    ATS Scoring Engine v4 -- All 15 phases + Phase 16: recruiter skill priorities.
-
-    Weights (Phase 11)
-    ------------------
-    Skill Match (importance-weighted + inference + family):  30%
-    Experience + Seniority (blended):                        30%
-    Projects / Impact:                                       25%
-    Role Alignment:                                          10%
-    Education:                                                5%
-
-    Phase 16  Recruiter Priority Override
-    --------------------------------------
-    If the job payload includes skill_priorities (a dict of
-    { skill_name_lower: priority_float }), those values override
-    the auto-detected importance tier for each skill.
-    This makes the skill scoring directly driven by recruiter intent.
+    Phase 1 + 16: Per-job preprocessing shared by every resume scored
+    against the same job (role detection, skill tiers, recruiter overrides).
     """
     required_skills: List[str] = job.get("skills", []) or []
     keywords: List[str]        = job.get("keywords") or []
@@ -1181,36 +858,78 @@ def score_resume(resume_text: str, job: Dict, job_title: str = "") -> Dict:
             if skill_key in skill_importance:
                 skill_importance[skill_key] = tier
             else:
-                from app.services.scorer import normalize_skill
                 norm_key = normalize_skill(skill_key)
                 for skey in list(skill_importance.keys()):
                     if normalize_skill(skey) == norm_key:
                         skill_importance[skey] = tier
                         break
 
+    return {
+        "job_title":        job_title,
+        "skills":           required_skills,
+        "keywords":         keywords,
+        "min_experience":   required_years,
+        "role_type":        role_type,
+        "skill_importance": skill_importance,
+        # Phase 3: canonicals to detect per resume (taxonomy + family peers)
+        "scan_skills":      family_scan_set(required_skills),
+    }
+
+
+def score_components(resume_text: str, profile: Dict,
+                     candidate_years: float = None,
+                     sections: Optional[Sections] = None) -> Dict:
+    """
+    Phases 2-12: Numeric scoring only.
+
+    Returns every intermediate value needed to build the full output via
+    :func:`build_score_result`, so insight text can be produced later
+    without touching the resume text again. ``sections`` may come from the
+    resume's stored ``profile_data``; it is segmented here otherwise.
+    """
+    job_title        = profile["job_title"]
+    required_skills  = profile["skills"]
+    keywords         = profile["keywords"]
+    required_years   = profile["min_experience"]
+    role_type        = profile["role_type"]
+    skill_importance = profile["skill_importance"]
+
+    # -- Phase 2: Section segmentation (shared by every text phase) --
+    tn = normalize_text(resume_text)
+    if sections is None:
+        sections = segment_sections(tn)
+
     # -- Phase 6: Extract experience --
-    candidate_years = extract_years_of_experience(resume_text)
+    if candidate_years is None:
+        candidate_years = extract_years_of_experience(resume_text, sections)
+
+    # -- Phase 2: Detect every known skill (and required skills' family peers)
+    #    once, shared by matching, inference, family checks and categorisation --
+    detected_canonicals: Set[str] = {
+        c for c in profile["scan_skills"] if skill_present_in_text(c, tn)
+    }
 
     # -- Phase 3 & 5: Match skills (direct + inferred + family) --
     matched, missing, bonus, match_types = match_skills(
-        resume_text, required_skills, keywords, skill_importance
+        resume_text, required_skills, keywords, skill_importance,
+        detected_canonicals=detected_canonicals,
     )
-
-    # -- Phase 2: Extract all skills (for categorization) --
-    all_extracted    = extract_skills_from_text(resume_text)
-    candidate_skills = categorize_skills(all_extracted)
+    all_extracted = sorted({
+        c.upper() if len(c) <= 3 else c.title()
+        for c in detected_canonicals if c in ALL_CANONICAL
+    })
 
     # -- Phase 10: Component scores --
     skill_score, skill_breakdown = compute_skill_match_score(
         matched, missing, match_types, skill_importance
     )
-    seniority_sc = compute_seniority_score(resume_text, candidate_years)
+    seniority_sc = compute_seniority_score(resume_text, candidate_years, sections)
     exp_score    = compute_experience_score(candidate_years, required_years, seniority_sc)
     role_score   = compute_role_alignment_score(
         resume_text, job_title, keywords, role_type
     )
-    proj_score   = compute_projects_score(resume_text)
-    edu_score    = compute_education_score(resume_text)
+    proj_score   = compute_projects_score(resume_text, sections)
+    edu_score    = compute_education_score(resume_text, sections)
 
     # -- Phase 11: Weighted aggregation --
     base_score = int(
@@ -1236,50 +955,141 @@ def score_resume(resume_text: str, job: Dict, job_title: str = "") -> Dict:
         bonus_count     = len(bonus),
     )
 
+    return {
+        "job_title":        job_title,
+        "final_score":      final_score,
+        "base_score":       base_score,
+        "skill_score":      skill_score,
+        "raw_coverage":     skill_breakdown.get("raw_coverage", "?"),
+        "critical_missing": critical_missing,
+        "exp_score":        exp_score,
+        "seniority_score":  seniority_sc,
+        "role_score":       role_score,
+        "proj_score":       proj_score,
+        "edu_score":        edu_score,
+        "candidate_years":  candidate_years,
+        "required_years":   required_years,
+        "matched":          matched,
+        "missing":          missing,
+        "bonus":            bonus,
+        "extracted":        all_extracted,
+        "adj_notes":        adj_notes,
+        "taxonomy_version": TAXONOMY_VERSION,
+    }
+
+
+def build_score_result(core: Dict, detail: bool = True) -> Dict:
+    """
+    Phase 14: Turn :func:`score_components` output into the scorer result.
+
+    With ``detail=False`` the recruiter-facing text (insights narrative,
+    explanation, skill categories) is skipped and ``insights`` only carries
+    the skill arrays plus ``insights_pending: True``; call again with
+    ``detail=True`` when the candidate is actually opened.
+    """
+    matched = core["matched"]
+    missing = core["missing"]
+    bonus   = core["bonus"]
+
+    breakdown = {
+        "skill_match":      core["skill_score"],
+        "keyword_match":    core["role_score"],       # UI compat alias
+        "experience_score": core["exp_score"],
+        "experience_years": core["candidate_years"],
+    }
+
+    if not detail:
+        return {
+            "final_score": core["final_score"],
+            "breakdown":   breakdown,
+            "matched_skills":   matched,
+            "missing_skills":   missing,
+            "bonus_skills":     bonus,
+            "extracted_skills": core["extracted"],
+            "insights": {
+                "insights_pending": True,
+                "matched_skills":   matched,
+                "missing_skills":   missing,
+                "bonus_skills":     bonus[:10],
+                "taxonomy_version": core["taxonomy_version"],
+            },
+            "explanation": "",
+        }
+
+    candidate_skills = categorize_skills(core["extracted"])
+
     # -- Phase 14: Insights --
     insights = generate_insights(
         matched_skills  = matched,
         missing_skills  = missing,
         bonus_skills    = bonus,
-        skill_score     = skill_score,
-        exp_score       = exp_score,
-        seniority_score = seniority_sc,
-        role_score      = role_score,
-        final_score     = final_score,
-        candidate_years = candidate_years,
-        required_years  = required_years,
-        adj_notes       = adj_notes,
-        job_title       = job_title,
-        critical_missing= critical_missing,
+        skill_score     = core["skill_score"],
+        exp_score       = core["exp_score"],
+        seniority_score = core["seniority_score"],
+        role_score      = core["role_score"],
+        final_score     = core["final_score"],
+        candidate_years = core["candidate_years"],
+        required_years  = core["required_years"],
+        adj_notes       = core["adj_notes"],
+        job_title       = core["job_title"],
+        critical_missing= core["critical_missing"],
     )
     # Embed skill arrays for DB persistence
     insights["matched_skills"]   = matched
     insights["missing_skills"]   = missing
     insights["bonus_skills"]     = bonus[:10]
     insights["candidate_skills"] = candidate_skills
+    insights["taxonomy_version"] = core["taxonomy_version"]
 
     explanation = (
-        f"Skill:{skill_score}%(cov={skill_breakdown.get('raw_coverage','?')}%) | "
-        f"Exp:{exp_score}%({candidate_years}yrs) | "
-        f"Seniority:{seniority_sc}% | Role:{role_score}% | "
-        f"Proj:{proj_score}% | Edu:{edu_score}% | "
-        f"Base:{base_score} -> Final:{final_score}/100 | "
+        f"Skill:{core['skill_score']}%(cov={core['raw_coverage']}%) | "
+        f"Exp:{core['exp_score']}%({core['candidate_years']}yrs) | "
+        f"Seniority:{core['seniority_score']}% | Role:{core['role_score']}% | "
+        f"Proj:{core['proj_score']}% | Edu:{core['edu_score']}% | "
+        f"Base:{core['base_score']} -> Final:{core['final_score']}/100 | "
         f"Rec:{insights['recommendation']}"
     )
 
     return {
-        "final_score": final_score,
-        "breakdown": {
-            "skill_match":      skill_score,
-            "keyword_match":    role_score,       # UI compat alias
-            "experience_score": exp_score,
-            "experience_years": candidate_years,
-        },
+        "final_score": core["final_score"],
+        "breakdown":   breakdown,
         "matched_skills":   matched,
         "missing_skills":   missing,
         "bonus_skills":     bonus,
-        "extracted_skills": all_extracted,
+        "extracted_skills": core["extracted"],
         "candidate_skills": candidate_skills,
         "insights":         insights,
         "explanation":      explanation,
     }
+
+
+def score_resume(resume_text: str, job: Dict, job_title: str = "",
+                 profile: Dict = None, detail: bool = True,
+                 sections: Optional[Sections] = None) -> Dict:
+    """
+    ATS Scoring Engine v4 -- All 15 phases + Phase 16: recruiter skill priorities.
+
+    Weights (Phase 11)
+    ------------------
+    Skill Match (importance-weighted + inference + family):  30%
+    Experience + Seniority (blended):                        30%
+    Projects / Impact:                                       25%
+    Role Alignment:                                          10%
+    Education:                                                5%
+
+    Phase 16  Recruiter Priority Override
+    --------------------------------------
+    If the job payload includes skill_priorities (a dict of
+    { skill_name_lower: priority_float }), those values override
+    the auto-detected importance tier for each skill.
+    This makes the skill scoring directly driven by recruiter intent.
+
+    ``profile`` is an optional precompiled :func:`compile_job_profile` for
+    ``job`` (reuse it when scoring many resumes against one job);
+    ``detail=False`` skips insight text (see :func:`build_score_result`);
+    ``sections`` are precomputed section spans (see section_segmenter.py).
+    """
+    if profile is None:
+        profile = compile_job_profile(job, job_title)
+    core = score_components(resume_text, profile, sections=sections)
+    return build_score_result(core, detail=detail)
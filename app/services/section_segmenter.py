@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Resume Section Segmenter
+========================
+Phase 2 (section awareness) of the scoring engine.
+
+One regex pass over normalised text finds section headings and returns
+character offsets per section, so each scoring phase reads only the slice
+it cares about:
+
+  header          text before the first heading (name, title, contact)
+  summary         summary / objective / profile
+  experience      work history
+  education       degrees, schools
+  projects        personal / academic / key projects
+  skills          skill lists
+  certifications  certificates, licences, courses
+  other           personal details, hobbies, declaration (ends a section)
+
+Parsed resumes usually arrive with all whitespace collapsed onto one line,
+so a heading is recognised either as a distinctive multi-word phrase
+("work experience"), or as a generic word ("education") followed by a colon
+or standing on its own line.
+
+Offsets refer to ``scorer.normalize_text(parsed_text)``. Use
+:func:`sections_to_profile` / :func:`sections_from_profile` to persist them
+with a resume's ``profile_data``.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SEGMENTER_VERSION = 1
+
+Sections = Dict[str, List[Tuple[int, int]]]
+
+# Headings that are safe to recognise anywhere in running text.
+_DISTINCT_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "summary":        ("professional summary", "career summary", "career objective",
+                       "executive summary", "about me"),
+    "experience":     ("work experience", "professional experience", "employment history",
+                       "work history", "career history", "relevant experience",
+                       "industrial experience", "internship experience"),
+    "education":      ("academic background", "academic history", "academic qualifications",
+                       "educational qualifications", "educational background"),
+    "projects":       ("personal projects", "academic projects", "acadamic projects",
+                       "key projects", "selected projects", "project experience"),
+    "skills":         ("technical skills", "core competencies", "key skills", "tech stack"),
+    "certifications": ("licenses and certifications", "licenses & certifications"),
+    "other":          ("personal profile", "personal details", "personal information",
+                       "declaration"),
+}
+
+# Single generic words: a heading only with a trailing colon or on their own line.
+_GENERIC_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "summary":        ("summary", "objective", "profile", "overview"),
+    "experience":     ("experience", "employment", "internships", "internship"),
+    "education":      ("education", "qualifications", "academics"),
+    "projects":       ("projects",),
+    "skills":         ("skills", "technologies"),
+    "certifications": ("certifications", "certificates", "courses", "training"),
+    "other":          ("hobbies", "interests", "languages known", "references"),
+}
+
+_PHRASE_TO_SECTION: Dict[str, str] = {
+    phrase: name
+    for table in (_GENERIC_HEADINGS, _DISTINCT_HEADINGS)
+    for name, phrases in table.items()
+    for phrase in phrases
+}
+
+
+def _alternation(table: Dict[str, Tuple[str, ...]]) -> str:
+    phrases = sorted((p for ps in table.values() for p in ps), key=len, reverse=True)
+    return '|'.join(re.escape(p).replace(r'\ ', r'\s+') for p in phrases)
+
+
+# A distinctive phrase right after one of these words is prose, not a
+# heading ("8 years of work experience", "apply my technical skills").
+_PROSE_LEAD_INS = ('of', 'in', 'my', 'our', 'your', 'the', 'with', 'and', 'strong', 'good')
+
+_HEADING = re.compile(
+    # distinctive phrase anywhere, unless it reads as prose
+    r'(?<![a-z0-9])' + ''.join(f'(?<!{w} )' for w in _PROSE_LEAD_INS) +
+    r'(?P<d>' + _alternation(_DISTINCT_HEADINGS) + r')'
+    r'(?![a-z0-9])[^\S\n]*:?'
+    # generic word followed by a colon
+    r'|(?<![a-z0-9])(?P<c>' + _alternation(_GENERIC_HEADINGS) + r')[^\S\n]*:'
+    # generic word alone on its line
+    r'|(?:^|(?<=\n))[^\S\n]*[#*=>|-]*[^\S\n]*(?P<l>' + _alternation(_GENERIC_HEADINGS) + r')'
+    r'[^\S\n]*(?=\n|$)'
+)
+
+
+def _section_for(phrase: str) -> str:
+    return _PHRASE_TO_SECTION[' '.join(phrase.split())]
+
+
+@lru_cache(maxsize=32)
+def segment_sections(tn: str) -> Sections:
+    """
+    Split normalised resume text into section spans.
+
+    Returns ``{section: [(start, end), ...]}`` with only the sections that
+    were found; text before the first heading is ``header``. A resume with
+    no recognisable headings comes back as a single ``header`` span.
+    The result is cached per text and must be treated as read-only.
+    """
+    sections: Sections = {}
+    current, start = "header", 0
+
+    for m in _HEADING.finditer(tn):
+        name = _section_for(m.group("d") or m.group("c") or m.group("l"))
+        if name == current:
+            continue        # "Projects: ... Academic Projects: ..." stays one span
+        if m.start() > start:
+            sections.setdefault(current, []).append((start, m.start()))
+        current, start = name, m.end()
+
+    if len(tn) > start:
+        sections.setdefault(current, []).append((start, len(tn)))
+
+    return sections
+
+
+def has_headings(sections: Sections) -> bool:
+    return any(name != "header" for name in sections)
+
+
+def section_text(tn: str, sections: Sections, names: Iterable[str]) -> str:
+    """Concatenate the spans of ``names`` in document order."""
+    spans = sorted(span for name in names for span in sections.get(name, ()))
+    return '\n'.join(tn[s:e] for s, e in spans)
+
+
+def section_windows(sections: Sections, names: Iterable[str]) -> List[Tuple[int, int]]:
+    """``(pos, endpos)`` pairs for the spans of ``names`` in document order."""
+    return sorted(span for name in names for span in sections.get(name, ()))
+
+
+def sections_to_profile(sections: Sections) -> Dict:
+    """JSON-safe form for ``profile_data["sections"]``."""
+    return {
+        "version": SEGMENTER_VERSION,
+        "spans":   {name: [list(span) for span in spans] for name, spans in sections.items()},
+    }
+
+
+def sections_from_profile(data: Optional[Dict], tn: str) -> Optional[Sections]:
+    """
+    Restore persisted spans; None when missing, from another segmenter
+    version, or not matching this text.
+    """
+    if not data or data.get("version") != SEGMENTER_VERSION:
+        return None
+    try:
+        sections = {
+            name: [(int(s), int(e)) for s, e in spans]
+            for name, spans in data.get("spans", {}).items()
+        }
+    except (TypeError, ValueError):
+        return None
+    if any(e > len(tn) for spans in sections.values() for _, e in spans):
+        return None
+    return sections
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Skill Taxonomy
+==============
+The skill synonyms, categories, technology families, ecosystem chains,
+role keywords and seniority signals used by the scorer live in a versioned
+data file (``app/data/skill_taxonomy.json`` by default, or the
+``SKILL_TAXONOMY_PATH`` setting).
+
+``scripts/build_skill_taxonomy.py`` compiles that file into a pickled
+artifact next to it (``skill_taxonomy.pkl``) holding every derived table:
+
+  alias_patterns     canonical -> word-boundary regex per alias
+                     (compiled lazily per process)
+  alias_to_canonical alias -> canonical
+  skill_index        canonical -> bit position
+  family_peers       canonical -> other canonical members of its family
+  inference_mask     canonical -> bitset of transitively implied skills
+
+Processes load the artifact in about a millisecond. When it is missing, or
+was built from a different revision of the data file, the tables are
+compiled in memory instead, so editing the JSON never breaks scoring.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+from typing import Dict, FrozenSet, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 1
+
+DEFAULT_SOURCE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data", "skill_taxonomy.json",
+)
+
+
+def taxonomy_source_path() -> str:
+    """Configured taxonomy data file (``SKILL_TAXONOMY_PATH``) or the bundled one."""
+    path = os.environ.get("SKILL_TAXONOMY_PATH")
+    if path is None:
+        try:
+            from app.core.config import get_settings
+            path = get_settings().SKILL_TAXONOMY_PATH
+        except Exception:
+            # Settings need DB/JWT secrets; the scorer must import without them
+            path = ""
+    return path or DEFAULT_SOURCE_PATH
+
+
+def artifact_path_for(source_path: str) -> str:
+    return os.path.splitext(source_path)[0] + ".pkl"
+
+
+def alias_pattern(alias: str) -> str:
+    """Word-boundary-aware pattern for one alias (Phase 4 detection rule)."""
+    escaped = re.escape(alias)
+    if len(alias) <= 3:
+        return r'(?<![a-z0-9])' + escaped + r'(?![a-z0-9])'
+    return r'(?<![a-z])' + escaped + r'(?![a-z])'
+
+
+def compile_taxonomy(source: Dict, source_sha256: str = "") -> Dict:
+    """Derive every lookup table the scorer needs from the raw data file."""
+    synonyms: Dict[str, List[str]] = source["synonyms"]
+
+    alias_to_canonical: Dict[str, str] = {}
+    for canonical, aliases in synonyms.items():
+        for alias in aliases:
+            alias_to_canonical[alias.lower()] = canonical
+
+    def canonical_of(name: str) -> str:
+        return alias_to_canonical.get(name.lower(), name.lower())
+
+    families: Dict[str, List[str]] = source["tech_families"]
+    skill_to_family: Dict[str, str] = {}
+    for family, members in families.items():
+        for member in members:
+            skill_to_family[canonical_of(member)] = family      # last family wins
+
+    family_peers: Dict[str, FrozenSet[str]] = {
+        skill: frozenset(canonical_of(m) for m in families[family]) - {skill}
+        for skill, family in skill_to_family.items()
+    }
+
+    categories = {name: frozenset(skills) for name, skills in source["categories"].items()}
+    all_canonical = frozenset().union(*categories.values())
+
+    chains: Dict[str, List[str]] = source["ecosystem_chains"]
+    universe = sorted(
+        all_canonical
+        | set(skill_to_family)
+        | {canonical_of(s) for targets in chains.values() for s in targets}
+        | {canonical_of(s) for s in chains}
+    )
+    skill_index = {skill: i for i, skill in enumerate(universe)}
+
+    def mask_of(skills) -> int:
+        mask = 0
+        for skill in skills:
+            if skill in skill_index:
+                mask |= 1 << skill_index[skill]
+        return mask
+
+    # Transitive closure of the ecosystem chains (Kafka -> Microservices -> REST API)
+    direct = {canonical_of(src): {canonical_of(t) for t in targets} for src, targets in chains.items()}
+    inference_mask: Dict[str, int] = {}
+    for src in direct:
+        seen: Set[str] = set()
+        stack = list(direct[src])
+        while stack:
+            skill = stack.pop()
+            if skill not in seen:
+                seen.add(skill)
+                stack.extend(direct.get(skill, ()))
+        inference_mask[src] = mask_of(seen)
+
+    return {
+        "format":             ARTIFACT_FORMAT,
+        "version":            str(source.get("version", "unversioned")),
+        "source_sha256":      source_sha256,
+        "synonyms":           synonyms,
+        "categories":         categories,
+        "all_canonical":      all_canonical,
+        "tech_families":      families,
+        "ecosystem_chains":   chains,
+        "role_keywords":      source["role_keywords"],
+        "seniority_signals":  source["seniority_signals"],
+        "alias_to_canonical": alias_to_canonical,
+        "alias_patterns":     {
+            canonical: tuple(alias_pattern(a) for a in aliases)
+            for canonical, aliases in synonyms.items()
+        },
+        "skill_to_family":    skill_to_family,
+        "family_peers":       family_peers,
+        "skill_universe":     tuple(universe),
+        "skill_index":        skill_index,
+        "family_mask":        {skill: mask_of(peers) for skill, peers in family_peers.items()},
+        "inference_mask":     inference_mask,
+    }
+
+
+def _read_source(source_path: str):
+    with open(source_path, "rb") as f:
+        raw = f.read()
+    return json.loads(raw.decode("utf-8")), hashlib.sha256(raw).hexdigest()
+
+
+def build_artifact(source_path: Optional[str] = None,
+                   artifact_path: Optional[str] = None) -> Dict:
+    """Compile the data file and write the artifact atomically."""
+    source_path   = source_path or taxonomy_source_path()
+    artifact_path = artifact_path or artifact_path_for(source_path)
+
+    source, sha = _read_source(source_path)
+    taxonomy = compile_taxonomy(source, sha)
+
+    tmp_path = artifact_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, artifact_path)
+    return taxonomy
+
+
+def load_taxonomy(source_path: Optional[str] = None) -> Dict:
+    """
+    Load the compiled taxonomy, preferring the artifact when it matches the
+    data file byte-for-byte.
+    """
+    source_path   = source_path or taxonomy_source_path()
+    artifact_path = artifact_path_for(source_path)
+
+    source = sha = None
+    if os.path.exists(source_path):
+        with open(source_path, "rb") as f:
+            sha = hashlib.sha256(f.read()).hexdigest()
+
+    if os.path.exists(artifact_path):
+        try:
+            with open(artifact_path, "rb") as f:
+                taxonomy = pickle.load(f)
+            if taxonomy.get("format") == ARTIFACT_FORMAT and (
+                sha is None or taxonomy.get("source_sha256") == sha
+            ):
+                return taxonomy
+            logger.info("Skill taxonomy artifact %s is stale; compiling in memory", artifact_path)
+        except Exception as exc:
+            logger.warning("Could not load skill taxonomy artifact %s: %s", artifact_path, exc)
+
+    source, sha = _read_source(source_path)
+    return compile_taxonomy(source, sha)
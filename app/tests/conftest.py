@@ -0,0 +1,6 @@
+import os
+
+# Settings needs these; modules that read settings at import (the pipeline,
+# the workers) can then be tested without a .env
+os.environ.setdefault("DATABASE_PASSWORD", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from scripts import backfill_resumes
+
+# id -> (filename, parsed_text); ids have gaps, as after deletions
+_TABLE = {i: (f"r{i}.pdf", f"Python developer {i}, 2018 - 2023. Django, PostgreSQL.")
+          for i in (2, 3, 5, 8, 9, 13, 21, 22, 40)}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    calls = {"pages": [], "written": []}
+
+    def batch_after(last_id, limit, max_id=None, stale_taxonomy_version=None):
+        calls["pages"].append(last_id)
+        ids = [i for i in sorted(_TABLE) if i > last_id and (max_id is None or i <= max_id)]
+        return [(i, *_TABLE[i]) for i in ids[:limit]]
+
+    def write(profiles):
+        if calls.get("fail_after") == len(calls["written"]):
+            raise RuntimeError("connection lost")
+        calls["written"].append([rid for rid, _ in profiles])
+        return len(profiles)
+
+    monkeypatch.setattr(backfill_resumes, "get_resume_id_range", lambda: (2, 22, 8))
+    monkeypatch.setattr(backfill_resumes, "get_resume_batch_after", batch_after)
+    monkeypatch.setattr(backfill_resumes, "bulk_update_resume_profiles", write)
+    return calls
+
+
+def _run(checkpoint, restart=False):
+    backfill_resumes.run("features", batch_size=3, workers=1, checkpoint=str(checkpoint),
+                         restart=restart, stale_only=False, max_rows_per_sec=0, db_duty_cycle=1)
+
+
+def test_keyset_pages_stop_at_max_id_seen_at_start(db, tmp_path):
+    _run(tmp_path / "cp.json")
+    # id 40 arrived after the start (max_id 22) and is left alone
+    assert db["written"] == [[2, 3, 5], [8, 9, 13], [21, 22]]
+    assert db["pages"] == [0, 5, 13, 22]
+    assert not (tmp_path / "cp.json").exists()
+
+
+def test_rerun_resumes_from_checkpoint(db, tmp_path):
+    checkpoint = tmp_path / "cp.json"
+    db["fail_after"] = 1
+    with pytest.raises(RuntimeError):
+        _run(checkpoint)
+    state = json.loads(checkpoint.read_text())
+    assert (state["last_id"], state["max_id"], state["updated"]) == (5, 22, 3)
+
+    db["fail_after"] = None
+    db["pages"].clear()
+    _run(checkpoint)
+    assert db["written"] == [[2, 3, 5], [8, 9, 13], [21, 22]]
+    assert db["pages"][0] == 5
+    assert not checkpoint.exists()
+
+    with pytest.raises(SystemExit):
+        checkpoint.write_text(json.dumps({**state, "mode": "reparse"}))
+        _run(checkpoint)
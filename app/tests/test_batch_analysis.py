@@ -0,0 +1,83 @@
+import json
+
+from app.services import resume_analyzer
+from app.services.resume_analyzer import (
+    ResumeAnalyzer, analyze_stored_resume, cache_analysis, get_cached_analysis,
+)
+from app.services.scorer import (
+    TAXONOMY_VERSION, extract_skills_from_text, extract_years_of_experience, normalize_text,
+)
+from app.services.section_segmenter import sections_to_profile, segment_sections
+
+TEXT = (
+    "Jane Doe\nProfessional Summary\nBackend engineer leading a platform team.\n"
+    "Work Experience\nSenior Backend Engineer, Acme Corp, Jan 2017 - Present\n"
+    "Led Python and Django services on PostgreSQL, Kafka and Kubernetes; mentored 6 engineers.\n"
+    "Software Engineer, Initech, Jun 2013 - Dec 2016\nBuilt REST APIs in Java and Spring Boot.\n"
+    "Education\nB.Sc. Computer Science, 2013\nSkills\nPython, Django, AWS, Docker, Git, CI/CD\n"
+)
+
+
+def _stored_profile(text=TEXT):
+    # What pipeline.build_candidate_profile stores in resumes.profile_data
+    sections = segment_sections(normalize_text(text))
+    return json.loads(json.dumps({
+        "parsed_text": text,
+        "years_of_experience": extract_years_of_experience(text, sections),
+        "skills": extract_skills_from_text(text),
+        "sections": sections_to_profile(sections),
+        "taxonomy_version": TAXONOMY_VERSION,
+    }))
+
+
+def test_stored_features_give_the_same_analysis(monkeypatch):
+    expected = ResumeAnalyzer().analyze_standalone(TEXT)
+    profile = _stored_profile()
+
+    def not_called(*args, **kwargs):
+        raise AssertionError("features should come from the stored profile")
+    monkeypatch.setattr(resume_analyzer, "extract_skills_from_text", not_called)
+    monkeypatch.setattr(resume_analyzer, "extract_years_of_experience", not_called)
+
+    assert analyze_stored_resume(TEXT, profile) == expected
+
+
+def test_stale_or_foreign_profile_is_ignored():
+    expected = ResumeAnalyzer().analyze_standalone(TEXT)
+    stale = dict(_stored_profile(), taxonomy_version="0", skills=["COBOL"], years_of_experience=40)
+    other = _stored_profile("Data analyst. Excel, SQL, Tableau. 1 year experience.")
+    assert analyze_stored_resume(TEXT, stale) == expected
+    assert analyze_stored_resume(TEXT, other) == expected
+    assert analyze_stored_resume(TEXT, None) == expected
+
+
+def test_analysis_cache_is_keyed_by_hash_and_version(monkeypatch):
+    monkeypatch.setattr(resume_analyzer, "_analysis_cache", None)
+    analysis = analyze_stored_resume(TEXT)
+    cache_analysis("abc123", analysis)
+
+    cached = get_cached_analysis("abc123")
+    assert cached == analysis
+    cached["filename"] = "jane.pdf"             # callers decorate their copy
+    assert "filename" not in get_cached_analysis("abc123")
+    assert get_cached_analysis(None) is None and get_cached_analysis("other") is None
+
+    monkeypatch.setattr(resume_analyzer, "ANALYZER_VERSION", resume_analyzer.ANALYZER_VERSION + 1)
+    assert get_cached_analysis("abc123") is None
+
+
+def test_batch_call_matches_single_calls():
+    other = "Frontend developer with 2 years of React, TypeScript, CSS and HTML. Jest, Git."
+    profiles = [_stored_profile(), None]
+    assert resume_analyzer.analyze_stored_resumes([TEXT, other], profiles) == [
+        analyze_stored_resume(TEXT, profiles[0]), analyze_stored_resume(other),
+    ]
+    assert resume_analyzer.analyze_stored_resumes([]) == []
+
+
+def test_role_keywords_match_inside_detected_skill_names():
+    analyzer = ResumeAnalyzer()
+    bits = resume_analyzer.detected_skill_mask(["PostgreSQL", "Node.Js", "React"])
+    # "sql" and "node" come from the skill names alone, not the text
+    assert analyzer._determine_role_suitability("", bits) == ["Backend", "Full-Stack"]
+    assert analyzer._determine_role_suitability("", 0) == ["General Software Engineering"]
@@ -0,0 +1,61 @@
+import copy
+
+import pytest
+
+np = pytest.importorskip("numpy")
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st
+
+from app.services.job_ranker import calibrate_scores, calibrate_scores_paged
+
+
+_candidate = st.fixed_dictionaries({
+    "score":     st.integers(min_value=0, max_value=100),
+    "skill":     st.integers(min_value=0, max_value=100),
+    "years":     st.one_of(st.none(), st.integers(min_value=0, max_value=60).map(lambda v: v / 2)),
+    "insights":  st.one_of(
+        st.none(),
+        st.just({}),
+        st.sampled_from(["Strong Hire", "Good Candidate — Proceed to Interview", ""])
+          .map(lambda rec: {"recommendation": rec, "tier": "B"}),
+    ),
+})
+
+
+def _build_pool(rows):
+    results = [
+        {
+            "resume_id": idx,
+            "filename":  f"resume_{idx}.pdf",
+            "score":     row["score"],
+            "raw_score": row["score"],
+            "breakdown": {"skill_match": row["skill"], "experience_years": row["years"]},
+            "insights":  row["insights"],
+        }
+        for idx, row in enumerate(rows)
+    ]
+    results.sort(key=lambda x: x["score"], reverse=True)
+    return results
+
+
+@settings(max_examples=300, deadline=None)
+@given(st.lists(_candidate, min_size=0, max_size=60))
+def test_array_calibration_matches_dict_calibration(rows):
+    pool = _build_pool(rows)
+    expected = calibrate_scores(copy.deepcopy(pool))
+    actual   = calibrate_scores_paged(copy.deepcopy(pool))
+    assert actual == expected
+    assert [type(r["score"]) for r in actual] == [type(r["score"]) for r in expected]
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+    st.lists(_candidate, min_size=2, max_size=60),
+    st.integers(min_value=0, max_value=70),
+    st.integers(min_value=1, max_value=20),
+)
+def test_array_calibration_page_is_slice_of_full_result(rows, offset, limit):
+    pool = _build_pool(rows)
+    expected = calibrate_scores(copy.deepcopy(pool))[offset:offset + limit]
+    actual   = calibrate_scores_paged(copy.deepcopy(pool), offset=offset, limit=limit)
+    assert actual == expected
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from app.services.chat_sessions import MemorySessionStore, RedisSessionStore
+
+RESUME = "Jane Doe\nSenior backend engineer. Python, Django, PostgreSQL.\n" * 50
+
+
+def _redis_store(**kwargs):
+    redis = pytest.importorskip("redis")
+    store = RedisSessionStore("redis://localhost:6379/15", **kwargs)
+    try:
+        store._redis.ping()
+    except redis.exceptions.ConnectionError:
+        pytest.skip("no Redis server on localhost:6379")
+    store._redis.flushdb()
+    return store
+
+
+@pytest.fixture(params=["memory", "redis"])
+def make_store(request):
+    def make(max_sessions=10, ttl_seconds=60, max_turns=3):
+        kwargs = dict(max_sessions=max_sessions, ttl_seconds=ttl_seconds, max_turns=max_turns)
+        return MemorySessionStore(**kwargs) if request.param == "memory" else _redis_store(**kwargs)
+    return make
+
+
+def test_session_round_trip_with_capped_history(make_store):
+    store = make_store()
+    sid = store.create(RESUME, "jane.pdf")
+    for i in range(5):
+        store.append_turn(sid, f"q{i}", f"a{i}")
+
+    session = store.get(sid)
+    assert session.resume_text == RESUME and session.filename == "jane.pdf"
+    assert session.history == [{"user": f"q{i}", "ai": f"a{i}"} for i in (2, 3, 4)]
+
+    store.delete(sid)
+    assert store.get(sid) is None
+
+
+def test_oldest_session_evicted_at_capacity(make_store):
+    store = make_store(max_sessions=2)
+    first = store.create(RESUME, "a.pdf")
+    time.sleep(0.01)
+    second = store.create(RESUME, "b.pdf")
+    time.sleep(0.01)
+    third = store.create(RESUME, "c.pdf")
+    assert store.get(first) is None
+    assert store.get(second).filename == "b.pdf" and store.get(third).filename == "c.pdf"
+
+
+def test_sessions_visible_across_store_instances():
+    # Two uvicorn workers = two stores on the same Redis
+    store = _redis_store(max_sessions=10, ttl_seconds=60, max_turns=3)
+    other = RedisSessionStore("redis://localhost:6379/15", max_sessions=10, ttl_seconds=60, max_turns=3)
+    sid = store.create(RESUME, "jane.pdf")
+    other.append_turn(sid, "q", "a")
+    assert store.get(sid).history == [{"user": "q", "ai": "a"}]
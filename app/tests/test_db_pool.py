@@ -0,0 +1,63 @@
+import psycopg2
+import pytest
+
+from app.db import dbase
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    try:
+        psycopg2.connect(connect_timeout=2, **dbase._connection_params()).close()
+    except psycopg2.OperationalError:
+        pytest.skip("PostgreSQL not reachable (DATABASE_* settings)")
+    dbase.close_db_pool()
+    pool = dbase.init_db_pool(minconn=1, maxconn=2)
+    yield pool
+    dbase.close_db_pool()
+
+
+def _backend_pid(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_backend_pid();")
+        return cur.fetchone()[0]
+
+
+def test_close_returns_connection_to_the_pool(pool):
+    conn = dbase.get_db_connection()
+    pid = _backend_pid(conn)
+    with conn.cursor() as cur:
+        cur.execute("CREATE TEMP TABLE pool_probe (x int);")   # uncommitted
+    conn.close()
+    assert not conn.closed
+
+    again = dbase.get_db_connection()
+    assert again is conn and _backend_pid(again) == pid
+    with again.cursor() as cur:                 # rolled back on return
+        cur.execute("SELECT to_regclass('pg_temp.pool_probe');")
+        assert cur.fetchone()[0] is None
+    again.close()
+
+
+def test_dead_connections_are_replaced(pool, monkeypatch):
+    conn = dbase.get_db_connection()
+    pid = _backend_pid(conn)
+    conn.close()
+
+    killer = psycopg2.connect(**dbase._connection_params())
+    killer.autocommit = True
+    with killer.cursor() as cur:
+        cur.execute("SELECT pg_terminate_backend(%s);", (pid,))
+    killer.close()
+
+    # Recently used connections are trusted; idle ones are probed
+    monkeypatch.setattr(dbase, "POOL_PROBE_IDLE_SECONDS", 0.0)
+    fresh = dbase.get_db_connection()
+    assert fresh is not conn and _backend_pid(fresh) != pid
+    fresh.close()
+
+    # A connection closed while in the pool is dropped without a probe
+    monkeypatch.setattr(dbase, "POOL_PROBE_IDLE_SECONDS", 3600.0)
+    psycopg2.extensions.connection.close(fresh)
+    replacement = dbase.get_db_connection()
+    assert replacement is not fresh and not replacement.closed
+    replacement.close()
@@ -0,0 +1,40 @@
+import json
+
+from app.services import job_ranker
+
+
+JOB = (7, "Backend Engineer", ["Python", "Django", "PostgreSQL", "Docker"],
+       ["api", "backend"], 3, None, True, None)
+
+_RESUMES = {
+    1: "Senior backend engineer, 6 years. Python, Django, PostgreSQL, Docker, Kubernetes, REST APIs.",
+    2: "Frontend developer with 2 years of React and TypeScript. Some Node.js.",
+    3: "Python developer, 4 years building Flask and FastAPI services on MySQL.",
+    4: "Backend engineer: Django REST framework, PostgreSQL, Redis, Celery, Docker. 5 years.",
+    5: "Data analyst. Excel, SQL, Tableau. 1 year experience.",
+}
+_YEARS = {1: 6.0, 2: 2.0, 3: 4.0, 4: 5.0, 5: 1.0}
+
+
+def _fake_load(resume_id, filename, skills, uploads_dir):
+    return _RESUMES[resume_id], _YEARS[resume_id]
+
+
+def test_chunked_scoring_matches_single_process_ranking(monkeypatch):
+    monkeypatch.setattr(job_ranker, "_load_resume_text", _fake_load)
+    resumes = [(rid, f"r{rid}.pdf") for rid in _RESUMES]
+
+    expected = job_ranker.rank_resumes_for_job(JOB, resumes)
+
+    # What the chord does: chunks scored separately, results JSON-serialised
+    # through the result backend, merged and calibrated once.
+    job_id, job_title, job_payload = job_ranker.build_job_payload(JOB)
+    profile = job_ranker.cached_job_profile(job_payload, job_title)
+    merged = []
+    for i in range(0, len(resumes), 2):
+        chunk = job_ranker.score_resume_rows(job_id, job_payload, profile, resumes[i:i + 2])
+        merged.extend(json.loads(json.dumps(chunk)))
+    actual = job_ranker.calibrate_pool(merged, job_id)
+
+    assert json.loads(json.dumps(expected)) == actual
+    assert job_ranker.cached_job_profile(job_payload, job_title) is profile
@@ -0,0 +1,73 @@
+import pytest
+
+from app.services import scorer
+from app.services.experience_extractor import (
+    DateSpan,
+    iter_date_spans,
+    merge_spans,
+    timeline_years,
+)
+
+
+# Expected values recorded from the pre-extraction implementation in
+# scorer.py, evaluated with the clock pinned to June 2025.
+REGRESSION_CORPUS = [
+    ("Work Experience\nSenior Engineer, Acme  Jan 2018 - Present\n"
+     "Engineer, Beta  Mar 2014 - Dec 2017\nEducation\nB.Tech 2010 - 2014", 11.0),
+    ("Professional Experience\n03/2016 – 08/2019 Developer\n09/2019 - current Lead\n", 9.0),
+    ("Software engineer 2012 - 2016\nStudied at university 2008 - 2012", 4.0),
+    ("EDUCATION\nMIT 2005 - 2009\nWORK HISTORY\nGoogle 2009 - 2015\nMeta 2014 to 2020", 11.0),
+    ("Experience:\nsept. 2010 -- dec. 2012\nfeb 2013 till date", 2.5),
+    ("8+ years of experience in backend development.\nWork Experience\nJan 2019 - Present", 6.5),
+    ("Over 12 years in the IT industry. Employment history: 2020 - 2022", 2.0),
+    ("Career summary\n1999 - 2003 consultant\n2003-2003 contractor\n2030 - 2031 future", 4.0),
+    ("Skills: Python, SQL", 0.0),
+    ("Work Experience\n2015 - 2013 typo\nJun 2016 - Jan 2016", 0.0),
+]
+
+
+@pytest.fixture
+def pinned_clock(monkeypatch):
+    monkeypatch.setattr(scorer, "CURRENT_YEAR", 2025)
+    monkeypatch.setattr(scorer, "CURRENT_MONTH", 6)
+
+
+@pytest.mark.parametrize("text,expected", REGRESSION_CORPUS)
+def test_years_match_regression_corpus(pinned_clock, text, expected):
+    assert scorer.extract_years_of_experience(text) == expected
+
+
+def test_spans_are_limited_to_work_section():
+    tn = scorer.normalize_text(
+        "Education\nBSc 2008 - 2012\nWork Experience\nJan 2013 - Dec 2014\n"
+    )
+    spans = list(iter_date_spans(tn, 2025, 6))
+    assert spans == [
+        DateSpan(2013 * 12 + 1, 2014 * 12 + 12, "experience"),
+        DateSpan(2013 * 12 + 6, 2014 * 12 + 12, "experience"),
+    ]
+
+
+def test_education_and_certification_dates_are_not_work(pinned_clock):
+    # No experience heading: the rest of the document is scanned, minus the
+    # education and certification blocks.
+    text = (
+        "Backend developer at Foo 2019 - 2022. "
+        "Education: B.Sc Computer Science 2015 - 2018. "
+        "Certifications: AWS course 2022 - 2023"
+    )
+    assert scorer.extract_years_of_experience(text) == 3.0
+
+
+def test_degree_range_after_university_is_skipped_without_work_heading():
+    tn = scorer.normalize_text("Graduated from university 2010 - 2014\nDeveloper 2014 - 2016")
+    spans = list(iter_date_spans(tn, 2025, 6))
+    assert [(s.start // 12, s.end // 12) for s in spans] == [(2014, 2016), (2014, 2016)]
+    assert {s.section for s in spans} == {"document"}
+
+
+def test_merge_spans_unions_overlaps():
+    spans = [DateSpan(10, 20, "work"), DateSpan(15, 30, "work"), DateSpan(40, 46, "work")]
+    assert merge_spans(spans) == 26
+    assert merge_spans([]) == 0
+    assert timeline_years("no dates here", 2025, 6) == 0.0
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import time
+
+from app.services.llm_insights import (
+    USER_MESSAGE, InvalidInsights, RateLimiter, build_insight_prompt, generate_llm_insights,
+    parse_insights,
+)
+
+JOB_PAYLOAD = {"skills": ["Python", "Django", "PostgreSQL"], "keywords": ["api"], "min_experience": 3}
+ANSWER = json.dumps({
+    "summary": "Solid backend fit.", "strengths": ["Django"], "concerns": [],
+    "interview_questions": ["Scaling Postgres?"], "fit": "strong",
+})
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+class _Unauthorized(Exception):
+    status_code = 401
+
+
+class StubLLM:
+    """Local stand-in for LLMService: fixed latency, scripted failures."""
+    provider = "stub"
+
+    def __init__(self, latency=0.05, script=None):
+        self.latency = latency
+        self.script = script or {}      # resume_id -> list of exceptions / answers, consumed in order
+        self.calls = []
+        self.in_flight = self.max_in_flight = 0
+
+    async def aget_chat_response(self, system_prompt, user_message, raise_errors=False, use_cache=True):
+        resume_id = int(system_prompt.split("CANDIDATE-ID ")[1].split()[0])
+        self.calls.append(resume_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        outcome = self.script.get(resume_id, []).pop(0) if self.script.get(resume_id) else ANSWER
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _candidates(k):
+    return [{"resume_id": i, "score": 90 - i, "insights": {"matched_skills": ["Python"]},
+             "resume_text": f"CANDIDATE-ID {i} Work Experience: Python developer, 2018 - present."}
+            for i in range(k)]
+
+
+def _run(llm, candidates, **kwargs):
+    async def collect():
+        return [r async for r in generate_llm_insights(
+            llm, "Backend Engineer", JOB_PAYLOAD, candidates,
+            limiter=RateLimiter(per_minute=60_000, burst=100), base_delay=0.01, **kwargs)]
+    started = time.perf_counter()
+    results = asyncio.run(collect())
+    return results, time.perf_counter() - started
+
+
+def test_wall_time_scales_with_k_over_concurrency():
+    llm = StubLLM(latency=0.1)
+    results, elapsed = _run(llm, _candidates(16), concurrency=8)
+    assert sorted(r["resume_id"] for r in results) == list(range(16))
+    assert all(r["status"] == "completed" and r["llm_insights"]["fit"] == "strong" for r in results)
+    assert llm.max_in_flight == 8
+    assert elapsed < 0.6        # 2 waves of 0.1 s, not 16
+
+
+def test_retries_transient_errors_and_bad_json_only():
+    llm = StubLLM(script={
+        0: [_RateLimited("slow down"), "not json at all"],
+        1: [_Unauthorized("bad key")],
+        2: [InvalidInsights("x"), InvalidInsights("x"), InvalidInsights("x")],
+    })
+    results = {r["resume_id"]: r for r in _run(llm, _candidates(3), concurrency=3, max_attempts=3)[0]}
+    assert results[0]["status"] == "completed" and results[0]["attempts"] == 3
+    assert results[1]["status"] == "failed" and results[1]["attempts"] == 1
+    assert results[2]["status"] == "failed" and results[2]["attempts"] == 3
+
+
+def test_rate_limiter_spaces_requests_after_burst():
+    limiter = RateLimiter(per_minute=600, burst=3)       # one per 0.1 s
+    waits = [limiter.reserve() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0.05 < waits[3] <= 0.1 and 0.15 < waits[4] <= 0.2
+
+
+def test_prompt_and_answer_parsing():
+    prompt = build_insight_prompt("Backend Engineer", JOB_PAYLOAD, _candidates(1)[0])
+    assert "REQUIRED SKILLS: Python, Django, PostgreSQL" in prompt
+    assert "MATCHED SKILLS: Python" in prompt and "CANDIDATE-ID 0" in prompt
+
+    parsed = parse_insights("```json\n" + ANSWER.replace('"strong"', '"Excellent"') + "\n```")
+    assert parsed["summary"] == "Solid backend fit." and parsed["fit"] == "possible"
+    for bad in ("Sorry, I can't help.", '{"summary": ""}', "{not json}"):
+        try:
+            parse_insights(bad)
+        except InvalidInsights:
+            continue
+        raise AssertionError(bad)
+
+
+def test_retries_bypass_the_response_cache(tmp_path):
+    from app.core.config import Settings
+    from app.services.llm_cache import CachedResponse, SQLiteResponseCache, cache_key
+    from app.services.llm_service import LLMService
+
+    cache = SQLiteResponseCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=60, max_entries=100)
+    settings = Settings(DATABASE_PASSWORD="x", JWT_SECRET_KEY="x", LLM_PROVIDER="openai")
+    llm = LLMService(settings, cache=cache)
+    answers = ["Sorry, I can't help.", ANSWER]
+    calls = []
+
+    async def provider(system_prompt, user_message, timeout):
+        calls.append(system_prompt)
+        return answers[len(calls) - 1]
+    llm._acomplete = provider
+
+    candidate = _candidates(1)
+    prompt = build_insight_prompt("Backend Engineer", JOB_PAYLOAD, candidate[0])
+    # A rejected answer left in the cache (e.g. by an earlier run) is not replayed
+    cache.set(cache_key("openai", settings.OPENAI_MODEL, prompt, USER_MESSAGE),
+              CachedResponse(["not json"], 1.0))
+
+    results, _ = _run(llm, candidate, concurrency=1, max_attempts=3)
+    assert results[0]["status"] == "completed" and results[0]["attempts"] == 2
+    assert len(calls) == 2
+    assert cache.size() == 1
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("openai")
+
+from app.core.config import Settings
+from app.services import llm_service
+from app.services.llm_service import LLMService
+
+
+class _FakeOpenAI(BaseHTTPRequestHandler):
+    """Minimal /chat/completions endpoint: echoes the user message back."""
+    protocol_version = "HTTP/1.1"       # keep-alive
+    connections = set()
+
+    def do_POST(self):
+        _FakeOpenAI.connections.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        text = body["messages"][-1]["content"]
+        if text == "slow":
+            time.sleep(1.0)
+        if body.get("stream"):
+            events = [{"choices": [{"index": 0, "delta": {"content": word}}]}
+                      for word in text.split(" ")]
+            payload = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+            self._send(payload.encode(), "text/event-stream")
+        else:
+            self._send(json.dumps({
+                "id": "cmpl-1", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": f"echo: {text}"}}],
+            }).encode(), "application/json")
+
+    def _send(self, payload, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except BrokenPipeError:         # client gave up (timeout test)
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def service():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings = Settings(
+        DATABASE_PASSWORD="x", JWT_SECRET_KEY="x", LLM_PROVIDER="openai",
+        OPENAI_API_KEY="test", OPENAI_BASE_URL=f"http://127.0.0.1:{server.server_port}/v1",
+        LLM_MAX_RETRIES=0, LLM_CACHE_BACKEND="",
+    )
+    yield LLMService(settings)
+    llm_service.close_llm_clients()
+    server.shutdown()
+
+
+def test_sync_calls_reuse_one_client_and_connection(service):
+    _FakeOpenAI.connections.clear()
+    assert service.get_chat_response("sys", "hello") == "echo: hello"
+    assert service.get_chat_response("sys", "again") == "echo: again"
+    assert "".join(service.get_streaming_chat_response("sys", "a b c")) == "abc"
+
+    client = llm_service.get_llm_client("openai", service.settings)
+    assert llm_service.get_llm_client("openai", service.settings) is client
+    assert len(_FakeOpenAI.connections) == 1
+
+
+def test_async_calls_and_streaming(service):
+    async def run():
+        reply = await service.aget_chat_response("sys", "hello")
+        tokens = [t async for t in service.aget_streaming_chat_response("sys", "x y")]
+        same = (llm_service.get_async_llm_client("openai", service.settings)
+                is llm_service.get_async_llm_client("openai", service.settings))
+        await llm_service.aclose_llm_clients()
+        return reply, tokens, same
+
+    assert asyncio.run(run()) == ("echo: hello", ["x", "y"], True)
+
+
+def test_per_call_timeout_returns_error_string(service):
+    started = time.perf_counter()
+    reply = service.get_chat_response("sys", "slow", timeout=0.2)
+    assert reply.startswith("OpenAI Error:")
+    assert time.perf_counter() - started < 0.9
+
+
+def test_response_cache_serves_repeats_and_replays_streams(service, tmp_path):
+    from app.services.llm_cache import SQLiteResponseCache
+    cache = SQLiteResponseCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=60, max_entries=100)
+    cached = LLMService(service.settings, cache=cache)
+
+    assert cached.get_chat_response("sys", "Is the candidate senior?") == "echo: Is the candidate senior?"
+    assert cached.get_chat_response("sys", "  is the candidate SENIOR ") == "echo: Is the candidate senior?"
+    assert cached.get_chat_response("other resume", "is the candidate senior?") == "echo: is the candidate senior?"
+
+    streamed = list(cached.get_streaming_chat_response("sys", "one two three"))
+    assert list(cached.get_streaming_chat_response("sys", "one two three")) == streamed
+
+    async def replay():
+        return [t async for t in cached.aget_streaming_chat_response("sys", "one two three")]
+    assert asyncio.run(replay()) == streamed
+
+    # Failed calls are not cached
+    assert cached.get_chat_response("sys", "slow", timeout=0.2).startswith("OpenAI Error:")
+    stats = cache.stats.snapshot()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (3, 4, 3)
+    assert stats["saved_latency_ms"] > 0
+
+
+def test_sqlite_cache_ttl_and_size_eviction(tmp_path):
+    from app.services.llm_cache import CachedResponse, SQLiteResponseCache
+    cache = SQLiteResponseCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, CachedResponse([key], 10.0))
+    assert cache.size() == 2 and cache.get("a") is None and cache.get("c").text == "c"
+
+    cache.ttl_seconds = -1
+    cache.set("d", CachedResponse(["d"], 10.0))
+    assert cache.get("d") is None
+    assert CachedResponse(["Hello there, Jane."], 1.0).replay_chunks() == ["Hello", " there,", " Jane."]
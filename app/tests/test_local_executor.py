@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.db import crud
+from app.orchestration import pipeline as pipeline_module
+from app.orchestration.pipeline import ATSPipeline, ExecutorBusy, recover_interrupted_resumes
+from app.services import resume_parser
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def tasks(monkeypatch):
+    """Register test task bodies; ``gate`` holds ``blocked`` tasks until set."""
+    gate = threading.Event()
+
+    def blocked(pipeline, value):
+        assert gate.wait(5)
+        return value
+
+    def boom(pipeline):
+        raise ValueError("bad input")
+
+    monkeypatch.setitem(pipeline_module.LOCAL_TASKS, "blocked", blocked)
+    monkeypatch.setitem(pipeline_module.LOCAL_TASKS, "boom", boom)
+    return gate
+
+
+def test_backpressure_and_task_states(tasks):
+    executor = ATSPipeline(max_queued=2, io_threads=1)
+    first = executor.submit("blocked", 1)
+    second = executor.submit("blocked", 2)
+    with pytest.raises(ExecutorBusy):
+        executor.submit("blocked", 3)
+    _wait_for(lambda: executor.status(first)["state"] == "STARTED")
+    assert executor.status(second)["state"] == "PENDING"
+
+    tasks.set()
+    _wait_for(lambda: executor.status(second)["state"] == "SUCCESS")
+    assert executor.status(first)["result"] == 1
+
+    failed = executor.submit("boom")
+    _wait_for(lambda: executor.status(failed)["state"] == "FAILURE")
+    assert executor.status(failed)["error"] == "ValueError: bad input"
+    executor.shutdown()
+
+
+def test_shutdown_finishes_running_and_revokes_queued(tasks):
+    executor = ATSPipeline(max_queued=5, io_threads=1)
+    running = executor.submit("blocked", "done")
+    queued = executor.submit("blocked", "never")
+    _wait_for(lambda: executor.status(running)["state"] == "STARTED")
+
+    threading.Timer(0.1, tasks.set).start()
+    executor.shutdown(wait=True)
+    assert executor.status(running)["state"] == "SUCCESS"
+    assert executor.status(queued)["state"] == "REVOKED"
+    with pytest.raises(ExecutorBusy):
+        executor.submit("blocked", 1)
+
+
+def test_submit_racing_shutdown_releases_its_slot(tasks):
+    executor = ATSPipeline(max_queued=1, io_threads=1)
+    tasks.set()
+    done = executor.submit("blocked", 1)
+    _wait_for(lambda: executor.status(done)["state"] == "SUCCESS")
+    executor._io.shutdown()              # closed between the checks and _io.submit
+
+    with pytest.raises(ExecutorBusy):
+        executor.submit("blocked", 2)
+    assert list(executor._tasks) == [done]
+    assert executor._slots.acquire(blocking=False)
+    executor.shutdown()
+
+
+def _crash():
+    os._exit(1)
+
+
+def test_broken_process_pool_is_replaced(monkeypatch):
+    executor = ATSPipeline(cpu_processes=1)
+    # No warm-up initializer: it would open parser and DB pools
+    monkeypatch.setattr(executor, "_new_cpu_pool", lambda: ProcessPoolExecutor(
+        1, mp_context=multiprocessing.get_context("spawn")))
+    with pytest.raises(BrokenProcessPool):
+        executor.submit_cpu(_crash).result(timeout=30)
+    assert executor.run_cpu(pow, 2, 10) == 1024
+    executor.shutdown()
+
+
+def _worker_state():
+    import sys
+    from app.db import dbase
+    from app.services import parser_pool
+    pool = parser_pool._parser_pool
+    return ("app.services.scorer" in sys.modules,
+            bool(pool and pool._workers), dbase._pool is not None)
+
+
+def test_analysis_pool_is_small_and_starts_no_parser_or_db_pool():
+    executor = ATSPipeline(cpu_processes=2, analysis_processes=8)
+    assert executor.analysis_processes == 2
+    try:
+        # warmed up, but without parser subprocesses or DB connections
+        assert executor.submit_analysis(_worker_state).result(timeout=60) == (True, False, False)
+        assert executor._cpu is None
+    finally:
+        executor.shutdown()
+
+
+def test_resume_processing_retries_like_celery(monkeypatch):
+    failures = []
+    monkeypatch.setattr(crud, "claim_resume_processing", lambda *a: "claimed")
+    monkeypatch.setattr(crud, "fail_resume_processing",
+                        lambda resume_id, error, final: failures.append(final))
+
+    def parse(path):
+        raise OSError("disk error")
+    monkeypatch.setattr(resume_parser, "parse_resume", parse)
+
+    executor = ATSPipeline(io_threads=1, max_retries=2, retry_delay=0.01)
+    first = executor.submit("process_resume_task", 7, "uploads/r.pdf")
+    _wait_for(lambda: len(failures) == 3)
+    assert failures == [False, False, True]
+    assert executor.status(first)["state"] == "RETRY"
+    _wait_for(lambda: any(r["state"] == "FAILURE" for r in executor._tasks.values()))
+    executor.shutdown()
+
+
+def test_recovery_resubmits_interrupted_resumes(monkeypatch):
+    pages = {0: [(3, "a.pdf"), (9, "b.pdf")], 9: [(12, "c.pdf")], 12: []}
+    monkeypatch.setattr(crud, "get_interrupted_resume_processing",
+                        lambda lease, after_id=0, limit=500: pages[after_id])
+    submitted = []
+
+    class Recorder:
+        def submit(self, task_name, *args, block=False):
+            submitted.append((task_name, args[0], os.path.basename(args[1])))
+
+    assert recover_interrupted_resumes(Recorder()) == 3
+    assert submitted == [("process_resume_task", 3, "a.pdf"),
+                         ("process_resume_task", 9, "b.pdf"),
+                         ("process_resume_task", 12, "c.pdf")]
@@ -0,0 +1,112 @@
+import pytest
+
+from app.services.parser_pool import ParserPool
+from app.services.resume_parser import ResumeParseError
+
+
+def _pdf(lines, pages=1):
+    """Smallest valid PDF pdfplumber will read: ``pages`` copies of one text block."""
+    body = "\n".join(f"({line}) '" for line in lines).encode("latin-1")
+    stream = b"BT /F1 10 Tf 40 800 Td 12 TL\n" + body + b"\nET"
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [" +
+               b" ".join(b"%d 0 R" % (5 + 2 * i) for i in range(pages)) + b"] /Count %d >>" % pages,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+               b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"]
+    for _ in range(pages):
+        objects += [b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                    b"/Resources << /Font << /F1 3 0 R >> >> /Contents 4 0 R >>", b"null"]
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+@pytest.fixture(scope="module")
+def files(tmp_path_factory):
+    d = tmp_path_factory.mktemp("resumes")
+    resume = _pdf(["Jane Doe", "Python developer 2019 - Present"])
+    paths = {
+        "resume":  d / "resume.pdf",
+        "long":    d / "long.pdf",
+        "corrupt": d / "corrupt.pdf",
+        "txt":     d / "resume.txt",
+    }
+    paths["resume"].write_bytes(resume)
+    paths["long"].write_bytes(_pdf(["Page text"], pages=12))
+    paths["corrupt"].write_bytes(resume[:120])
+    paths["txt"].write_text("plain")
+    return {k: str(v) for k, v in paths.items()}
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ParserPool(pool_size=1, timeout_seconds=20, max_pages=5, max_files_per_worker=3)
+    yield pool
+    pool.shutdown()
+
+
+def test_parses_and_caps_pages(pool, files):
+    parsed = pool.parse(files["resume"])
+    assert parsed.text == "Jane Doe Python developer 2019 - Present"
+    assert (parsed.pages, parsed.truncated) == (1, False)
+
+    parsed = pool.parse(files["long"])
+    assert (parsed.pages, parsed.truncated) == (5, True)
+
+
+def test_structured_failures(pool, files):
+    with pytest.raises(ResumeParseError) as err:
+        pool.parse(files["corrupt"])
+    assert err.value.reason == "corrupt"
+
+    with pytest.raises(ResumeParseError) as err:
+        pool.parse(files["txt"])
+    assert err.value.reason == "unsupported_format"
+
+    with pytest.raises(FileNotFoundError):
+        pool.parse(files["resume"] + ".missing")
+
+    # recycled after max_files_per_worker, still answering
+    for _ in range(4):
+        assert pool.parse(files["resume"]).pages == 1
+
+
+def test_limits_kill_the_worker_and_pool_recovers(files):
+    pool = ParserPool(pool_size=1, timeout_seconds=0.001)
+    try:
+        with pytest.raises(ResumeParseError) as err:
+            pool.parse(files["resume"])
+        assert err.value.reason == "timeout"
+
+        pool.timeout_seconds, pool.max_rss = 20, 1 << 20
+        with pytest.raises(ResumeParseError) as err:
+            pool.parse(files["resume"])
+        assert err.value.reason == "memory_limit"
+
+        pool.max_rss = 512 << 20
+        assert pool.parse(files["resume"]).pages == 1
+    finally:
+        pool.shutdown()
+
+
+def test_fast_backend_falls_back_when_text_is_short(files, monkeypatch):
+    from app.services import resume_parser
+
+    monkeypatch.setattr(resume_parser, "_configured_pdf_backend", lambda: ("pdfium", 200))
+    parsed = resume_parser.extract_pdf_text(files["resume"])
+    assert parsed.backend == "pdfplumber"           # 40 chars < 200 per page
+
+    monkeypatch.setattr(resume_parser, "_configured_pdf_backend", lambda: ("pdfium", 10))
+    fast = resume_parser.extract_pdf_text(files["resume"])
+    assert fast.backend == "pdfium"
+    assert fast.text == parsed.text
+
+    with pytest.raises(ResumeParseError) as err:
+        resume_parser.extract_resume_text(files["corrupt"])
+    assert err.value.reason == "corrupt"
@@ -0,0 +1,49 @@
+from app.services.resume_digest import (
+    build_resume_digest, estimate_tokens, fit_experience, fit_to_tokens, format_history,
+)
+
+
+def _resume(roles):
+    parts = ["Jane Doe | Backend Engineer | jane@example.com",
+             "Technical Skills: " + ", ".join(["Python", "Django", "PostgreSQL", "Docker"] * 10),
+             "Work Experience:"]
+    for i in range(roles):
+        parts.append(f"Senior Engineer, Company{i:02d}, Jan {2020 - 2 * i} - Dec {2022 - 2 * i}.")
+        parts += [f"Built Python services handling {n}M requests per day for team {i}." for n in range(6)]
+    parts.append("Education: M.Sc. Computer Science, TU Munich, 2008.")
+    parts.append("Hobbies: climbing, chess.")
+    return " ".join(parts)
+
+
+def test_digest_keeps_every_role_and_education_within_budget():
+    text = _resume(20)
+    digest = build_resume_digest(text, token_budget=600)
+
+    assert estimate_tokens(digest) <= 600 + 10
+    assert all(f"Company{i:02d}" in digest for i in range(20))
+    assert "TU Munich" in digest and "EDUCATION:" in digest
+    assert "SKILLS: languages: Python" in digest
+    assert "climbing" not in digest and "Technical Skills" not in digest
+    # Original case survives (spans come from normalised text)
+    assert "Jane Doe" in digest
+
+
+def test_short_resume_is_kept_whole():
+    text = _resume(1)
+    digest = build_resume_digest(text, token_budget=800)
+    assert digest.count("for team 0.") == 6
+    assert "…" not in digest
+
+
+def test_fitting_helpers():
+    assert fit_to_tokens("One. Two three four. Five six seven eight nine.", 6) == "One. Two three four. …"
+    experience = "Dev, A, 2019 - 2021. Did x. Did y. Dev, B, 2021 - present. Did z."
+    assert fit_experience(experience, 16) == "Dev, A, 2019 - 2021. Did x. … Dev, B, 2021 - present. …"
+
+
+def test_history_keeps_newest_turns_within_budget():
+    history = [{"user": f"question {i}?", "ai": "word " * 300} for i in range(8)]
+    formatted = format_history(history, token_budget=200)
+    assert estimate_tokens(formatted) <= 200
+    assert "question 7?" in formatted and "question 2?" not in formatted
+    assert format_history([]) == "First message."
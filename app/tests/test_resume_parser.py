@@ -0,0 +1,87 @@
+import os
+import zipfile
+
+import pytest
+from docx import Document
+
+from app.services.resume_parser import ResumeParseError, extract_docx_text, extract_resume_text
+
+_NS = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+       'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"')
+
+
+def _p(text):
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def _write_docx(path, body, header=None):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("word/document.xml", f"<w:document {_NS}><w:body>{body}</w:body></w:document>")
+        if header:
+            zf.writestr("word/header1.xml", f"<w:hdr {_NS}>{header}</w:hdr>")
+
+
+def test_reads_header_tables_and_text_boxes_in_order(tmp_path):
+    text_box = "<w:txbxContent>" + _p("Skills: Kafka") + "</w:txbxContent>"
+    body = (
+        _p("Summary")
+        + "<w:tbl><w:tr><w:tc>" + _p("Languages") + "</w:tc><w:tc>" + _p("Python")
+        + "</w:tc></w:tr></w:tbl>"
+        + "<w:p><w:r><mc:AlternateContent><mc:Choice>" + text_box
+        + "</mc:Choice><mc:Fallback>" + text_box + "</mc:Fallback></mc:AlternateContent>"
+        + "</w:r></w:p>"
+        + "<w:p><w:r><w:t>Go</w:t><w:tab/><w:t>AWS</w:t></w:r></w:p>"
+    )
+    path = tmp_path / "resume.docx"
+    _write_docx(path, body, header=_p("Jane Doe"))
+
+    parsed = extract_docx_text(str(path))
+    assert parsed.text == "Jane Doe Summary Languages Python Skills: Kafka Go AWS"
+
+    capped = extract_docx_text(str(path), max_chars=12)
+    assert capped.truncated and capped.text == "Jane Doe Sum"
+
+
+def test_body_paragraphs_match_python_docx(tmp_path):
+    doc = Document()
+    for line in ("Work Experience", "Backend Engineer 2019 - Present", "Built APIs in Python"):
+        doc.add_paragraph(line)
+    path = str(tmp_path / "plain.docx")
+    doc.save(path)
+
+    legacy = " ".join(p.text for p in Document(path).paragraphs)
+    assert extract_docx_text(path).text == legacy
+
+
+def test_broken_docx_is_corrupt(tmp_path):
+    path = tmp_path / "broken.docx"
+    path.write_bytes(b"PK\x03\x04 not really a zip")
+    with pytest.raises(ResumeParseError) as err:
+        extract_resume_text(str(path))
+    assert err.value.reason == "corrupt"
+
+
+def test_parse_resume_cached_invalidates_on_file_change(tmp_path, monkeypatch):
+    from app.services import resume_parser
+
+    calls = []
+    monkeypatch.setattr(resume_parser, "_parsed_text_cache", None)
+    monkeypatch.setattr(resume_parser, "parse_resume",
+                        lambda path: calls.append(path) or open(path).read())
+    path = tmp_path / "resume.txt"
+    path.write_text("Python developer")
+
+    assert resume_parser.parse_resume_cached(str(path)) == "Python developer"
+    assert resume_parser.parse_resume_cached(str(path)) == "Python developer"
+    assert len(calls) == 1
+
+    path.write_text("Python and Go developer")              # size changes
+    assert resume_parser.parse_resume_cached(str(path)) == "Python and Go developer"
+    path.write_text("Rust and Go developer!!")              # same size, newer mtime
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    assert resume_parser.parse_resume_cached(str(path)) == "Rust and Go developer!!"
+    assert len(calls) == 3
+
+    path.unlink()
+    with pytest.raises(FileNotFoundError):
+        resume_parser.parse_resume_cached(str(path))
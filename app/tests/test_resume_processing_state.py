@@ -0,0 +1,166 @@
+import psycopg2
+import pytest
+
+from app.db import crud, dbase
+from app.services import resume_parser
+from app.workers import tasks
+
+LEASE = 600
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Stub the crud state machine; records every call as ``(name, args)``."""
+    log = []
+    state = {"queued": True, "claim": "claimed"}
+
+    def record(name, result=None):
+        def stub(*args, **kwargs):
+            log.append((name, args + tuple(kwargs.values())))
+            return state.get(result) if result else None
+        return stub
+
+    monkeypatch.setattr(crud, "mark_resume_queued", record("mark_resume_queued", "queued"))
+    monkeypatch.setattr(crud, "claim_resume_processing", record("claim_resume_processing", "claim"))
+    monkeypatch.setattr(crud, "complete_resume_processing", record("complete_resume_processing"))
+    monkeypatch.setattr(crud, "fail_resume_processing", record("fail_resume_processing"))
+    monkeypatch.setattr(tasks, "submit_task", lambda task, *args, queue=None: "task-1")
+    monkeypatch.setattr(tasks.process_resume_task, "update_state", lambda **kwargs: None)
+    return log, state
+
+
+def _names(log):
+    return [name for name, _ in log]
+
+
+def test_enqueue_coalesces_when_already_queued(calls):
+    log, state = calls
+    assert tasks.enqueue_resume_processing(1, "uploads/a.pdf") == "task-1"
+
+    state["queued"] = False
+    assert tasks.enqueue_resume_processing(1, "uploads/a.pdf") is None
+    assert _names(log) == ["mark_resume_queued", "mark_resume_queued"]
+
+
+def test_enqueue_failure_marks_the_resume_failed(calls, monkeypatch):
+    log, _ = calls
+
+    def broker_down(task, *args, queue=None):
+        raise ConnectionError("broker unreachable")
+
+    monkeypatch.setattr(tasks, "submit_task", broker_down)
+    with pytest.raises(ConnectionError):
+        tasks.enqueue_resume_processing(1, "uploads/a.pdf")
+    assert log[-1] == ("fail_resume_processing", (1, "enqueue failed: broker unreachable", True))
+
+
+@pytest.mark.parametrize("outcome", ["completed", "in_progress", "not_found"])
+def test_task_skips_unclaimed_resumes(calls, monkeypatch, outcome):
+    log, state = calls
+    state["claim"] = outcome
+    monkeypatch.setattr(resume_parser, "parse_resume", lambda path: pytest.fail("parsed"))
+
+    result = tasks.process_resume_task.apply(args=(1, "uploads/a.pdf")).get()
+    assert result == {"status": "skipped", "reason": outcome, "resume_id": 1}
+    assert _names(log) == ["claim_resume_processing"]
+
+
+def test_task_fails_after_the_last_retry(calls, monkeypatch):
+    log, _ = calls
+
+    def unreadable(path):
+        raise ValueError("corrupt pdf")
+
+    monkeypatch.setattr(resume_parser, "parse_resume", unreadable)
+    with pytest.raises(ValueError):
+        tasks.process_resume_task.apply(args=(1, "uploads/a.pdf")).get()
+
+    finals = [args[2] for name, args in log if name == "fail_resume_processing"]
+    assert finals == [False] * tasks.RESUME_MAX_RETRIES + [True]
+    assert _names(log).count("claim_resume_processing") == tasks.RESUME_MAX_RETRIES + 1
+    assert "complete_resume_processing" not in _names(log)
+
+
+# ── SQL state machine against a real database ────────────────
+
+@pytest.fixture
+def resume_id():
+    try:
+        psycopg2.connect(connect_timeout=2, **dbase._connection_params()).close()
+    except psycopg2.OperationalError:
+        pytest.skip("PostgreSQL not reachable (DATABASE_* settings)")
+    dbase.close_db_pool()
+    dbase.init_db_pool(minconn=1, maxconn=2)
+    conn = dbase.get_db_connection()
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('resumes'), EXISTS (SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = 'resumes' AND column_name = 'processing_status');")
+        table, migrated = cur.fetchone()
+        if not (table and migrated):
+            conn.close()
+            dbase.close_db_pool()
+            pytest.skip("resumes.processing_* columns missing (add_resume_processing_status)")
+        cur.execute("INSERT INTO resumes (filename, file_hash) VALUES ('state-test.pdf', 'abc') RETURNING id;")
+        rid = cur.fetchone()[0]
+    conn.commit()
+    conn.close()
+    yield rid
+    conn = dbase.get_db_connection()
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM resumes WHERE id = %s;", (rid,))
+    conn.commit()
+    conn.close()
+    dbase.close_db_pool()
+
+
+def _row(rid):
+    conn = dbase.get_db_connection()
+    with conn.cursor() as cur:
+        cur.execute("SELECT processing_status, processing_attempts FROM resumes WHERE id = %s;", (rid,))
+        row = cur.fetchone()
+    conn.close()
+    return row
+
+
+def _age_lease(rid, seconds):
+    conn = dbase.get_db_connection()
+    with conn.cursor() as cur:
+        cur.execute("UPDATE resumes SET processing_updated_at = CURRENT_TIMESTAMP - %s * INTERVAL '1 second' "
+                    "WHERE id = %s;", (seconds, rid))
+    conn.commit()
+    conn.close()
+
+
+def test_mark_queued_coalesces_until_the_lease_expires(resume_id):
+    assert crud.mark_resume_queued(resume_id, "v1", LEASE)
+    assert not crud.mark_resume_queued(resume_id, "v1", LEASE)
+    assert crud.mark_resume_queued(resume_id, "v2", LEASE)      # new version re-queues
+
+    _age_lease(resume_id, LEASE + 1)
+    assert crud.mark_resume_queued(resume_id, "v2", LEASE)
+    assert _row(resume_id) == ("queued", 0)
+
+
+def test_claim_skips_completed_and_takes_over_expired_leases(resume_id):
+    assert crud.claim_resume_processing(resume_id, "v1", LEASE) == "claimed"
+    assert crud.claim_resume_processing(resume_id, "v1", LEASE) == "in_progress"
+
+    _age_lease(resume_id, LEASE + 1)                            # worker died mid-task
+    assert crud.claim_resume_processing(resume_id, "v1", LEASE) == "claimed"
+    assert _row(resume_id) == ("processing", 2)
+
+    crud.complete_resume_processing(resume_id, {"skills": [], "years_of_experience": 0})
+    assert crud.claim_resume_processing(resume_id, "v1", LEASE) == "completed"
+    assert not crud.mark_resume_queued(resume_id, "v1", LEASE)
+    assert crud.claim_resume_processing(resume_id, "v2", LEASE) == "claimed"
+    assert crud.claim_resume_processing(-1, "v1", LEASE) == "not_found"
+
+
+def test_failure_requeues_until_final(resume_id):
+    assert crud.claim_resume_processing(resume_id, "v1", LEASE) == "claimed"
+    crud.fail_resume_processing(resume_id, "ValueError: corrupt pdf", final=False)
+    assert _row(resume_id) == ("queued", 1)
+    assert crud.claim_resume_processing(resume_id, "v1", LEASE) == "claimed"
+    crud.fail_resume_processing(resume_id, "ValueError: corrupt pdf", final=True)
+    assert _row(resume_id) == ("failed", 2)
+    assert crud.mark_resume_queued(resume_id, "v1", LEASE)      # re-upload retries a failed row
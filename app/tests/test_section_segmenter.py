@@ -0,0 +1,49 @@
+from app.services.scorer import normalize_text
+from app.services.section_segmenter import (
+    section_text,
+    sections_from_profile,
+    sections_to_profile,
+    segment_sections,
+)
+
+
+def _named(tn, sections):
+    return {name: section_text(tn, sections, [name]).strip() for name in sections}
+
+
+def test_flattened_resume_is_split_on_inline_headings():
+    tn = normalize_text(
+        "Jane Doe jane@x.io Career Objective: build things. "
+        "Work Experience Acme 2019 - Present, led a team. "
+        "Education: B.Tech 2015 - 2019 "
+        "Technical skills: Python, SQL Projects: chat app"
+    )
+    named = _named(tn, segment_sections(tn))
+    assert named["header"] == "jane doe jane@x.io"
+    assert named["summary"] == "build things."
+    assert named["experience"] == "acme 2019 - present, led a team."
+    assert named["education"] == "b.tech 2015 - 2019"
+    assert named["skills"] == "python, sql"
+    assert named["projects"] == "chat app"
+
+
+def test_generic_words_need_a_colon_or_their_own_line():
+    tn = normalize_text("Summary\nShipped projects with strong education focus\nSkills\nGo")
+    named = _named(tn, segment_sections(tn))
+    assert set(named) == {"summary", "skills"}
+    assert named["summary"] == "shipped projects with strong education focus"
+
+
+def test_prose_mentions_are_not_headings():
+    tn = normalize_text("Over 8 years of work experience applying my technical skills.")
+    assert segment_sections(tn) == {"header": [(0, len(tn))]}
+
+
+def test_profile_round_trip_checks_version_and_length():
+    tn = normalize_text("Experience: Acme 2019 - 2021\nEducation: BSc")
+    sections = segment_sections(tn)
+    stored = sections_to_profile(sections)
+    assert sections_from_profile(stored, tn) == sections
+    assert sections_from_profile(dict(stored, version=0), tn) is None
+    assert sections_from_profile(stored, tn[:10]) is None
+    assert sections_from_profile(None, tn) is None
@@ -0,0 +1,42 @@
+from app.services.scorer import (
+    ALL_CANONICAL,
+    FAMILY_PEERS,
+    _get_inferred_skills,
+    family_member_present,
+    family_scan_set,
+    match_skills,
+    normalize_text,
+    skill_mask,
+    skills_in_mask,
+)
+
+
+def test_inference_is_transitive():
+    # kafka -> microservices -> rest api / system design
+    assert _get_inferred_skills({"kafka"}) == {"microservices", "rest api", "system design"}
+    assert _get_inferred_skills({"nextjs"}) == {"react", "javascript"}
+    assert _get_inferred_skills({"sql"}) == set()
+
+
+def test_family_peers_are_canonical_and_exclude_the_skill():
+    assert "kafka" not in FAMILY_PEERS["kafka"]
+    assert "rabbitmq" in FAMILY_PEERS["kafka"]
+    for peers in FAMILY_PEERS.values():
+        assert skills_in_mask(skill_mask(peers)) == set(peers)
+
+
+def test_family_scan_set_covers_peers_outside_the_taxonomy():
+    scan = family_scan_set(["Prometheus"])
+    assert ALL_CANONICAL <= scan
+    assert "grafana" in scan and "grafana" not in ALL_CANONICAL
+
+
+def test_family_match_uses_detected_peers():
+    text = "Monitoring with Grafana dashboards and Terraform"
+    tn = normalize_text(text)
+    assert family_member_present("Prometheus", tn)
+    matched, missing, _, match_types = match_skills(
+        text, ["Prometheus", "Pulumi", "Cassandra"], [], {}
+    )
+    assert match_types == {"prometheus": "family", "pulumi": "family"}
+    assert missing == ["Cassandra"]
@@ -0,0 +1,50 @@
+import json
+import re
+
+from app.services import scorer
+from app.services.skill_taxonomy import (
+    DEFAULT_SOURCE_PATH,
+    alias_pattern,
+    build_artifact,
+    load_taxonomy,
+)
+
+
+def _copy_source(tmp_path, **overrides):
+    with open(DEFAULT_SOURCE_PATH, encoding="utf-8") as f:
+        source = json.load(f)
+    source.update(overrides)
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps(source), encoding="utf-8")
+    return str(path)
+
+
+def test_artifact_round_trips(tmp_path):
+    source_path = _copy_source(tmp_path)
+    built = build_artifact(source_path)
+    assert (tmp_path / "taxonomy.pkl").exists()
+    assert load_taxonomy(source_path) == built
+
+
+def test_stale_artifact_is_recompiled(tmp_path):
+    source_path = _copy_source(tmp_path)
+    build_artifact(source_path)
+    _copy_source(tmp_path, version="next")
+    assert load_taxonomy(source_path)["version"] == "next"
+
+
+def test_alias_regex_matches_any_single_alias():
+    texts = ["built apis in golang and node", "c# / .net core", "used js and ts daily",
+             "gopher", "reactjs + redux", "sql server dba"]
+    for canonical, aliases in scorer.SKILL_SYNONYMS.items():
+        for text in texts:
+            expected = any(re.search(alias_pattern(a), text) for a in aliases)
+            assert scorer.skill_present_in_text(canonical, text) == expected, (canonical, text)
+    assert scorer.skill_present_in_text("Grafana", "grafana dashboards")
+
+
+def test_results_carry_taxonomy_version():
+    result = scorer.score_resume("Python developer", {"skills": ["Python", "Kafka"]}, detail=False)
+    assert result["matched_skills"] == ["Python"]
+    assert result["missing_skills"] == ["Kafka"]
+    assert result["insights"]["taxonomy_version"] == scorer.TAXONOMY_VERSION
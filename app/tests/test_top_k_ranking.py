@@ -0,0 +1,42 @@
+from app.services import job_ranker
+
+JOB = (7, "Backend Engineer", ["Python", "Django", "PostgreSQL", "Docker", "Kubernetes"],
+       ["api", "backend"], 3, None, True,
+       [{"skill": "python", "priority": 0.9}, {"skill": "kubernetes", "priority": 0.2}])
+
+_RESUMES = {
+    1: "Senior backend engineer, 6 years. Python, Django, PostgreSQL, Docker, Kubernetes, REST APIs.",
+    2: "Frontend developer with 2 years of React and TypeScript. Some Node.js.",
+    3: "Python developer, 4 years building Flask and FastAPI services on MySQL.",
+    4: "Backend engineer: Django REST framework, PostgreSQL, Redis, Celery, Docker. 5 years.",
+    5: "Data analyst. Excel, SQL, Tableau. 1 year experience.",
+    6: "Work Experience: Site Reliability Engineer, Acme, 2015 - 2023. EKS, Helm, Terraform, "
+       "AWS, Postgres, Go. Projects: built an internal PaaS. Education: B.Sc. Computer Science.",
+    7: "Junior QA tester. Selenium, Cypress, manual test plans. 1 year.",
+    8: "Tech lead, 12 years. Python, Django, Flask, Postgres, MongoDB, Docker, K8s, GCP, "
+       "Kafka, GraphQL, microservices, mentoring a team of 8. M.Sc. Computer Science.",
+}
+_YEARS = {1: 6.0, 2: 2.0, 3: 4.0, 4: 5.0, 5: 1.0, 6: 8.0, 7: 1.0, 8: 12.0}
+
+
+def _fake_load(resume_id, filename, skills, uploads_dir):
+    return _RESUMES[resume_id], _YEARS[resume_id]
+
+
+def test_top_k_matches_full_mode(monkeypatch):
+    monkeypatch.setattr(job_ranker, "_load_resume_text", _fake_load)
+    resumes = [(rid, f"r{rid}.pdf") for rid in _RESUMES]
+
+    full = job_ranker.rank_resumes_for_job(JOB, resumes)
+    top = job_ranker.rank_top_k_for_job(JOB, resumes, top_k=2)
+
+    assert [r["resume_id"] for r in top] == [r["resume_id"] for r in full]
+    for t, f in zip(top, full):
+        assert (t["score"], t["raw_score"], t["rank_position"], t["comparative_rank"], t["role_fit"]) == \
+               (f["score"], f["raw_score"], f["rank_position"], f["comparative_rank"], f["role_fit"])
+        if t["rank_position"] <= 2 or t["score"] >= job_ranker.TOP_K_TIER_FLOOR:
+            assert t["insights"] == f["insights"] and t["explanation"] == f["explanation"]
+        else:
+            assert t["insights"]["insights_pending"]
+            assert t["insights"]["pool_size"] == len(full)
+    assert any(r["insights"].get("insights_pending") for r in top)
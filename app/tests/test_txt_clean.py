@@ -0,0 +1,51 @@
+import random
+import re
+
+from app.utilities.txt_clean import clean_text, normalize_for_matching
+
+
+def _legacy_clean(text):
+    if not text:
+        return ""
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"[^\x20-\x7E]", " ", text)
+    text = re.sub(r"[.\-]{2,}", " ", text)
+    return text.strip()
+
+
+def _legacy_normalize(text):
+    t = text.lower()
+    t = re.sub(r'[–—]', '-', t)
+    t = re.sub(r'[•·▸▪■]', ' ', t)
+    t = re.sub(r'[ \t]+', ' ', t)
+    t = re.sub(r'\n{2,}', '\n', t)
+    return t
+
+
+_ALPHABET = (
+    "aZ09 .-..--\t\n\r\x0b\x0c\x00\x07\x1f\x7f\x85\xa0 　"
+    "–—•·▸▪■éİßﬁ\U0001f600"
+)
+
+
+def test_matches_legacy_passes_on_random_text():
+    rng = random.Random(32)
+    for _ in range(3000):
+        text = "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 40)))
+        assert clean_text(text) == _legacy_clean(text), repr(text)
+        assert normalize_for_matching(text) == _legacy_normalize(text), repr(text)
+        assert normalize_for_matching(clean_text(text)) == _legacy_normalize(_legacy_clean(text)), repr(text)
+
+
+def test_matches_legacy_passes_on_ascii_text():
+    rng = random.Random(7)
+    for _ in range(2000):
+        text = "".join(rng.choice("aB. -\t\n\r\x00\x7f") for _ in range(rng.randint(0, 30)))
+        assert clean_text(text) == _legacy_clean(text), repr(text)
+        assert normalize_for_matching(text) == _legacy_normalize(text), repr(text)
+
+
+def test_clean_text_examples():
+    assert clean_text("") == ""
+    assert clean_text("  Python••Go ... C++ -- Rust\n") == "Python  Go   C++   Rust"
+    assert normalize_for_matching("Led\t\tteam – Kafka\n\n\nAWS") == "led team - kafka\naws"
@@ -1,5 +1,32 @@
+import codecs
 import re
 
+# Runs of dots or dashes ("......", "----") become one space.
+_DOT_RUNS = re.compile(r"[.\-]{2,}")
+
+# Byte table for the non-printable pass: printable ASCII kept, anything else
+# (control characters) becomes a space.
+_PRINTABLE_BYTES = bytes(b if 0x20 <= b <= 0x7E else 0x20 for b in range(256))
+
+
+def _non_ascii_to_spaces(err: UnicodeEncodeError):
+    # One space per character, exactly like re.sub(r"[^\x20-\x7E]", " ")
+    return " " * (err.end - err.start), err.end
+
+
+codecs.register_error("txt_clean.space", _non_ascii_to_spaces)
+
+# Matching normalisation (scorer Phase 4)
+_MATCH_CHARS = re.compile("[–—•·▸▪■\t]")
+_MATCH_MAP = {
+    "–": "-", "—": "-",                           # unicode dashes -> hyphen
+    "•": " ", "·": " ", "▸": " ", "▪": " ", "■": " ",  # bullets
+    "\t": " ",
+}
+_SPACE_RUNS   = re.compile(r" {2,}")
+_NEWLINE_RUNS = re.compile(r"\n{2,}")
+
+
 def clean_text(text: str) -> str:
     """
     Cleans resume text by removing noise and normalizing spacing
@@ -8,13 +35,29 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
 
-    # Remove extra whitespace
-    text = re.sub(r"\s+", " ", text)
-
-    # Remove non-printable characters
-    text = re.sub(r"[^\x20-\x7E]", " ", text)
+    # Collapse whitespace (str.split() and re's \s share one definition)
+    text = " ".join(text.split())
 
     # Remove repeated dots or dashes
-    text = re.sub(r"[.\-]{2,}", " ", text)
+    text = _DOT_RUNS.sub(" ", text)
+
+    # Remove non-printable characters: one encode + one bytes.translate
+    text = text.encode("ascii", "txt_clean.space").translate(_PRINTABLE_BYTES).decode("ascii")
 
     return text.strip()
+
+
+def normalize_for_matching(text: str) -> str:
+    """
+    Lowercase, standardise punctuation and collapse whitespace for skill and
+    keyword matching. ``scorer.normalize_text`` is the cached entry point.
+
+    Text already through :func:`clean_text` is printable ASCII, so only the
+    space-run pass applies to it.
+    """
+    t = text.lower()
+    if not (t.isascii() and t.isprintable()):
+        t = _MATCH_CHARS.sub(lambda m: _MATCH_MAP[m.group()], t)
+        t = _NEWLINE_RUNS.sub("\n", t)
+    return _SPACE_RUNS.sub(" ", t)
+
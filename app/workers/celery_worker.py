@@ -1,6 +1,12 @@
+import logging
+import sys
+
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
+from kombu import Exchange, Queue
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
 celery_app = Celery(
@@ -10,6 +16,18 @@ celery_app = Celery(
     include=["app.workers.tasks"],
 )
 
+# ── Queues ───────────────────────────────────────────────────
+# interactive   live traffic: candidate applications, job profiling
+# bulk_ingest   HR batch uploads (up to 150 files per request)
+# ranking       distributed ranking chords (score_chunk + finalize)
+# maintenance   cleanup and other housekeeping
+QUEUE_INTERACTIVE = "interactive"
+QUEUE_BULK_INGEST = "bulk_ingest"
+QUEUE_RANKING     = "ranking"
+QUEUE_MAINTENANCE = "maintenance"
+
+_exchange = Exchange("ats", type="direct")
+
 celery_app.conf.update(
     task_track_started=True,
     task_serializer="json",
@@ -22,13 +40,98 @@ celery_app.conf.update(
     task_time_limit=300,          # Hard kill after 5 minutes
     task_soft_time_limit=240,     # Raise SoftTimeLimitExceeded at 4 min (allows graceful cleanup)
 
+    # ── Routing ──────────────────────────────────────────────
+    # A task goes to its queue below unless the caller passes queue=...
+    # (the HR batch upload sends process_resume_task to bulk_ingest).
+    task_queues=[
+        Queue(name, _exchange, routing_key=name)
+        for name in (QUEUE_INTERACTIVE, QUEUE_BULK_INGEST, QUEUE_RANKING, QUEUE_MAINTENANCE)
+    ],
+    task_default_queue=QUEUE_INTERACTIVE,
+    task_default_exchange=_exchange.name,
+    task_default_routing_key=QUEUE_INTERACTIVE,
+    task_routes={
+        "process_resume_task":   {"queue": QUEUE_INTERACTIVE},
+        "process_job_task":      {"queue": QUEUE_INTERACTIVE},
+        "score_chunk_task":      {"queue": QUEUE_RANKING},
+        "finalize_ranking_task": {"queue": QUEUE_RANKING},
+        "cleanup_resumes_task":  {"queue": QUEUE_MAINTENANCE},
+        "refresh_upload_rollup_task": {"queue": QUEUE_MAINTENANCE},
+    },
+
+    # ── Periodic (celery -A app.workers.celery_worker beat) ──
+    # The dashboard rollup is kept current by triggers; recomputing the
+    # recent days hourly repairs anything a bulk load bypassed.
+    beat_schedule={
+        "refresh-upload-rollup": {"task": "refresh_upload_rollup_task", "schedule": 3600.0},
+    },
+
     # ── Concurrency ──────────────────────────────────────────
+    # Defaults for a single worker consuming every queue. In production run
+    # one worker per queue with its own profile (see WORKER_PROFILES):
+    #   python -m app.workers.celery_worker bulk_ingest
     # Windows only supports --pool=solo (single-threaded).
-    # On Linux/production, run with prefork for true parallelism:
-    #   celery -A app.workers.celery_worker worker --pool=prefork --concurrency=4
     worker_concurrency=4,         # Number of concurrent worker processes (Linux prefork)
-    worker_prefetch_multiplier=2, # Each worker pre-fetches 2 tasks from Redis
+    worker_prefetch_multiplier=1, # Don't let one worker hoard a 150-file batch
+
+    # ── Child recycling ──────────────────────────────────────
+    # pdfplumber/pdfminer keep growing the heap (font and layout caches)
+    # when files are parsed in-process (PARSER_POOL_SIZE=0), and the
+    # per-process caches only ever fill up. Replace a child after N tasks
+    # or once its RSS passes the limit (checked after each task).
+    worker_max_tasks_per_child=settings.WORKER_MAX_TASKS_PER_CHILD,
+    worker_max_memory_per_child=settings.WORKER_MAX_MEMORY_PER_CHILD_MB * 1024,   # KiB
+    worker_proc_alive_timeout=30, # Warm-up runs before a child reports ready
 
-    # ── Rate limiting (prevents Groq/LLM API throttling) ─────
-    task_default_rate_limit="30/m",  # Max 30 tasks per minute globally
+    # ── Rate limiting ────────────────────────────────────────
+    # Per task, not global: only LLM-backed tasks carry a rate_limit
+    # (see tasks.py), so CPU-only parsing and scoring are never throttled.
 )
+
+
+@worker_process_init.connect
+def _warm_up_child(**_):
+    """Preload taxonomy, regexes and parser workers; open this child's DB pool."""
+    from app.workers.warmup import warm_up_process
+    timings = warm_up_process(db_pool_max=settings.WORKER_DB_POOL_MAX)
+    logger.info("Worker child warmed up: %s", timings)
+
+
+@worker_process_shutdown.connect
+def _release_child(**_):
+    from app.db.dbase import close_db_pool
+    from app.services.parser_pool import shutdown_parser_pool
+    shutdown_parser_pool()
+    close_db_pool()
+
+
+# Per-queue worker settings. Interactive work is short and latency-bound:
+# a couple of processes that prefetch a little. Bulk ingest and ranking
+# chunks are long and CPU-bound: one process per core, no prefetch, so a
+# batch never sits reserved behind a busy process.
+WORKER_PROFILES = {
+    QUEUE_INTERACTIVE: {"concurrency": 2, "prefetch_multiplier": 4},
+    QUEUE_BULK_INGEST: {"concurrency": 4, "prefetch_multiplier": 1},
+    QUEUE_RANKING:     {"concurrency": 4, "prefetch_multiplier": 1},
+    QUEUE_MAINTENANCE: {"concurrency": 1, "prefetch_multiplier": 1},
+}
+
+
+def worker_argv(queue: str) -> list:
+    """``celery worker`` arguments for a worker dedicated to one queue."""
+    profile = WORKER_PROFILES[queue]
+    return [
+        "worker",
+        "--queues", queue,
+        "--hostname", f"{queue}@%h",
+        "--concurrency", str(profile["concurrency"]),
+        "--prefetch-multiplier", str(profile["prefetch_multiplier"]),
+        "--loglevel", "INFO",
+    ]
+
+
+if __name__ == "__main__":
+    # python -m app.workers.celery_worker <queue> [extra celery worker options]
+    if len(sys.argv) < 2 or sys.argv[1] not in WORKER_PROFILES:
+        sys.exit(f"usage: python -m app.workers.celery_worker {{{','.join(WORKER_PROFILES)}}}")
+    celery_app.worker_main(worker_argv(sys.argv[1]) + sys.argv[2:])
@@ -4,43 +4,80 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Resume processing retries; the local executor (TASK_BACKEND=local) uses the same
+RESUME_MAX_RETRIES = 3
+RESUME_RETRY_COUNTDOWN_SECONDS = 30
 
-@celery_app.task(bind=True, name="process_resume_task")
+
+@celery_app.task(bind=True, name="process_resume_task", max_retries=RESUME_MAX_RETRIES)
 def process_resume_task(self, resume_id: int, file_path: str):
     """
     Background task to parse and profile a resume.
     Updates the DB record with extracted data once done.
+
+    Idempotent: the task first claims the resume in its DB row (keyed by
+    file hash + processing version). A resume already profiled for the
+    current version is skipped, and one another task is working on is left
+    to that task, so duplicate deliveries and re-sent files cost one query.
     """
+    from app.core.config import get_settings
+    from app.db.crud import claim_resume_processing, complete_resume_processing, fail_resume_processing
+    from app.orchestration.pipeline import processing_version
+
+    outcome = claim_resume_processing(
+        resume_id, processing_version(), get_settings().RESUME_PROCESSING_LEASE_SECONDS
+    )
+    if outcome != "claimed":
+        logger.info(f"Skipping resume_id={resume_id}: {outcome}")
+        return {"status": "skipped", "reason": outcome, "resume_id": resume_id}
+
     try:
         self.update_state(state="PROGRESS", meta={"step": "parsing"})
 
+        from app.orchestration.pipeline import build_candidate_profile
         from app.services.resume_parser import parse_resume
-        from app.services.scorer import extract_years_of_experience, extract_skills
 
         text = parse_resume(file_path)
-        experience = extract_years_of_experience(text)
-        skills = extract_skills(text)
+        candidate_profile = build_candidate_profile(text, file_path)
 
-        candidate_profile = {
-            "parsed_text": text,
-            "years_of_experience": experience,
-            "skills": skills,
-            "filename": file_path.split("/")[-1],
-        }
-
-        update_resume_with_profile(resume_id, candidate_profile)
+        complete_resume_processing(resume_id, candidate_profile)
 
         return {"status": "completed", "resume_id": resume_id}
 
     except Exception as exc:
         logger.error(f"Resume processing failed for resume_id={resume_id}: {exc}")
-        raise self.retry(exc=exc, countdown=30, max_retries=3)
+        final = self.request.retries >= self.max_retries
+        fail_resume_processing(resume_id, f"{type(exc).__name__}: {exc}", final=final)
+        if final:
+            raise
+        raise self.retry(exc=exc, countdown=RESUME_RETRY_COUNTDOWN_SECONDS)
 
 
-@celery_app.task(bind=True, name="process_job_task")
+def enqueue_resume_processing(resume_id: int, file_path: str, queue: str = None):
+    """
+    Queue process_resume_task for a resume unless its current work is already
+    completed, queued or running. Returns the task id, or None when coalesced.
+    """
+    from app.core.config import get_settings
+    from app.db.crud import fail_resume_processing, mark_resume_queued
+    from app.orchestration.pipeline import processing_version
+
+    if not mark_resume_queued(resume_id, processing_version(),
+                              get_settings().RESUME_PROCESSING_LEASE_SECONDS):
+        logger.info(f"Not queueing resume_id={resume_id}: already completed or in flight")
+        return None
+    try:
+        return submit_task(process_resume_task, resume_id, file_path, queue=queue)
+    except Exception as exc:
+        fail_resume_processing(resume_id, f"enqueue failed: {exc}", final=True)
+        raise
+
+
+@celery_app.task(bind=True, name="process_job_task", rate_limit="30/m")
 def process_job_task(self, job_id: int, job_data: dict):
     """
     Background task to build a job profile via the AI pipeline.
+    Rate-limited to protect the LLM provider (Groq) from throttling us.
     """
     try:
         self.update_state(state="PROGRESS", meta={"step": "profiling"})
@@ -67,3 +104,130 @@ def cleanup_resumes_task():
     """
     from app.services.cleanup import DataLifecycleManager
     return DataLifecycleManager.cleanup_stale_resumes()
+
+
+@celery_app.task(name="refresh_upload_rollup_task")
+def refresh_upload_rollup_task(days: int = None):
+    """
+    Recompute the last ``days`` (UPLOAD_ROLLUP_REBUILD_DAYS) of the
+    dashboard upload rollup from the base tables. Scheduled by Celery Beat.
+    """
+    from datetime import date, timedelta
+    from app.core.config import get_settings
+    from app.db.crud import rebuild_upload_rollup
+
+    days = days or get_settings().UPLOAD_ROLLUP_REBUILD_DAYS
+    rebuilt = rebuild_upload_rollup(date.today() - timedelta(days=days))
+    return {"status": "completed", "days": rebuilt}
+
+
+# ─────────────────────────────────────────────────────────
+# Distributed ranking
+#
+#   enqueue_job_ranking ─▶ chord( score_chunk_task × N ) ─▶ finalize_ranking_task
+#
+# Each chunk scores its applicants against the job's compiled profile
+# (compiled once per worker process and reused across chunks). The chord
+# callback sees the whole pool, so calibration, persistence and cleanup
+# behave exactly as in POST /rank/job/{job_id}.
+# ─────────────────────────────────────────────────────────
+
+@celery_app.task(bind=True, name="score_chunk_task")
+def score_chunk_task(self, job_id: int, job_title: str, job_payload: dict,
+                     resumes: list, uploads_dir: str = "uploads"):
+    """
+    Pass 1 for one chunk of applicants: ``resumes`` is ``[[resume_id, filename], ...]``.
+    Returns uncalibrated result rows; calibration needs the whole pool.
+    """
+    from app.services.job_ranker import score_chunk
+
+    try:
+        return score_chunk(job_id, job_title, job_payload, resumes, uploads_dir)
+
+    except Exception as exc:
+        logger.error(f"Chunk scoring failed for job_id={job_id}: {exc}")
+        raise self.retry(exc=exc, countdown=30, max_retries=3)
+
+
+@celery_app.task(bind=True, name="finalize_ranking_task")
+def finalize_ranking_task(self, chunk_results: list, job_id: int):
+    """
+    Chord callback: calibrate the merged pool, persist every ranking in bulk,
+    then run post-ranking cleanup for the job.
+    """
+    from app.services.job_ranker import finalize_ranking
+
+    try:
+        return finalize_ranking(chunk_results, job_id)
+
+    except Exception as exc:
+        logger.error(f"Ranking finalisation failed for job_id={job_id}: {exc}")
+        raise self.retry(exc=exc, countdown=30, max_retries=3)
+
+
+def enqueue_job_ranking(job, resumes: list, chunk_size: int = None,
+                        uploads_dir: str = None):
+    """
+    Split ``resumes`` (``[(resume_id, filename), ...]``) into chunks and start
+    the score/calibrate chord. Returns ``(task_id, chunk_count)``; the task
+    resolves to finalize_ranking_task's summary.
+    """
+    from celery import chord
+    from app.core.config import get_settings
+    from app.services.job_ranker import build_job_payload
+
+    settings = get_settings()
+    chunk_size = max(1, chunk_size or settings.RANKING_CHUNK_SIZE)
+    uploads_dir = uploads_dir or settings.UPLOAD_DIR
+
+    job_id, job_title, job_payload = build_job_payload(job)
+    resumes = [list(r) for r in resumes]
+    chunks = [resumes[i:i + chunk_size] for i in range(0, len(resumes), chunk_size)]
+
+    if _local_backend():
+        from app.orchestration.pipeline import get_pipeline
+        task_id = get_pipeline().submit("rank_job", job_id, job_title, job_payload,
+                                        chunks, uploads_dir)
+        return task_id, len(chunks)
+
+    header = [score_chunk_task.s(job_id, job_title, job_payload, chunk, uploads_dir)
+              for chunk in chunks]
+    return chord(header)(finalize_ranking_task.s(job_id)).id, len(chunks)
+
+
+# ─────────────────────────────────────────────────────────
+# Dispatch: Celery, or the in-process executor (TASK_BACKEND=local)
+# ─────────────────────────────────────────────────────────
+
+def _local_backend() -> bool:
+    from app.core.config import get_settings
+    return get_settings().TASK_BACKEND == "local"
+
+
+def submit_task(task, *args, queue: str = None) -> str:
+    """
+    Start a background task and return its id. Goes to the Celery broker, or
+    with TASK_BACKEND=local to ATSPipeline (raises ExecutorBusy when its
+    queue is full).
+    """
+    if _local_backend():
+        from app.orchestration.pipeline import get_pipeline
+        return get_pipeline().submit(task.name, *args)
+    options = {"queue": queue} if queue else {}
+    return task.apply_async(args, **options).id
+
+
+def get_task_status(task_id: str) -> dict:
+    """``{"state": ..., "result" | "error": ...}`` for a task from either backend."""
+    if task_id.startswith("local-"):
+        from app.orchestration.pipeline import get_pipeline
+        record = get_pipeline().status(task_id)
+        return {k: v for k, v in record.items() if k in ("state", "result", "error")}
+
+    result = celery_app.AsyncResult(task_id)
+    status = {"state": result.state}
+    if result.successful():
+        status["result"] = result.result
+    elif result.failed():
+        status["error"] = str(result.result)
+    return status
@@ -0,0 +1,71 @@
+"""
+Per-process warm-up for Celery worker children.
+
+Prefork children start cold: the skill taxonomy, every alias regex, the
+section/experience patterns and the parser pool are all built by whichever
+task happens to run first. ``warm_up_process`` does that work up front from
+the ``worker_process_init`` signal (see celery_worker.py) and opens the
+child's DB connection pool, so the first real task runs at steady-state
+speed.
+
+Measured by scripts/benchmarks/bench_worker_warmup.py.
+"""
+import logging
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+_WARMUP_JOB = {"skills": ["Python", "Django", "PostgreSQL"], "keywords": ["backend"],
+               "min_experience": 2}
+_WARMUP_RESUME = (
+    "Jane Doe\nExperience\nSenior Backend Engineer, Acme Corp, Jan 2019 - Present\n"
+    "Built Python and Django services on PostgreSQL and Redis, deployed with Docker.\n"
+    "Education\nB.Sc. Computer Science, 2014\nSkills\nPython, Django, SQL, AWS, Kafka\n"
+)
+
+
+def warm_up_process(db_pool_max: int = 4, start_parser_pool: bool = True,
+                    open_db_pool: bool = True) -> Dict[str, float]:
+    """
+    Load and compile everything a task would build on first use. Returns
+    milliseconds per step. DB or parser failures are logged, never raised:
+    a worker that cannot warm up still serves tasks the slow way.
+    """
+    timings: Dict[str, float] = {}
+
+    def step(name: str, started: float):
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    started = time.perf_counter()
+    from app.services import scorer     # loads the compiled taxonomy artifact
+    step("taxonomy_ms", started)
+
+    started = time.perf_counter()
+    scorer.precompile_skill_patterns()
+    step("skill_regex_ms", started)
+
+    started = time.perf_counter()
+    scorer.score_resume(_WARMUP_RESUME, _WARMUP_JOB, job_title="Backend Engineer")
+    step("scorer_ms", started)
+
+    started = time.perf_counter()
+    from app.services import job_ranker  # noqa: F401
+    from app.services.parser_pool import get_parser_pool
+    if start_parser_pool:
+        try:
+            get_parser_pool().start()
+        except Exception as exc:
+            logger.warning("Warm-up: could not start parser pool: %s", exc)
+    step("parser_ms", started)
+
+    if open_db_pool:
+        started = time.perf_counter()
+        try:
+            from app.db.dbase import init_db_pool
+            init_db_pool(1, max(db_pool_max, 1))
+        except Exception as exc:
+            logger.warning("Warm-up: could not open DB pool: %s", exc)
+        step("db_pool_ms", started)
+
+    return timings
@@ -158,6 +158,19 @@ function SkillCard({ skillObj, onRemove, onPriorityChange }) {
     );
 }
 
+// Bucket dates are calendar days ('YYYY-MM-DD'); read them as local dates
+const parseBucket = (bucket) => {
+    const [y, m, d] = bucket.split('-').map(Number);
+    return new Date(y, m - 1, d);
+};
+
+const toDateParam = (d) =>
+    `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`;
+
+const addCounts = (group, counts) => {
+    for (const [role, n] of Object.entries(counts)) group[role] = (group[role] || 0) + n;
+};
+
 const Dashboard = () => {
     const { user } = useAuth();
     const [jobs, setJobs] = useState([]);
@@ -166,8 +179,11 @@ const Dashboard = () => {
     const [jobRoles, setJobRoles] = useState([]);
     const [range, setRange] = useState("week");
 
-    const [rawResumes, setRawResumes] = useState([]);
+    const [uploadBuckets, setUploadBuckets] = useState([]);
 
+    // Buckets come from /dashboard/upload-buckets for the selected range:
+    // days for week and month (months are grouped into weeks of the
+    // month here), months for year
     const transformData = (data, rng) => {
         if (!data || !data.length) return [];
         const now = new Date();
@@ -193,22 +209,22 @@ const Dashboard = () => {
             }
             groups = createEmptyGroups(dayKeys, d => days[d]);
             const weekAgo = new Date(today.getTime() - 6 * 24 * 60 * 60 * 1000);
-            data.forEach(r => {
-                const dDate = new Date(r.createdAt);
+            data.forEach(b => {
+                const dDate = parseBucket(b.bucket);
                 if (dDate >= weekAgo) {
                     const group = groups.find(g => g._key === dDate.getDay());
-                    if (group) group[r.role] = (group[r.role] || 0) + 1;
+                    if (group) addCounts(group, b.counts);
                 }
             });
         } 
         else if (rng === "month") {
             groups = createEmptyGroups([1, 2, 3, 4, 5], w => `Week ${w}`);
-            data.forEach(r => {
-                const dDate = new Date(r.createdAt);
+            data.forEach(b => {
+                const dDate = parseBucket(b.bucket);
                 if (dDate.getFullYear() === today.getFullYear() && dDate.getMonth() === today.getMonth()) {
                     const weekNum = Math.ceil(dDate.getDate() / 7);
                     const group = groups.find(g => g._key === weekNum);
-                    if (group) group[r.role] = (group[r.role] || 0) + 1;
+                    if (group) addCounts(group, b.counts);
                 }
             });
             // Optional: filter out Week 5 if month only has 28 days (Feb)
@@ -218,18 +234,18 @@ const Dashboard = () => {
         else if (rng === "year") {
             const months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"];
             groups = createEmptyGroups([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11], m => months[m]);
-            data.forEach(r => {
-                const dDate = new Date(r.createdAt);
+            data.forEach(b => {
+                const dDate = parseBucket(b.bucket);
                 if (dDate.getFullYear() === today.getFullYear()) {
                     const group = groups.find(g => g._key === dDate.getMonth());
-                    if (group) group[r.role] = (group[r.role] || 0) + 1;
+                    if (group) addCounts(group, b.counts);
                 }
             });
         }
         return groups;
     };
 
-    const chartData = useMemo(() => transformData(rawResumes, range), [rawResumes, range, jobRoles]);
+    const chartData = useMemo(() => transformData(uploadBuckets, range), [uploadBuckets, range, jobRoles]);
     const [loadingStage, setLoadingStage] = useState('complete');
     const [loading, setLoading] = useState(true);
     const [editingJob, setEditingJob] = useState(null);
@@ -260,10 +276,16 @@ const Dashboard = () => {
         }
     };
 
-    const fetchWeeklyStats = async () => {
+    const fetchWeeklyStats = async (rng) => {
+        const now = new Date();
+        const params = rng === 'week'
+            ? { granularity: 'day', start: toDateParam(new Date(now.getFullYear(), now.getMonth(), now.getDate() - 6)) }
+            : rng === 'month'
+                ? { granularity: 'day', start: toDateParam(new Date(now.getFullYear(), now.getMonth(), 1)) }
+                : { granularity: 'month', start: toDateParam(new Date(now.getFullYear(), 0, 1)) };
         try {
-            const res = await dashboardAPI.getRawResumes();
-            setRawResumes(res.data.resumes || []);
+            const res = await dashboardAPI.getUploadBuckets({ ...params, end: toDateParam(now) });
+            setUploadBuckets(res.data.buckets || []);
             setJobRoles(res.data.job_roles || []);
         } catch { /* silent */ }
     };
@@ -283,7 +305,6 @@ const Dashboard = () => {
         sessionStorage.setItem('dashboard_loaded', 'true');
 
         fetchData();
-        fetchWeeklyStats();
         checkNewResumes();
         pollRef.current = setInterval(checkNewResumes, POLL_INTERVAL_MS);
         return () => {
@@ -291,6 +312,10 @@ const Dashboard = () => {
         };
     }, []);
 
+    useEffect(() => {
+        fetchWeeklyStats(range);
+    }, [range]);
+
     const dismissAlert = () => setNewResumeAlert(0);
 
     const handleToggleStatus = async (jobId, newStatus) => {
@@ -84,6 +84,13 @@ export const dashboardAPI = {
     getNewResumesCount: (params = {}) => api.get('/dashboard/new-resumes-count', { params }),
     getWeeklyStats: () => api.get('/dashboard/weekly-stats'),
     getRawResumes: () => api.get('/dashboard/raw-resumes'),
+    // Upload counts per bucket per role (NDJSON); resolves to
+    // { data: { job_roles, buckets: [{ bucket: 'YYYY-MM-DD', counts }] } }
+    getUploadBuckets: async (params = {}) => {
+        const res = await api.get('/dashboard/upload-buckets', { params, responseType: 'text' });
+        const [header, ...buckets] = res.data.split('\n').filter(line => line.trim()).map(line => JSON.parse(line));
+        return { data: { ...header, buckets } };
+    },
 };
 
 
@@ -102,7 +109,45 @@ export const commentsAPI = {
 
 export const resumeAnalysisAPI = {
     analyzeSingle: (resumeId) => api.post(`/resume-analysis/single/${resumeId}`),
-    analyzeBatch: (resumeIds) => api.post('/resume-analysis/batch', { resume_ids: resumeIds }),
+    // NDJSON stream, one analysis per line as each finishes; resolves to
+    // { data: [...] } in request order (failed resumes left out)
+    analyzeBatch: async (resumeIds, onResult) => {
+        const token = localStorage.getItem('token');
+        const response = await fetch(`${API_BASE_URL}/resume-analysis/batch`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${token}`
+            },
+            body: JSON.stringify({ resume_ids: resumeIds })
+        });
+        if (!response.ok) {
+            const detail = (await response.json().catch(() => ({}))).detail;
+            throw { response: { status: response.status, data: { detail } } };
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        const results = [];
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            buffer += decoder.decode(value, { stream: !done });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                const result = JSON.parse(line);
+                onResult?.(result);
+                if (!result.error) results.push(result);
+            }
+            if (done) break;
+        }
+        results.sort((a, b) => resumeIds.indexOf(a.resume_id) - resumeIds.indexOf(b.resume_id));
+        return { data: results };
+    },
     uploadAndAnalyze: (file) => {
         const formData = new FormData();
         formData.append('file', file);
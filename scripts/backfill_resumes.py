@@ -0,0 +1,172 @@
+"""
+Backfill: re-parse resumes and recompute their stored features.
+
+Run after changing the parser, the skill taxonomy or the scorer:
+    python -m scripts.backfill_resumes --mode features --stale-only
+    python -m scripts.backfill_resumes --mode reparse --workers 4 --max-rows-per-sec 20
+
+- Walks `resumes` in id order with keyset pagination (WHERE id > last_id
+  ORDER BY id LIMIT n), never OFFSET, and stops at the max id seen at start
+- --mode reparse   re-extracts text from the uploaded file (parser changes)
+  --mode features  reuses parsed_text, recomputing experience / skills /
+                   sections (taxonomy or scorer changes); rows without text
+                   are re-parsed
+- Work is spread over a process pool; each batch is written back with one
+  bulk UPDATE ... FROM (VALUES ...)
+- Files are re-parsed through a one-worker parser pool per process, so the
+  parser's timeout and RSS limits apply: a pathological PDF fails with
+  "timeout" / "memory_limit" instead of stalling the batch
+- Progress is checkpointed to a JSON file after every committed batch; a
+  rerun resumes from it (--restart ignores it). It is removed on completion
+- Throttling protects the primary: --max-rows-per-sec caps write rate and
+  --db-duty-cycle sleeps in proportion to the time each UPDATE took
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from app.core.config import get_settings
+from app.db.crud import bulk_update_resume_profiles, get_resume_batch_after, get_resume_id_range
+from app.orchestration.pipeline import build_candidate_profile
+from app.services.parser_pool import ParserPool, new_parser_pool
+from app.services.resume_parser import ResumeParseError
+from app.services.scorer import TAXONOMY_VERSION
+
+DEFAULT_CHECKPOINT = "backfill_resumes.checkpoint.json"
+
+_parser: Optional[ParserPool] = None
+
+
+def _init_worker():
+    """
+    Pool initializer: one parser subprocess per backfill worker, with the
+    configured limits. It exits with the worker (EOF on its stdin).
+    """
+    global _parser
+    _parser = new_parser_pool(pool_size=1)
+
+
+def _process(task: Tuple[int, str, Optional[str], str, str]) -> Tuple[int, Optional[dict], str]:
+    """Worker: ``(id, filename, parsed_text, mode, uploads_dir) -> (id, profile | None, error)``."""
+    resume_id, filename, parsed_text, mode, uploads_dir = task
+    path = os.path.join(uploads_dir, filename)
+    try:
+        if mode == "reparse" or not parsed_text:
+            parsed_text = _parser.parse(path).text
+        return resume_id, build_candidate_profile(parsed_text, path), ""
+    except FileNotFoundError:
+        return resume_id, None, "not_found"
+    except ResumeParseError as exc:
+        return resume_id, None, exc.reason
+    except Exception as exc:
+        return resume_id, None, f"{type(exc).__name__}: {exc}"
+
+
+def _load_checkpoint(path: str) -> Dict:
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def _save_checkpoint(path: str, state: Dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def run(mode: str, batch_size: int, workers: int, checkpoint: str, restart: bool,
+        stale_only: bool, max_rows_per_sec: float, db_duty_cycle: float):
+    settings = get_settings()
+
+    state = {} if restart else _load_checkpoint(checkpoint)
+    if state and state.get("mode") != mode:
+        sys.exit(f"❌ Checkpoint {checkpoint} is for --mode {state.get('mode')}; "
+                 f"use --restart or a different --checkpoint")
+
+    _, max_id, total = get_resume_id_range()
+    state = state or {
+        "mode": mode, "last_id": 0, "max_id": max_id,
+        "updated": 0, "failed": 0, "failures": {}, "started_at": time.time(),
+    }
+    stale_version = TAXONOMY_VERSION if stale_only else None
+
+    print(f"🚀 Backfill ({mode}) from id > {state['last_id']} up to id {state['max_id']} "
+          f"({total} resumes in table), {workers} workers, batch {batch_size}")
+
+    run_started = time.monotonic()
+    run_rows = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        while True:
+            batch_started = time.monotonic()
+            rows = get_resume_batch_after(state["last_id"], batch_size,
+                                          state["max_id"], stale_version)
+            if not rows:
+                break
+
+            tasks = [(rid, filename, text, mode, settings.UPLOAD_DIR)
+                     for rid, filename, text in rows]
+            profiles, failed = [], 0
+            chunksize = max(1, len(tasks) // (workers * 4))
+            for resume_id, profile, error in pool.map(_process, tasks, chunksize=chunksize):
+                if profile is None:
+                    failed += 1
+                    state["failures"][error] = state["failures"].get(error, 0) + 1
+                else:
+                    profiles.append((resume_id, profile))
+
+            write_started = time.monotonic()
+            updated = bulk_update_resume_profiles(profiles)
+            write_seconds = time.monotonic() - write_started
+
+            state["last_id"] = rows[-1][0]
+            state["updated"] += updated
+            state["failed"] += failed
+            _save_checkpoint(checkpoint, state)
+
+            run_rows += len(rows)
+            elapsed = time.monotonic() - run_started
+            print(f"   id ≤ {state['last_id']:>8}  {len(rows):>4} rows  {updated:>4} updated  "
+                  f"{failed:>3} failed  write {write_seconds * 1000:6.0f} ms  "
+                  f"{run_rows / elapsed:6.1f} rows/s")
+
+            # Throttle: leave the DB idle for (1 - duty) / duty of each write,
+            # and never exceed the configured row rate.
+            pause = write_seconds * (1 - db_duty_cycle) / db_duty_cycle
+            if max_rows_per_sec > 0:
+                pause = max(pause, len(rows) / max_rows_per_sec - (time.monotonic() - batch_started))
+            if pause > 0:
+                time.sleep(pause)
+
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    elapsed = time.monotonic() - run_started
+    print(f"✅ Backfill complete: {state['updated']} updated, {state['failed']} failed "
+          f"({run_rows} rows this run in {elapsed:.1f}s, {run_rows / max(elapsed, 1e-9):.1f} rows/s)")
+    if state["failures"]:
+        print("   Failures by reason: " + ", ".join(f"{k}={v}" for k, v in sorted(state["failures"].items())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=("reparse", "features"), default="features")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--stale-only", action="store_true",
+                        help="skip resumes already built with the current skill taxonomy")
+    parser.add_argument("--max-rows-per-sec", type=float, default=50,
+                        help="write-rate cap; 0 disables")
+    parser.add_argument("--db-duty-cycle", type=float, default=0.5,
+                        help="max fraction of wall time spent in bulk UPDATEs (0-1]")
+    args = parser.parse_args()
+    if not 0 < args.db_duty_cycle <= 1:
+        parser.error("--db-duty-cycle must be in (0, 1]")
+    run(args.mode, args.batch_size, args.workers, args.checkpoint, args.restart,
+        args.stale_only, args.max_rows_per_sec, args.db_duty_cycle)
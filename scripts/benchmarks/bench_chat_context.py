@@ -0,0 +1,108 @@
+"""
+Benchmark: resume chat prompt size, character truncation vs token-budgeted digest.
+
+Run from the repo root:
+    python -m scripts.benchmarks.bench_chat_context --resumes 50
+
+- Synthetic parsed resumes (one line, as clean_text leaves them) of growing
+  length: contact header, a long skills dump, a summary, 2-12 roles of
+  experience, projects and education
+- before: the previous system prompt, resume_text[:4000] plus
+  str(history[-5:]) after five turns with ~150-word answers
+- after:  build_resume_digest + format_history with the default budgets
+- Prompt tokens use resume_digest.estimate_tokens for both (4 chars/token);
+  fewer prompt tokens means less prefill before the first output token
+- Coverage: share of the roles (by company name) and of the education
+  section that reach the prompt
+- Digest build time is paid once per chat session, at upload
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.services.resume_digest import build_resume_digest, estimate_tokens, format_history
+from app.utilities.txt_clean import clean_text
+
+_TECH = ["Python", "Django", "FastAPI", "React", "TypeScript", "Java", "Spring Boot", "PostgreSQL",
+         "AWS", "Docker", "Kubernetes", "Kafka", "Redis", "Terraform", "GraphQL", "Go", "MongoDB"]
+_VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Deployed", "Owned", "Scaled"]
+_INSTRUCTIONS = 420     # characters of fixed instructions in the system prompt
+
+
+def build_resume(rng: random.Random, roles: int):
+    parts = ["Jane Doe | Senior Software Engineer | jane.doe@example.com | +1 555 0100 | "
+             "linkedin.com/in/janedoe | github.com/janedoe | Berlin, Germany"]
+    parts.append("Technical Skills: " + ", ".join(rng.sample(_TECH, len(_TECH)) * 3))
+    parts.append("Professional Summary: Backend engineer focused on distributed systems, "
+                 "data pipelines and developer tooling, mentoring and on-call leadership.")
+    parts.append("Work Experience:")
+    companies = []
+    for i in range(roles):
+        company = f"Company{i:02d}"
+        companies.append(company)
+        year = 2024 - 2 * i
+        parts.append(f"Senior Engineer, {company}, Jan {year - 2} - Dec {year}.")
+        for _ in range(5):
+            parts.append(f"{rng.choice(_VERBS)} {rng.choice(_TECH)} and {rng.choice(_TECH)} services "
+                         f"handling {rng.randint(1, 90)}M requests per day with {rng.randint(2, 40)} "
+                         f"engineers across {rng.randint(2, 6)} teams.")
+    parts.append("Key Projects: Open-source Kafka connector with 2k stars; "
+                 "a Terraform module registry used across the organisation.")
+    parts.append("Education: M.Sc. Computer Science, TU Munich, 2012. B.Sc. Informatics, 2010.")
+    parts.append("Hobbies: climbing, chess, photography.")
+    return clean_text(" ".join(parts)), companies
+
+
+def build_history(rng: random.Random, turns: int = 5):
+    answer = " ".join(rng.choice(["Your", "experience", "with", "Kafka", "is", "strong", "consider",
+                                  "quantifying", "impact", "in", "each", "role."]) for _ in range(150))
+    return [{"user": f"How can I improve section {i}?", "ai": answer} for i in range(turns)]
+
+
+def run(resumes: int, seed: int):
+    rng = random.Random(seed)
+    rows = []
+    for n in range(resumes):
+        roles = 2 + n % 11
+        text, companies = build_resume(rng, roles)
+        history = build_history(rng)
+
+        started = time.perf_counter()
+        digest = build_resume_digest(text)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        rows.append({
+            "chars": len(text),
+            "resume_before": estimate_tokens(text[:4000]),
+            "resume_after": estimate_tokens(digest),
+            "history_before": estimate_tokens(str(history[-5:])),
+            "history_after": estimate_tokens(format_history(history)),
+            "roles_before": sum(c in text[:4000] for c in companies) / roles,
+            "roles_after": sum(c in digest for c in companies) / roles,
+            "edu_before": "TU Munich" in text[:4000],
+            "edu_after": "TU Munich" in digest,
+            "build_ms": build_ms,
+        })
+
+    print(f"{resumes} resumes, {min(r['chars'] for r in rows)}-{max(r['chars'] for r in rows)} chars")
+    print(f"  {'':<8} {'resume':>7} {'history':>8} {'prompt (median / max)':>22} "
+          f"{'roles kept':>11} {'education kept':>15}")
+    for label in ("before", "after"):
+        resume = [r[f"resume_{label}"] for r in rows]
+        history = [r[f"history_{label}"] for r in rows]
+        prompt = [a + b + _INSTRUCTIONS // 4 for a, b in zip(resume, history)]
+        roles = statistics.mean(r[f"roles_{label}"] for r in rows)
+        edu = statistics.mean(r[f"edu_{label}"] for r in rows)
+        print(f"  {label:<8} {statistics.median(resume):7.0f} {statistics.median(history):8.0f} "
+              f"{statistics.median(prompt):13.0f} / {max(prompt):6.0f} {roles:10.0%} {edu:14.0%}")
+    print("  (median estimated tokens)")
+    print(f"  digest build (once per session): median {statistics.median(r['build_ms'] for r in rows):.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=45)
+    args = parser.parse_args()
+    run(args.resumes, args.seed)
@@ -0,0 +1,102 @@
+"""
+Benchmark: streaming DOCX extraction vs python-docx paragraphs.
+
+Run from the repo root:
+    python -m scripts.benchmarks.bench_docx_extraction --pages 20
+
+- Builds a synthetic DOCX resume with python-docx: contact details in the
+  page header, a skills table, and N pages (~3000 chars/page) of experience
+  paragraphs, some with a two-column table of technologies
+- Times the previous extraction (python-docx, doc.paragraphs only) against
+  extract_docx_text, with tracemalloc peak memory for each
+- Coverage: canonical skills found by the scorer in each text
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from docx import Document
+
+from app.services.resume_parser import extract_docx_text
+from app.services.scorer import extract_skills_from_text
+from app.utilities.txt_clean import clean_text
+
+_CHARS_PER_PAGE = 3000
+_TECH = ["Python", "Django", "React", "TypeScript", "Java", "Spring Boot", "PostgreSQL", "AWS",
+         "Docker", "Kubernetes", "Kafka", "Redis", "Terraform", "GraphQL", "Go", "MongoDB"]
+
+
+def build_docx(path: str, pages: int, seed: int = 35):
+    rng = random.Random(seed)
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | Staff Engineer | jane@example.com"
+
+    doc.add_paragraph("Technical Skills")
+    table = doc.add_table(rows=4, cols=2)
+    for row, (label, skills) in enumerate([("Languages", "Go, Rust, Scala"),
+                                           ("Data", "Snowflake, Airflow, Spark"),
+                                           ("Cloud", "GCP, Azure, Terraform"),
+                                           ("Tools", "Jenkins, Grafana, Prometheus")]):
+        table.cell(row, 0).text = label
+        table.cell(row, 1).text = skills
+
+    doc.add_paragraph("Work Experience")
+    size = 0
+    while size < pages * _CHARS_PER_PAGE:
+        start = rng.randint(2005, 2022)
+        line = (f"Senior Engineer, Company {rng.randint(1, 999)}  {start} - {start + rng.randint(1, 3)}: "
+                f"built services with {', '.join(rng.sample(_TECH[:8], 2))}")
+        doc.add_paragraph(line)
+        size += len(line)
+        if rng.random() < 0.05:
+            stack = doc.add_table(rows=1, cols=2)
+            stack.cell(0, 0).text = "Stack"
+            stack.cell(0, 1).text = ", ".join(rng.sample(_TECH[8:], 3))
+    doc.save(path)
+
+
+def python_docx_text(path: str) -> str:
+    doc = Document(path)
+    return clean_text(" ".join([para.text for para in doc.paragraphs]))
+
+
+def streaming_text(path: str) -> str:
+    return extract_docx_text(path).text
+
+
+def _measure(fn, path: str, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(path)
+        samples.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    text = fn(path)
+    peak = tracemalloc.get_traced_memory()[1] / (1 << 20)
+    tracemalloc.stop()
+    return statistics.median(samples), peak, text
+
+
+def run(pages: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.docx")
+        build_docx(path, pages)
+        print(f"DOCX: {pages} pages, {os.path.getsize(path):,} bytes")
+        print(f"{'extractor':<26} {'median':>10} {'peak mem':>10} {'chars':>9} {'skills':>7}")
+        for label, fn in (("python-docx paragraphs", python_docx_text),
+                          ("streaming (zip+iterparse)", streaming_text)):
+            median, peak, text = _measure(fn, path, repeat)
+            skills = extract_skills_from_text(text)
+            print(f"{label:<26} {median:8.1f} ms {peak:7.1f} MB {len(text):9,} {len(skills):7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    run(args.pages, args.repeat)
@@ -0,0 +1,74 @@
+"""
+Benchmark: experience extraction on long CVs.
+
+Run from the repo root:
+    python -m scripts.benchmarks.bench_experience_extraction --pages 20
+
+- Builds a synthetic CV of N pages (~3000 chars/page) with a dated role
+  on most lines, an education block and a few explicit statements
+- Times extract_years_of_experience and the timeline layer on its own
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.services.scorer import (
+    CURRENT_MONTH,
+    CURRENT_YEAR,
+    extract_years_of_experience,
+    normalize_text,
+)
+from app.services.experience_extractor import timeline_years
+
+_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+_CHARS_PER_PAGE = 3000
+
+
+def build_cv(pages: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    lines = ["Jane Doe — Staff Engineer", "Over 15 years of experience in distributed systems.",
+             "Work Experience"]
+    size = sum(len(l) for l in lines)
+    while size < pages * _CHARS_PER_PAGE:
+        start = rng.randint(1995, CURRENT_YEAR - 1)
+        if rng.random() < 0.5:
+            span = f"{rng.choice(_MONTHS)} {start} – {rng.choice(_MONTHS)} {min(start + rng.randint(0, 4), CURRENT_YEAR)}"
+        else:
+            span = f"{rng.randint(1, 12):02d}/{start} - present"
+        line = f"• Senior Engineer, Company {rng.randint(1, 999)}  {span}  built services in Python and Go"
+        lines.append(line)
+        size += len(line)
+    lines += ["Education", "B.Tech, State University 2001 - 2005", "Certifications", "AWS SA 2019"]
+    return "\n".join(lines)
+
+
+def _time(fn, arg, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def run(pages: int, repeat: int):
+    cv = build_cv(pages)
+    tn = normalize_text(cv)
+
+    full = _time(extract_years_of_experience, cv, repeat)
+    timeline = _time(lambda t: timeline_years(t, CURRENT_YEAR, CURRENT_MONTH), tn, repeat)
+
+    print(f"CV: {pages} pages, {len(cv):,} chars, result {extract_years_of_experience(cv)} years")
+    print(f"extract_years_of_experience  median {statistics.median(full):8.2f} ms   "
+          f"p95 {sorted(full)[int(repeat * 0.95) - 1]:8.2f} ms")
+    print(f"timeline layer only          median {statistics.median(timeline):8.2f} ms   "
+          f"p95 {sorted(timeline)[int(repeat * 0.95) - 1]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.pages, args.repeat)
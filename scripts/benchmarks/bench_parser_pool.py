@@ -0,0 +1,113 @@
+"""
+Benchmark: isolated resume parsing on normal and pathological PDFs.
+
+Run from the repo root:
+    python -m scripts.benchmarks.bench_parser_pool --timeout 5 --max-rss-mb 256
+
+- Writes synthetic PDFs to a temp dir: a 2-page resume, a 300-page file,
+  a truncated/corrupt file, and a single page with a huge content stream
+  (slow and memory-hungry to lay out)
+- Parses each through the ParserPool and reports wall time, outcome
+  (pages / truncated / failure reason) and the caller's RSS growth
+- With --in-process, also times plain pdfplumber extraction in the calling
+  process for comparison (the dense page can take minutes there)
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+from typing import List
+
+from app.services.parser_pool import ParserPool
+from app.services.resume_parser import ResumeParseError, extract_resume_text
+
+_LINE = "Senior Engineer, Acme Corp 2019 - Present. Built Python, Kafka and AWS services."
+
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """Minimal valid PDF: one Helvetica text block per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        ops = ["BT /F1 9 Tf 40 800 Td 11 TL"] + [
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '"
+            for line in lines
+        ] + ["ET"]
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = (b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % k for k in kids) +
+                  b"] /Count %d >>" % len(kids))
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def write_fixtures(directory: str) -> dict:
+    files = {
+        "resume_2_pages.pdf":  build_pdf([[_LINE] * 60, [_LINE] * 40]),
+        "report_300_pages.pdf": build_pdf([[_LINE] * 10 for _ in range(300)]),
+        "dense_one_page.pdf":  build_pdf([[_LINE] * 40_000]),
+    }
+    files["corrupt.pdf"] = files["resume_2_pages.pdf"][: len(files["resume_2_pages.pdf"]) // 3]
+    paths = {}
+    for name, data in files.items():
+        paths[name] = os.path.join(directory, name)
+        with open(paths[name], "wb") as f:
+            f.write(data)
+    return paths
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(label: str, fn, path: str):
+    rss0, t0 = _rss_mb(), time.perf_counter()
+    try:
+        parsed = fn(path)
+        outcome = f"ok  pages={parsed.pages} chars={len(parsed.text):,} truncated={parsed.truncated}"
+    except ResumeParseError as exc:
+        outcome = f"ERR {exc.reason}"
+    elapsed = time.perf_counter() - t0
+    print(f"  {label:<11} {os.path.basename(path):<22} {elapsed * 1000:9.1f} ms  "
+          f"caller peak RSS +{_rss_mb() - rss0:6.1f} MB  {outcome}")
+
+
+def run(timeout: float, max_rss_mb: int, in_process: bool):
+    pool = ParserPool(pool_size=2, timeout_seconds=timeout, max_rss_mb=max_rss_mb)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_fixtures(tmp)
+        pool.parse(paths["resume_2_pages.pdf"])       # warm-up: start a worker
+
+        print(f"Parser pool (timeout {timeout:g}s, RSS {max_rss_mb} MB, "
+              f"{pool.max_pages} pages, {pool.max_chars:,} chars)")
+        for path in paths.values():
+            _run("pool", pool.parse, path)
+        _run("pool", pool.parse, paths["resume_2_pages.pdf"])   # recovery after kills
+
+        if in_process:
+            print("In-process pdfplumber (no limits)")
+            for path in paths.values():
+                _run("in-process", extract_resume_text, path)
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--timeout", type=float, default=5)
+    parser.add_argument("--max-rss-mb", type=int, default=256)
+    parser.add_argument("--in-process", action="store_true")
+    args = parser.parse_args()
+    run(args.timeout, args.max_rss_mb, args.in_process)
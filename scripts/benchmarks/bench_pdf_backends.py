@@ -0,0 +1,110 @@
+"""
+Benchmark: PDF extraction backends -- throughput and scorer agreement.
+
+Run from the repo root:
+    python -m scripts.benchmarks.bench_pdf_backends --corpus uploads --synthetic 20
+
+- Extracts every PDF in --corpus (plus --synthetic generated resumes) with
+  each backend in resume_parser.PDF_BACKENDS, in-process, no caps
+- Reports files/s and pages/s per backend and how often the fast-path
+  fallback to pdfplumber would trigger
+- Scores each backend's text against a few reference jobs and reports the
+  final-score delta against pdfplumber (the default, reference backend)
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from app.services.resume_parser import (
+    DEFAULT_PDF_BACKEND,
+    PDF_BACKENDS,
+    _read_pdf,
+    extract_pdf_text,
+)
+from app.services.scorer import score_resume
+from scripts.benchmarks.bench_parser_pool import build_pdf
+
+_JOBS = [
+    ({"skills": ["Python", "Django", "PostgreSQL", "AWS", "Docker"], "min_experience": 3},
+     "Backend Engineer"),
+    ({"skills": ["React", "TypeScript", "CSS", "HTML"], "keywords": ["frontend"], "min_experience": 2},
+     "Frontend Developer"),
+    ({"skills": ["Java", "Spring", "SQL", "Microservices"], "min_experience": 5},
+     "Senior Java Developer"),
+    ({"skills": ["Python", "Pandas", "SQL", "Machine Learning"], "min_experience": 1},
+     "Data Analyst"),
+]
+
+_SKILLS = ["Python", "Django", "React", "TypeScript", "Java", "Spring Boot", "PostgreSQL",
+           "AWS", "Docker", "Kubernetes", "Pandas", "SQL", "Kafka", "HTML", "CSS"]
+
+
+def synthetic_resumes(directory: str, count: int, seed: int = 34) -> list:
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        pages = []
+        for _ in range(rng.randint(1, 3)):
+            lines = ["Work Experience"]
+            for _ in range(rng.randint(15, 45)):
+                start = rng.randint(2008, 2022)
+                lines.append(f"Engineer, Company {rng.randint(1, 99)}  {start} - {start + rng.randint(1, 3)}  "
+                             f"built services with {', '.join(rng.sample(_SKILLS, 3))}")
+            lines += ["Education", "B.Tech Computer Science 2004 - 2008"]
+            pages.append(lines)
+        path = os.path.join(directory, f"synthetic_{i:03d}.pdf")
+        with open(path, "wb") as f:
+            f.write(build_pdf(pages))
+        paths.append(path)
+    return paths
+
+
+def run(corpus: str, synthetic: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        files = sorted(os.path.join(corpus, f) for f in os.listdir(corpus)
+                       if f.lower().endswith(".pdf")) if os.path.isdir(corpus) else []
+        files += synthetic_resumes(tmp, synthetic)
+        print(f"Corpus: {len(files)} PDFs ({synthetic} synthetic)\n")
+
+        texts = {}
+        print(f"{'backend':<11} {'files/s':>8} {'pages/s':>8} {'fallbacks':>10}")
+        for backend in PDF_BACKENDS:
+            t0 = time.perf_counter()
+            parsed = [_read_pdf(path, backend, None, None) for path in files]
+            elapsed = time.perf_counter() - t0
+            texts[backend] = [p.text for p in parsed]
+            fallbacks = sum(
+                extract_pdf_text(path, backend=backend).backend != backend for path in files
+            ) if backend != DEFAULT_PDF_BACKEND else 0
+            pages = sum(p.pages for p in parsed)
+            print(f"{backend:<11} {len(files) / elapsed:8.1f} {pages / elapsed:8.1f} {fallbacks:>10}")
+
+        reference = [
+            [score_resume(text, job, title, detail=False)["final_score"] for job, title in _JOBS]
+            for text in texts[DEFAULT_PDF_BACKEND]
+        ]
+        print(f"\nFinal-score delta vs {DEFAULT_PDF_BACKEND} "
+              f"({len(files)} files x {len(_JOBS)} jobs)")
+        print(f"{'backend':<11} {'mean |d|':>9} {'max |d|':>8} {'<= 2 pts':>9} {'text len':>9}")
+        for backend, backend_texts in texts.items():
+            if backend == DEFAULT_PDF_BACKEND:
+                continue
+            deltas = [
+                abs(score_resume(text, job, title, detail=False)["final_score"] - ref)
+                for text, refs in zip(backend_texts, reference)
+                for (job, title), ref in zip(_JOBS, refs)
+            ]
+            length = sum(map(len, backend_texts)) / max(sum(map(len, texts[DEFAULT_PDF_BACKEND])), 1)
+            print(f"{backend:<11} {statistics.mean(deltas):9.2f} {max(deltas):8.1f} "
+                  f"{sum(d <= 2 for d in deltas) / len(deltas):9.0%} {length:9.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", default="uploads")
+    parser.add_argument("--synthetic", type=int, default=20)
+    args = parser.parse_args()
+    run(args.corpus, args.synthetic)
@@ -0,0 +1,94 @@
+"""
+Benchmark: resume text cleaning and match normalisation on large PDF text.
+
+Run from the repo root:
+    python -m scripts.benchmarks.bench_text_cleaning --pages 20
+
+- Builds synthetic pdfplumber-style text of N pages (~3000 chars/page) with
+  bullets, unicode dashes, dot leaders, tabs and non-breaking spaces
+- Times the previous multi-pass re.sub pipeline against clean_text +
+  normalize_for_matching, and checks that both produce byte-identical
+  output
+"""
+import argparse
+import random
+import re
+import statistics
+import time
+
+from app.utilities.txt_clean import clean_text, normalize_for_matching
+
+_CHARS_PER_PAGE = 3000
+_FRAGMENTS = [
+    "• Built event-driven services in Python and Kafka",
+    "Senior Engineer — Acme Corp\tJan 2019 – Present",
+    "Skills.................Python, Go, AWS",
+    "Led a team of 6 engineers · reduced p99 latency by 40%",
+    "▪ Designed REST APIs ---- migrated to gRPC",
+    "Résumé  of  Zoë Müller  (she/her)",
+    "",
+    "Education B.Tech, State University 2010 – 2014",
+]
+
+
+def build_text(pages: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    lines, size = [], 0
+    while size < pages * _CHARS_PER_PAGE:
+        line = rng.choice(_FRAGMENTS)
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def legacy_clean(text: str) -> str:
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"[^\x20-\x7E]", " ", text)
+    text = re.sub(r"[.\-]{2,}", " ", text)
+    return text.strip()
+
+
+def legacy_normalize(text: str) -> str:
+    t = text.lower()
+    t = re.sub(r'[–—]', '-', t)
+    t = re.sub(r'[•·▸▪■]', ' ', t)
+    t = re.sub(r'[ \t]+', ' ', t)
+    t = re.sub(r'\n{2,}', '\n', t)
+    return t
+
+
+def _time(fn, arg, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list, repeat: int):
+    print(f"{label:<34} median {statistics.median(samples):8.2f} ms   "
+          f"p95 {sorted(samples)[int(repeat * 0.95) - 1]:8.2f} ms")
+
+
+def run(pages: int, repeat: int):
+    raw = build_text(pages)
+
+    legacy = (legacy_clean(raw), legacy_normalize(legacy_clean(raw)))
+    current = clean_text(raw)
+    assert (current, normalize_for_matching(current)) == legacy, "output differs from the legacy pipeline"
+    assert normalize_for_matching(raw) == legacy_normalize(raw)
+
+    print(f"Text: {pages} pages, {len(raw):,} chars (byte-identical output: ok)")
+    _report("legacy clean + normalize", _time(lambda t: legacy_normalize(legacy_clean(t)), raw, repeat), repeat)
+    _report("clean_text + normalize_for_matching", _time(lambda t: normalize_for_matching(clean_text(t)), raw, repeat), repeat)
+    _report("legacy normalize (raw text)", _time(legacy_normalize, raw, repeat), repeat)
+    _report("normalize_for_matching (raw text)", _time(normalize_for_matching, raw, repeat), repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.pages, args.repeat)
@@ -0,0 +1,130 @@
+"""
+Benchmark: Celery worker-child warm-up, first-task latency and steady-state RSS.
+
+Run from the repo root:
+    python -m scripts.benchmarks.bench_worker_warmup --tasks 100
+
+- Each scenario runs in a fresh interpreter, like a newly forked child
+- A "task" is what process_resume_task / score_chunk_task do per resume:
+  parse a PDF (parser pool, per-process text cache), build the candidate
+  profile and score it against a job
+- cold:  first task runs straight after import
+  warm:  warm_up_process() (the worker_process_init hook) runs first
+- "2nd task" is the same work on a file not parsed yet, i.e. the cost of
+  a task once nothing is left to initialise
+- Steady state: RSS of the child and of its parser workers after --tasks
+  tasks over --files distinct PDFs, with the parser pool and with
+  in-process parsing (PARSER_POOL_SIZE=0, the case the child recycling
+  limits are tuned for)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from scripts.benchmarks.bench_parser_pool import build_pdf
+
+_LINES = [
+    "Senior Backend Engineer, Acme Corp, Jan 2019 - Present",
+    "Built Python, Django and FastAPI services on PostgreSQL and Redis.",
+    "Deployed with Docker and Kubernetes on AWS; Kafka event pipelines.",
+    "Education: B.Sc. Computer Science, 2014",
+]
+_JOB = {"skills": ["Python", "Django", "PostgreSQL", "Docker"], "keywords": ["backend"],
+        "min_experience": 3}
+
+
+def _child(mode: str, in_process: bool, files: list, tasks: int) -> dict:
+    started = time.perf_counter()
+    from app.orchestration.pipeline import build_candidate_profile
+    from app.services import parser_pool
+    from app.services.parser_pool import ParserPool, _rss_bytes
+    from app.services.resume_parser import parse_resume_cached
+    from app.services.scorer import score_resume
+    import_ms = (time.perf_counter() - started) * 1000
+
+    if in_process:
+        parser_pool._parser_pool = ParserPool(pool_size=0)
+
+    warmup = {}
+    if mode == "warm":
+        from app.workers.warmup import warm_up_process
+        warmup = warm_up_process(start_parser_pool=not in_process)
+        time.sleep(1.0)     # a real child idles until the first task arrives
+
+    def task(path):
+        text = parse_resume_cached(path)
+        build_candidate_profile(text, path)
+        score_resume(text, _JOB, job_title="Backend Engineer")
+
+    started = time.perf_counter()
+    task(files[0])
+    first_ms = (time.perf_counter() - started) * 1000
+
+    # Same work on a file not seen yet: what the first task costs once warm
+    started = time.perf_counter()
+    task(files[1])
+    second_ms = (time.perf_counter() - started) * 1000
+
+    for i in range(2, tasks):
+        task(files[i % len(files)])
+
+    pool = parser_pool.get_parser_pool()
+    worker_rss = sum(_rss_bytes(w.proc.pid) or 0 for w in list(pool._workers))
+    result = {
+        "import_ms":    round(import_ms, 1),
+        "warmup":       warmup,
+        "first_ms":     round(first_ms, 1),
+        "second_ms":    round(second_ms, 1),
+        "rss_mb":       round((_rss_bytes(os.getpid()) or 0) / (1 << 20), 1),
+        "parser_rss_mb": round(worker_rss / (1 << 20), 1),
+    }
+    pool.shutdown()
+    return result
+
+
+def run(tasks: int, files: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(files):
+            path = os.path.join(tmp, f"resume_{i}.pdf")
+            with open(path, "wb") as f:
+                f.write(build_pdf([[f"{line} ({i})" for line in _LINES] * 15] * 2))
+            paths.append(path)
+
+        print(f"{tasks} tasks over {files} PDFs per scenario")
+        print(f"  {'scenario':<22} {'import':>8} {'warm-up':>9} {'1st task':>9} "
+              f"{'2nd task':>9} {'child RSS':>10} {'parser RSS':>11}")
+        for in_process in (False, True):
+            for mode in ("cold", "warm"):
+                out = subprocess.run(
+                    [sys.executable, "-m", "scripts.benchmarks.bench_worker_warmup",
+                     "--child", mode, "--tasks", str(tasks)]
+                    + (["--in-process"] if in_process else []) + paths,
+                    capture_output=True, text=True, check=True,
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                label = f"{mode} / {'in-process' if in_process else 'parser pool'}"
+                warm_ms = sum(r["warmup"].values())
+                print(f"  {label:<22} {r['import_ms']:6.0f}ms {warm_ms:7.0f}ms "
+                      f"{r['first_ms']:7.1f}ms {r['second_ms']:7.1f}ms "
+                      f"{r['rss_mb']:8.1f}MB {r['parser_rss_mb']:9.1f}MB")
+                if r["warmup"]:
+                    print(f"    warm-up steps: {r['warmup']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--child", choices=("cold", "warm"), help=argparse.SUPPRESS)
+    parser.add_argument("--in-process", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("paths", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(_child(args.child, args.in_process, args.paths, args.tasks)))
+    else:
+        run(args.tasks, args.files)
@@ -0,0 +1,31 @@
+"""
+Compile the skill taxonomy data file into its fast-loading artifact.
+
+Run after editing app/data/skill_taxonomy.json (or the file named by
+SKILL_TAXONOMY_PATH), and as part of the image build:
+    python -m scripts.build_skill_taxonomy [path/to/taxonomy.json]
+
+Workers fall back to compiling the JSON in memory when the artifact is
+missing or stale, so this only saves start-up time.
+"""
+import sys
+import time
+
+from app.services.skill_taxonomy import artifact_path_for, build_artifact, taxonomy_source_path
+
+
+def run(source_path: str = None):
+    source_path = source_path or taxonomy_source_path()
+    started = time.perf_counter()
+    taxonomy = build_artifact(source_path)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"✅ Skill taxonomy {taxonomy['version']} compiled in {elapsed:.0f} ms")
+    print(f"   {len(taxonomy['synonyms'])} canonical skills, "
+          f"{len(taxonomy['alias_to_canonical'])} aliases, "
+          f"{len(taxonomy['skill_universe'])} indexed")
+    print(f"   -> {artifact_path_for(source_path)}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,56 @@
+"""
+Migration: Add background-processing state to the resumes table.
+
+Run ONCE:
+    python -m scripts.database_migrations.add_resume_processing_status
+
+- processing_status      queued | processing | completed | failed
+- processing_key         file_hash:processing version of the last claim
+- processing_attempts    task runs so far
+- processing_error       last failure
+- processing_updated_at  last transition (claims expire after a lease)
+- Marks already-profiled resumes completed; those built with the current
+  taxonomy get the current key, so they are not re-processed
+"""
+
+from app.db.dbase import get_db_connection
+from app.orchestration.pipeline import processing_version
+from app.services.scorer import TAXONOMY_VERSION
+
+
+def run():
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    cur.execute("ALTER TABLE resumes ADD COLUMN IF NOT EXISTS processing_status TEXT;")
+    cur.execute("ALTER TABLE resumes ADD COLUMN IF NOT EXISTS processing_key TEXT;")
+    cur.execute("ALTER TABLE resumes ADD COLUMN IF NOT EXISTS processing_attempts INTEGER NOT NULL DEFAULT 0;")
+    cur.execute("ALTER TABLE resumes ADD COLUMN IF NOT EXISTS processing_error TEXT;")
+    cur.execute("ALTER TABLE resumes ADD COLUMN IF NOT EXISTS processing_updated_at TIMESTAMP;")
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_resumes_processing_status
+        ON resumes(processing_status) WHERE processing_status <> 'completed';
+    """)
+
+    cur.execute("""
+        UPDATE resumes
+        SET processing_status     = 'completed',
+            processing_updated_at = processed_at,
+            processing_key        = CASE
+                WHEN profile_data->>'taxonomy_version' = %s
+                THEN COALESCE(file_hash, '') || ':' || %s
+            END
+        WHERE processing_status IS NULL AND processed_at IS NOT NULL;
+    """, (TAXONOMY_VERSION, processing_version()))
+    backfilled = cur.rowcount
+
+    conn.commit()
+    cur.close()
+    conn.close()
+
+    print("✅ Migration complete: processing state columns added to resumes table.")
+    print(f"   {backfilled} already-processed resume(s) marked completed.")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,141 @@
+"""
+Migration: Pre-aggregated resume uploads per day per job for the dashboard.
+
+Run ONCE:
+    python -m scripts.database_migrations.create_upload_rollup
+
+- resume_upload_rollup(day, job_id)  day = DATE(resumes.uploaded_at)
+    applications  application rows for the job   (weekly-stats)
+    resumes       distinct resumes for the job    (new-resumes-count)
+  job_id 0 holds every resume, linked to a job or not (resumes only)
+- Kept current by triggers, so every insert and delete path (including
+  ON DELETE CASCADE from resumes and jobs) updates it in the same
+  transaction:
+    AFTER INSERT / DELETE ON applications   per (day, job) counts
+    AFTER INSERT ON resumes                 the job 0 row
+    BEFORE DELETE ON resumes                the job 0 row and the resume's
+                                            applications (they are gone by
+                                            the time their own trigger runs)
+- Backfilled with crud.rebuild_upload_rollup(); the maintenance task
+  refresh_upload_rollup_task re-runs it for recent days as a safety net
+- Adds the resumes(uploaded_at) index the boundary-day queries use
+"""
+
+from app.db.crud import rebuild_upload_rollup
+from app.db.dbase import get_db_connection
+
+
+def run():
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS resume_upload_rollup (
+            day          DATE    NOT NULL,
+            job_id       INTEGER NOT NULL,
+            applications INTEGER NOT NULL DEFAULT 0,
+            resumes      INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, job_id)
+        );
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_resumes_uploaded_at ON resumes(uploaded_at);")
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_applications_job_resume
+        ON applications(job_id, resume_id);
+    """)
+
+    # Add (or subtract) one application of a resume uploaded on day to a
+    # job; the distinct-resume count moves only for its first (last) one.
+    cur.execute("""
+        CREATE OR REPLACE FUNCTION upload_rollup_add(p_day DATE, p_job INTEGER,
+                                                     p_apps INTEGER, p_resumes INTEGER)
+        RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO resume_upload_rollup AS u (day, job_id, applications, resumes)
+            VALUES (p_day, p_job, GREATEST(p_apps, 0), GREATEST(p_resumes, 0))
+            ON CONFLICT (day, job_id) DO UPDATE
+            SET applications = GREATEST(u.applications + p_apps, 0),
+                resumes      = GREATEST(u.resumes + p_resumes, 0);
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    cur.execute("""
+        CREATE OR REPLACE FUNCTION upload_rollup_applications() RETURNS TRIGGER AS $$
+        DECLARE
+            v_day   DATE;
+            v_row   applications%ROWTYPE;
+            v_delta INTEGER;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN v_row := NEW; v_delta := 1;
+            ELSE v_row := OLD; v_delta := -1;
+            END IF;
+            SELECT DATE(uploaded_at) INTO v_day FROM resumes WHERE id = v_row.resume_id;
+            -- No resume: deleted with it, already counted by upload_rollup_resumes
+            IF v_day IS NOT NULL THEN
+                PERFORM upload_rollup_add(
+                    v_day, v_row.job_id, v_delta,
+                    CASE WHEN EXISTS (SELECT 1 FROM applications
+                                      WHERE job_id = v_row.job_id AND resume_id = v_row.resume_id
+                                        AND id <> v_row.id)
+                         THEN 0 ELSE v_delta END
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    cur.execute("""
+        CREATE OR REPLACE FUNCTION upload_rollup_resumes() RETURNS TRIGGER AS $$
+        DECLARE
+            v_job RECORD;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                IF NEW.uploaded_at IS NOT NULL THEN
+                    PERFORM upload_rollup_add(DATE(NEW.uploaded_at), 0, 0, 1);
+                END IF;
+                RETURN NULL;
+            END IF;
+            IF OLD.uploaded_at IS NOT NULL THEN
+                PERFORM upload_rollup_add(DATE(OLD.uploaded_at), 0, 0, -1);
+                FOR v_job IN
+                    SELECT job_id, COUNT(*) AS n FROM applications
+                    WHERE resume_id = OLD.id GROUP BY job_id
+                LOOP
+                    PERFORM upload_rollup_add(DATE(OLD.uploaded_at), v_job.job_id, -v_job.n::INTEGER, -1);
+                END LOOP;
+            END IF;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    cur.execute("DROP TRIGGER IF EXISTS trg_upload_rollup_applications ON applications;")
+    cur.execute("""
+        CREATE TRIGGER trg_upload_rollup_applications
+        AFTER INSERT OR DELETE ON applications
+        FOR EACH ROW EXECUTE FUNCTION upload_rollup_applications();
+    """)
+    cur.execute("DROP TRIGGER IF EXISTS trg_upload_rollup_resume_insert ON resumes;")
+    cur.execute("""
+        CREATE TRIGGER trg_upload_rollup_resume_insert
+        AFTER INSERT ON resumes
+        FOR EACH ROW EXECUTE FUNCTION upload_rollup_resumes();
+    """)
+    cur.execute("DROP TRIGGER IF EXISTS trg_upload_rollup_resume_delete ON resumes;")
+    cur.execute("""
+        CREATE TRIGGER trg_upload_rollup_resume_delete
+        BEFORE DELETE ON resumes
+        FOR EACH ROW EXECUTE FUNCTION upload_rollup_resumes();
+    """)
+
+    conn.commit()
+    cur.close()
+    conn.close()
+
+    days = rebuild_upload_rollup()
+
+    print("✅ Migration complete: resume_upload_rollup table and triggers created.")
+    print(f"   {days} day(s) of uploads backfilled.")
+
+
+if __name__ == "__main__":
+    run()